@@ -0,0 +1,102 @@
+"""
+Shared helpers for the offline benchmarks.
+
+Provides a deterministic fake embedder and a synthetic corpus so retrieval
+and ingestion can be measured against Qdrant local mode without Azure.
+"""
+
+import hashlib
+import re
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List
+
+import numpy as np
+
+# Add src to the path for imports
+src_path = Path(__file__).parent.parent / "src"
+sys.path.insert(0, str(src_path))
+
+from langchain.schema import Document
+from langchain_core.embeddings import Embeddings
+
+TOPICS = {
+    "vision": "image object detection ocr face camera pixel classification segmentation video",
+    "language": "text sentiment entity translation intent utterance language summarization key phrase",
+    "speech": "audio speech recognition synthesis voice transcription speaker pronunciation",
+    "ml": "model training dataset feature regression classification clustering evaluation pipeline",
+    "responsible": "fairness privacy transparency accountability inclusiveness reliability safety",
+    "generative": "prompt completion token gpt copilot grounding embedding retrieval chat",
+}
+
+
+class FakeEmbeddings(Embeddings):
+    """
+    Deterministic bag-of-words embedder.
+
+    Every token maps to a fixed pseudo-random unit vector (seeded by its
+    hash); a text embeds to the normalized sum of its token vectors, so texts
+    sharing words are close in cosine space. ``latency`` (seconds) is slept
+    on every call to stand in for the network round-trip of a real service.
+    """
+
+    def __init__(self, dim: int = 256, latency: float = 0.0):
+        self.dim = dim
+        self.latency = latency
+        self._tokens: Dict[str, np.ndarray] = {}
+        self.calls = 0
+
+    def _token(self, token: str) -> np.ndarray:
+        vec = self._tokens.get(token)
+        if vec is None:
+            seed = int(hashlib.md5(token.encode("utf-8")).hexdigest()[:8], 16)
+            vec = np.random.default_rng(seed).normal(size=self.dim)
+            self._tokens[token] = vec
+        return vec
+
+    def _embed(self, text: str) -> List[float]:
+        vec = np.zeros(self.dim)
+        for token in re.findall(r"\w+", text.lower()):
+            vec += self._token(token)
+        norm = np.linalg.norm(vec)
+        return (vec / norm if norm else vec).tolist()
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        self.calls += 1
+        if self.latency:
+            time.sleep(self.latency)
+        return [self._embed(t) for t in texts]
+
+    def embed_query(self, text: str) -> List[float]:
+        self.calls += 1
+        if self.latency:
+            time.sleep(self.latency)
+        return self._embed(text)
+
+
+def synthetic_corpus(n_chunks: int, seed: int = 0, words_per_chunk: int = 60) -> List[Document]:
+    """Return ``n_chunks`` topic-flavoured chunks spread over a few fake PDFs."""
+    rng = np.random.default_rng(seed)
+    topics = list(TOPICS)
+    chunks = []
+    for i in range(n_chunks):
+        topic = topics[i % len(topics)]
+        vocab = TOPICS[topic].split() + "azure service data cloud customer solution".split()
+        words = rng.choice(vocab, size=words_per_chunk)
+        chunks.append(Document(
+            page_content=f"{topic} " + " ".join(words),
+            metadata={"source": f"{topic}_{i % 4}.pdf", "chunk_index": i},
+        ))
+    return chunks
+
+
+def synthetic_queries(n_queries: int, seed: int = 1) -> List[str]:
+    """Return short keyword queries drawn from the corpus vocabulary."""
+    rng = np.random.default_rng(seed)
+    topics = list(TOPICS)
+    queries = []
+    for i in range(n_queries):
+        vocab = TOPICS[topics[i % len(topics)]].split()
+        queries.append(" ".join(rng.choice(vocab, size=3, replace=False)))
+    return queries
@@ -0,0 +1,66 @@
+"""
+Benchmark for client-side vs server-side hybrid fusion.
+
+Indexes a synthetic corpus with a deterministic fake embedder, then times
+``hybrid_search`` with ``hybrid_mode="client"`` (dense search + paginated
+text scroll + Python fusion) and ``hybrid_mode="server"`` (one Query API
+call with prefetch and RRF/DBSF fusion).
+
+Usage:
+    python benchmarks/bench_hybrid_fusion.py [--url http://localhost:6333] [--chunks 2000] [--queries 50]
+
+Without ``--url`` Qdrant local mode (in memory) is used; round-trip savings
+are only visible against a real server.
+"""
+
+import argparse
+import statistics
+import time
+
+from qdrant_client import QdrantClient
+
+from _common import FakeEmbeddings, synthetic_corpus, synthetic_queries
+from quiz_generator.utils.rag_qdrant_hybrid import Settings, hybrid_search, recreate_collection_for_rag, upsert_chunks
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark hybrid fusion modes")
+    parser.add_argument("--url", help="Qdrant server URL (default: local in-memory mode)")
+    parser.add_argument("--chunks", type=int, default=2000)
+    parser.add_argument("--queries", type=int, default=50)
+    parser.add_argument("--dim", type=int, default=256)
+    args = parser.parse_args()
+
+    client = QdrantClient(url=args.url) if args.url else QdrantClient(":memory:")
+    settings = Settings(collection="bench_hybrid_fusion", embed_tokens_per_minute=0, embed_requests_per_minute=0)
+    embeddings = FakeEmbeddings(args.dim)
+    if client.collection_exists(settings.collection):
+        client.delete_collection(settings.collection)
+    recreate_collection_for_rag(client, settings, args.dim)
+    upsert_chunks(client, settings, synthetic_corpus(args.chunks), embeddings)
+
+    queries = synthetic_queries(args.queries)
+    vectors = embeddings.embed_documents(queries)
+    print(f"{'mode':>8} {'fusion':>7} {'p50 (ms)':>9} {'p95 (ms)':>9} {'overlap@k':>10}")
+    baseline = None
+    for mode, fusion in (("client", "rrf"), ("server", "rrf"), ("server", "dbsf")):
+        settings.hybrid_mode, settings.fusion = mode, fusion
+        timings, results = [], []
+        for q, qv in zip(queries, vectors):
+            t0 = time.perf_counter()
+            hits = hybrid_search(client, settings, q, embeddings, query_vector=qv)
+            timings.append((time.perf_counter() - t0) * 1e3)
+            results.append({p.id for p in hits})
+        if baseline is None:
+            baseline = results
+        overlap = statistics.mean(len(a & b) / max(1, len(b)) for a, b in zip(results, baseline))
+        timings.sort()
+        p95 = timings[min(len(timings) - 1, int(0.95 * len(timings)))]
+        print(f"{mode:>8} {fusion:>7} {statistics.median(timings):>9.2f} {p95:>9.2f} {overlap:>10.2f}")
+
+    if args.url:
+        client.delete_collection(settings.collection)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,215 @@
+"""
+Ingestion throughput benchmark and profiler harness.
+
+Runs the ingestion stages of ``initialize_database`` over a PDF set with a
+stubbed embedder and Qdrant local mode, and reports wall time and peak
+Python memory (tracemalloc) per stage:
+
+* parse: ``load_pdfs`` (cold parse cache)
+* split: ``split_documents``
+* embed: ``EmbeddingScheduler.embed``
+* build_points: ``build_points`` (dense + BM25 sparse vectors)
+* upsert: batched ``client.upsert`` on ``upsert_parallelism`` threads
+* end_to_end: the streaming ``upsert_chunks`` into a fresh collection
+
+Stages after parsing are repeated for every combination of ``chunk_size``,
+embedding batch size and embedding concurrency, with chunks/sec per
+combination. Parsing runs once: it does not depend on those settings.
+
+Usage:
+    python benchmarks/bench_ingestion.py [folder ...] [--synthetic-pages 200]
+        [--chunk-sizes 2000 10000] [--batch-sizes 16 64] [--concurrency 1 4]
+        [--embed-latency-ms 50] [--profile cprofile|pyinstrument] [--json results.json]
+
+Without folders, PDFs are generated with PyMuPDF from the synthetic corpus.
+Memory of the PDF worker processes is not visible to tracemalloc; use
+``--pdf-workers 1`` to include it.
+"""
+
+import argparse
+import cProfile
+import itertools
+import json
+import pstats
+import tempfile
+import time
+import tracemalloc
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, List
+
+from qdrant_client import QdrantClient
+
+from _common import FakeEmbeddings, synthetic_corpus
+from quiz_generator.utils.embedding_scheduler import EmbeddingScheduler
+from quiz_generator.utils.rag_qdrant_hybrid import (
+    Settings,
+    build_points,
+    get_sparse_encoder,
+    get_vector_layout,
+    load_pdfs,
+    recreate_collection_for_rag,
+    split_documents,
+    upsert_chunks,
+)
+
+
+class StageTimer:
+    """Collects wall time and tracemalloc peak of named stages."""
+
+    def __init__(self, trace_memory: bool = True):
+        self.trace_memory = trace_memory
+        self.stages: Dict[str, Dict[str, float]] = {}
+
+    @contextmanager
+    def stage(self, name: str):
+        if self.trace_memory:
+            tracemalloc.start()
+            tracemalloc.reset_peak()
+        t0 = time.perf_counter()
+        try:
+            yield
+        finally:
+            seconds = time.perf_counter() - t0
+            peak = tracemalloc.get_traced_memory()[1] if self.trace_memory else 0
+            if self.trace_memory:
+                tracemalloc.stop()
+            self.stages[name] = {"seconds": seconds, "peak_mb": peak / (1024 * 1024)}
+
+
+def synthetic_pdfs(directory: Path, pages: int, files: int = 4) -> List[str]:
+    """Write ``pages`` pages of synthetic corpus text spread over ``files`` PDFs."""
+    import pymupdf
+
+    chunks = synthetic_corpus(pages, words_per_chunk=350)
+    paths = []
+    for f in range(files):
+        pdf = pymupdf.open()
+        for chunk in chunks[f::files]:
+            page = pdf.new_page()
+            page.insert_textbox(pymupdf.Rect(40, 40, 560, 800), chunk.page_content, fontsize=9)
+        path = directory / f"synthetic_{f}.pdf"
+        pdf.save(str(path))
+        paths.append(str(path))
+    return paths
+
+
+def run_combination(docs_by_file, settings: Settings, embeddings: FakeEmbeddings, dim: int, trace_memory: bool) -> dict:
+    """Run every post-parse stage with ``settings`` and return timings."""
+    timer = StageTimer(trace_memory)
+    with timer.stage("split"):
+        chunks = []
+        for docs in docs_by_file.values():
+            doc_chunks = split_documents(docs, settings)
+            for index, chunk in enumerate(doc_chunks):
+                chunk.metadata["chunk_index"] = index
+            chunks.extend(doc_chunks)
+
+    client = QdrantClient(":memory:")
+    recreate_collection_for_rag(client, settings, dim)
+    with timer.stage("embed"):
+        vectors = EmbeddingScheduler.from_settings(embeddings, settings).embed([c.page_content for c in chunks])
+    with timer.stage("build_points"):
+        points = build_points(chunks, vectors, layout=get_vector_layout(client, settings),
+                              sparse_encoder=get_sparse_encoder(settings))
+    with timer.stage("upsert"):
+        with ThreadPoolExecutor(max_workers=max(1, settings.upsert_parallelism)) as pool:
+            parts = [points[i:i + settings.upsert_batch_size] for i in range(0, len(points), settings.upsert_batch_size)]
+            list(pool.map(lambda part: client.upsert(settings.collection, points=part, wait=True), parts))
+
+    client = QdrantClient(":memory:")
+    recreate_collection_for_rag(client, settings, dim)
+    with timer.stage("end_to_end"):
+        upsert_chunks(client, settings, chunks, embeddings)
+    e2e = timer.stages["end_to_end"]["seconds"]
+    return {"chunks": len(chunks), "stages": timer.stages, "chunks_per_sec": len(chunks) / e2e if e2e else 0.0}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark and profile RAG ingestion")
+    parser.add_argument("folders", nargs="*", help="Folders containing PDF files")
+    parser.add_argument("--synthetic-pages", type=int, default=200, help="Pages to generate when no folder is given")
+    parser.add_argument("--chunk-sizes", type=int, nargs="+", default=[2000, 10000])
+    parser.add_argument("--batch-sizes", type=int, nargs="+", default=[16, 64], help="Texts per embedding request")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 4], help="Embedding requests in flight")
+    parser.add_argument("--embed-latency-ms", type=float, default=50.0, help="Simulated latency per embedding request")
+    parser.add_argument("--dim", type=int, default=256)
+    parser.add_argument("--pdf-workers", type=int, default=Settings().pdf_workers)
+    parser.add_argument("--no-tracemalloc", action="store_true", help="Skip memory tracking (it slows Python code down)")
+    parser.add_argument("--profile", choices=["cprofile", "pyinstrument"], help="Profile the first combination end to end")
+    parser.add_argument("--profile-out", default="ingestion_profile", help="Profile output path (without extension)")
+    parser.add_argument("--json", dest="json_path", help="Write results to this JSON file")
+    args = parser.parse_args()
+    trace_memory = not args.no_tracemalloc
+
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        if args.folders:
+            files = sorted(str(p) for folder in args.folders for p in Path(folder).glob("*.pdf"))
+        else:
+            files = synthetic_pdfs(tmp, args.synthetic_pages)
+        if not files:
+            print("❌ No PDF files found")
+            return
+        print(f"📚 Ingesting {len(files)} PDF files")
+
+        base = dict(state_dir=str(tmp / "state"), pdf_workers=args.pdf_workers,
+                    embed_tokens_per_minute=0, embed_requests_per_minute=0, embed_batch_tokens=10**9)
+        timer = StageTimer(trace_memory)
+        with timer.stage("parse"):
+            docs_by_file = load_pdfs(files, Settings(**base))
+        pages = sum(len(d) for d in docs_by_file.values())
+        print(f"📄 Parsed {pages} pages in {timer.stages['parse']['seconds']:.2f}s")
+
+        embeddings = FakeEmbeddings(args.dim, latency=args.embed_latency_ms / 1000)
+        combos = list(itertools.product(args.chunk_sizes, args.batch_sizes, args.concurrency))
+        runs = []
+        header = f"{'chunk':>6} {'batch':>5} {'conc':>4} {'chunks':>6}"
+        stage_names = ["split", "embed", "build_points", "upsert", "end_to_end"]
+        print(header + "".join(f" {name:>12}" for name in stage_names) + f" {'chunks/s':>9}   (seconds / peak MB)")
+        for n, (chunk_size, batch_size, concurrency) in enumerate(combos):
+            settings = Settings(collection=f"bench_ingestion_{n}", chunk_size=chunk_size, chunk_overlap=min(300, chunk_size // 10),
+                                embed_batch_size=batch_size, embed_concurrency=concurrency, **base)
+            if args.profile and n == 0:
+                run = profile_run(args, docs_by_file, settings, embeddings, trace_memory)
+            else:
+                run = run_combination(docs_by_file, settings, embeddings, args.dim, trace_memory)
+            run.update({"chunk_size": chunk_size, "batch_size": batch_size, "concurrency": concurrency})
+            runs.append(run)
+            cells = "".join(f" {run['stages'][s]['seconds']:>6.2f}/{run['stages'][s]['peak_mb']:<5.1f}" for s in stage_names)
+            print(f"{chunk_size:>6} {batch_size:>5} {concurrency:>4} {run['chunks']:>6}{cells} {run['chunks_per_sec']:>9.1f}")
+
+    if args.json_path:
+        with open(args.json_path, "w", encoding="utf-8") as f:
+            json.dump({"files": len(files), "pages": pages, "parse": timer.stages["parse"], "runs": runs}, f, indent=2)
+        print(f"💾 Results written to {args.json_path}")
+
+
+def profile_run(args, docs_by_file, settings: Settings, embeddings: FakeEmbeddings, trace_memory: bool) -> dict:
+    """Run one combination under cProfile or pyinstrument and save the profile."""
+    if args.profile == "cprofile":
+        profiler = cProfile.Profile()
+        run = profiler.runcall(run_combination, docs_by_file, settings, embeddings, args.dim, trace_memory)
+        path = f"{args.profile_out}.prof"
+        profiler.dump_stats(path)
+        pstats.Stats(profiler).sort_stats("cumulative").print_stats(20)
+    else:
+        try:
+            from pyinstrument import Profiler
+        except ImportError:
+            raise SystemExit("❌ pyinstrument is not installed (pip install pyinstrument)")
+        profiler = Profiler()
+        profiler.start()
+        run = run_combination(docs_by_file, settings, embeddings, args.dim, trace_memory)
+        profiler.stop()
+        path = f"{args.profile_out}.html"
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(profiler.output_html())
+        print(profiler.output_text(unicode=True, color=False))
+    print(f"🔬 Profile written to {path}")
+    return run
+
+
+if __name__ == "__main__":
+    main()
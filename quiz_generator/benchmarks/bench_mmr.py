@@ -0,0 +1,94 @@
+"""
+Benchmark for MMR selection.
+
+Compares the vectorized ``mmr_select`` against the previous pure-Python
+implementation at several candidate counts.
+
+Usage:
+    python benchmarks/bench_mmr.py [--dim 1536] [--k 6] [--repeat 5]
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+from typing import List
+
+import numpy as np
+
+# Add src to the path for imports
+src_path = Path(__file__).parent.parent / "src"
+sys.path.insert(0, str(src_path))
+
+from quiz_generator.utils.rag_qdrant_hybrid import mmr_select, mmr_select_batch
+
+
+def mmr_select_legacy(query_vec: List[float], candidates_vecs: List[List[float]], k: int, lambda_mult: float) -> List[int]:
+    """Previous O(k*N) Python-loop implementation, kept as the baseline."""
+    V = np.array(candidates_vecs, dtype=float)
+    q = np.array(query_vec, dtype=float)
+    def cos(a, b):
+        na = (a @ a) ** 0.5 + 1e-12
+        nb = (b @ b) ** 0.5 + 1e-12
+        return float((a @ b) / (na * nb))
+    sims = [cos(v, q) for v in V]
+    selected: List[int] = []
+    remaining = set(range(len(V)))
+    while len(selected) < min(k, len(V)):
+        if not selected:
+            best = max(remaining, key=lambda i: sims[i])
+            selected.append(best)
+            remaining.remove(best)
+            continue
+        best_idx = None
+        best_score = -1e9
+        for i in remaining:
+            max_div = max([cos(V[i], V[j]) for j in selected]) if selected else 0.0
+            score = lambda_mult * sims[i] - (1 - lambda_mult) * max_div
+            if score > best_score:
+                best_score = score
+                best_idx = i
+        selected.append(best_idx)
+        remaining.remove(best_idx)
+    return selected
+
+
+def timeit(func, repeat: int) -> float:
+    """Return the best wall-clock time (seconds) over ``repeat`` runs."""
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark MMR selection")
+    parser.add_argument("--dim", type=int, default=1536)
+    parser.add_argument("--k", type=int, default=6)
+    parser.add_argument("--lambda-mult", type=float, default=0.6)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--queries", type=int, default=8, help="Queries for the batch API")
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    print(f"{'N':>6} {'legacy (ms)':>12} {'vectorized (ms)':>16} {'speedup':>8} {'batch/query (ms)':>17}")
+    for n in (30, 300, 3000):
+        q = rng.normal(size=args.dim).tolist()
+        cands = rng.normal(size=(n, args.dim)).tolist()
+        assert mmr_select_legacy(q, cands, args.k, args.lambda_mult) == mmr_select(q, cands, args.k, args.lambda_mult)
+
+        legacy_repeat = 1 if n >= 3000 else args.repeat
+        t_legacy = timeit(lambda: mmr_select_legacy(q, cands, args.k, args.lambda_mult), legacy_repeat)
+        t_fast = timeit(lambda: mmr_select(q, cands, args.k, args.lambda_mult), args.repeat)
+
+        qs = rng.normal(size=(args.queries, args.dim)).tolist()
+        batch = [cands] * args.queries
+        t_batch = timeit(lambda: mmr_select_batch(qs, batch, args.k, args.lambda_mult), args.repeat) / args.queries
+
+        print(f"{n:>6} {t_legacy * 1e3:>12.2f} {t_fast * 1e3:>16.2f} {t_legacy / t_fast:>7.1f}x {t_batch * 1e3:>17.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,123 @@
+"""
+Benchmark for the PDF extraction backends.
+
+Parses every PDF of the given dataset folders with each backend in
+``PDF_LOADERS`` and reports pages/sec, peak RSS and the similarity of the
+extracted text to a reference backend. Each backend runs in its own process
+so peak memory is measured in isolation.
+
+Usage:
+    python benchmarks/bench_pdf_backends.py [folder ...] [--reference pdfminer] [--json results.json]
+
+Without folders, every certification folder under ``src/quiz_generator/dataset``
+is used.
+"""
+
+import argparse
+import json
+import multiprocessing as mp
+import re
+import resource
+import sys
+import time
+from collections import Counter
+from pathlib import Path
+from typing import Dict, List
+
+# Add src to the path for imports
+src_path = Path(__file__).parent.parent / "src"
+sys.path.insert(0, str(src_path))
+
+from quiz_generator.utils.rag_qdrant_hybrid import PDF_LOADERS, load_pdf
+
+DEFAULT_DATASET = src_path / "quiz_generator" / "dataset"
+
+
+def _words(text: str) -> Counter:
+    return Counter(re.findall(r"\w+", text.lower()))
+
+
+def text_similarity(text: str, reference: str) -> float:
+    """Bag-of-words F1 between two extractions (1.0 = same words)."""
+    a, b = _words(text), _words(reference)
+    if not a and not b:
+        return 1.0
+    overlap = sum((a & b).values())
+    if not overlap:
+        return 0.0
+    precision = overlap / sum(a.values())
+    recall = overlap / sum(b.values())
+    return 2 * precision * recall / (precision + recall)
+
+
+def _run_backend(backend: str, files: List[str], queue: mp.Queue):
+    """Parse ``files`` with ``backend`` and report timings from a child process."""
+    texts: Dict[str, str] = {}
+    pages = 0
+    t0 = time.perf_counter()
+    for path in files:
+        docs = load_pdf(path, mode="page", backend=backend)
+        pages += len(docs)
+        texts[path] = "\n".join(d.page_content for d in docs)
+    elapsed = time.perf_counter() - t0
+    # ru_maxrss is KiB on Linux, bytes on macOS
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    peak_mb = rss / (1024 * 1024) if sys.platform == "darwin" else rss / 1024
+    queue.put({"backend": backend, "pages": pages, "seconds": elapsed, "peak_rss_mb": peak_mb, "texts": texts})
+
+
+def run_backend(backend: str, files: List[str]) -> dict:
+    """Run one backend in a fresh process and return its measurements."""
+    ctx = mp.get_context("spawn")
+    queue = ctx.Queue()
+    proc = ctx.Process(target=_run_backend, args=(backend, files, queue))
+    proc.start()
+    result = queue.get()
+    proc.join()
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark PDF extraction backends")
+    parser.add_argument("folders", nargs="*", help="Folders containing PDF files")
+    parser.add_argument("--backends", nargs="+", default=list(PDF_LOADERS), choices=list(PDF_LOADERS))
+    parser.add_argument("--reference", default="pdfminer", choices=list(PDF_LOADERS))
+    parser.add_argument("--json", dest="json_path", help="Write results to this JSON file")
+    args = parser.parse_args()
+
+    folders = [Path(f) for f in args.folders] or sorted(p for p in DEFAULT_DATASET.glob("*/*") if p.is_dir())
+    files = sorted(str(p) for folder in folders for p in folder.glob("*.pdf"))
+    if not files:
+        print("❌ No PDF files found")
+        return
+    print(f"📚 Benchmarking {len(files)} PDF files from {len(folders)} folders")
+
+    backends = list(dict.fromkeys([args.reference] + args.backends))
+    runs = {b: run_backend(b, files) for b in backends}
+    reference = runs[args.reference]["texts"]
+
+    results = []
+    print(f"{'backend':>10} {'pages':>6} {'seconds':>8} {'pages/s':>8} {'peak RSS (MB)':>14} {'similarity':>11}")
+    for backend in args.backends:
+        run = runs[backend]
+        similarity = sum(text_similarity(run["texts"][f], reference[f]) for f in files) / len(files)
+        row = {
+            "backend": backend,
+            "pages": run["pages"],
+            "seconds": run["seconds"],
+            "pages_per_sec": run["pages"] / run["seconds"] if run["seconds"] else 0.0,
+            "peak_rss_mb": run["peak_rss_mb"],
+            "similarity_to_reference": similarity,
+        }
+        results.append(row)
+        print(f"{backend:>10} {row['pages']:>6} {row['seconds']:>8.2f} {row['pages_per_sec']:>8.1f} "
+              f"{row['peak_rss_mb']:>14.1f} {similarity:>11.3f}")
+
+    if args.json_path:
+        with open(args.json_path, "w", encoding="utf-8") as f:
+            json.dump({"reference": args.reference, "files": len(files), "results": results}, f, indent=2)
+        print(f"💾 Results written to {args.json_path}")
+
+
+if __name__ == "__main__":
+    main()
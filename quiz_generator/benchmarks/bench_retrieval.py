@@ -0,0 +1,201 @@
+"""
+Recall/latency benchmark for the retrieval stack.
+
+Indexes synthetic corpora of several sizes with a deterministic fake
+embedder and measures, per corpus size:
+
+* p50/p95/p99 latency and throughput of ``qdrant_semantic_search``,
+  ``qdrant_text_prefilter_ids``, ``hybrid_search`` and ``mmr_select``
+* recall@k of the approximate dense search against exact search, and its
+  latency, for every tuning profile in ``TUNING_PROFILES``
+
+Usage:
+    python benchmarks/bench_retrieval.py [--sizes 1000 5000] [--queries 100] [--url URL | --path DIR]
+                                         [--json results.json] [--baseline previous.json]
+
+Without ``--url``/``--path`` Qdrant local mode runs in memory. Local mode
+always searches exhaustively and ignores HNSW and quantization, so recall
+per profile is only meaningful against a real server (``--url``).
+``--baseline`` prints the p50 change of every measurement against a JSON
+file written by an earlier run.
+"""
+
+import argparse
+import json
+import subprocess
+import tempfile
+import time
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+import numpy as np
+from qdrant_client import QdrantClient
+from qdrant_client.models import SearchParams
+
+from _common import FakeEmbeddings, synthetic_corpus, synthetic_queries
+from quiz_generator.utils.rag_qdrant_hybrid import (
+    Settings,
+    dense_vector,
+    get_search_params,
+    get_vector_layout,
+    hybrid_search,
+    mmr_select,
+    qdrant_semantic_search,
+    qdrant_text_prefilter_ids,
+    recreate_collection_for_rag,
+    upsert_chunks,
+)
+from quiz_generator.utils.tuning_profiles import TUNING_PROFILES
+
+
+def summarize(timings_ms: List[float]) -> Dict[str, float]:
+    """Return p50/p95/p99 (ms) and throughput (calls/s) of a timing series."""
+    arr = np.asarray(timings_ms)
+    return {
+        "p50_ms": float(np.percentile(arr, 50)),
+        "p95_ms": float(np.percentile(arr, 95)),
+        "p99_ms": float(np.percentile(arr, 99)),
+        "throughput_qps": float(len(arr) / (arr.sum() / 1e3)) if arr.sum() else 0.0,
+    }
+
+
+def time_calls(func: Callable[[int], object], n: int, warmup: int = 3) -> List[float]:
+    """Call ``func(i)`` for ``i`` in ``range(n)`` and return per-call timings in ms."""
+    for i in range(min(warmup, n)):
+        func(i)
+    timings = []
+    for i in range(n):
+        t0 = time.perf_counter()
+        func(i)
+        timings.append((time.perf_counter() - t0) * 1e3)
+    return timings
+
+
+def build_collection(client: QdrantClient, settings: Settings, chunks, embeddings, dim: int):
+    """(Re)create ``settings.collection`` and index ``chunks`` into it."""
+    if client.collection_exists(settings.collection):
+        client.delete_collection(settings.collection)
+    recreate_collection_for_rag(client, settings, dim)
+    upsert_chunks(client, settings, chunks, embeddings)
+
+
+def bench_latency(client: QdrantClient, settings: Settings, queries: List[str], vectors, embeddings) -> Dict[str, dict]:
+    """Latency of each retrieval stage over ``queries``."""
+    layout = get_vector_layout(client, settings)
+    candidates = [
+        [dense_vector(p, layout) for p in qdrant_semantic_search(
+            client, settings, q, None, limit=settings.top_n_semantic, with_vectors=True, query_vector=qv)]
+        for q, qv in zip(queries, vectors)
+    ]
+    n = len(queries)
+    stages = {
+        "qdrant_semantic_search": lambda i: qdrant_semantic_search(
+            client, settings, queries[i], None, limit=settings.top_n_semantic, query_vector=vectors[i]),
+        "qdrant_text_prefilter_ids": lambda i: qdrant_text_prefilter_ids(client, settings, queries[i], settings.top_n_text),
+        "hybrid_search": lambda i: hybrid_search(client, settings, queries[i], embeddings, query_vector=vectors[i]),
+        "mmr_select": lambda i: mmr_select(vectors[i], candidates[i], settings.final_k, settings.mmr_lambda),
+    }
+    return {name: summarize(time_calls(func, n)) for name, func in stages.items()}
+
+
+def bench_recall(client: QdrantClient, settings: Settings, vectors, k: int) -> Dict[str, float]:
+    """recall@k and latency of the approximate dense search against exact search."""
+    layout = get_vector_layout(client, settings)
+    params = get_search_params(settings)
+    exact = SearchParams(exact=True)
+
+    def search(qv, search_params):
+        return client.query_points(settings.collection, query=qv, using=layout.dense, limit=k,
+                                   search_params=search_params, with_payload=False).points
+
+    recalls = []
+    for qv in vectors:
+        truth = {p.id for p in search(qv, exact)}
+        found = {p.id for p in search(qv, params)}
+        recalls.append(len(truth & found) / max(1, len(truth)))
+    result = {"recall_at_k": float(np.mean(recalls))}
+    result.update(summarize(time_calls(lambda i: search(vectors[i], params), len(vectors))))
+    return result
+
+
+def git_commit() -> Optional[str]:
+    """Return the current commit hash, if running inside a git checkout."""
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                              check=True, cwd=Path(__file__).parent).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def print_baseline_diff(results: dict, baseline_path: str):
+    """Print the p50 change of every measurement present in both runs."""
+    with open(baseline_path, "r", encoding="utf-8") as f:
+        baseline = json.load(f)
+    print(f"\n📊 p50 change vs {baseline_path} (commit {baseline.get('commit')})")
+    for section in ("latency", "profiles"):
+        for size, rows in results[section].items():
+            for name, row in rows.items():
+                old = baseline.get(section, {}).get(size, {}).get(name)
+                if old and old.get("p50_ms"):
+                    change = (row["p50_ms"] - old["p50_ms"]) / old["p50_ms"] * 100
+                    print(f"{section:>9} {size:>7} {name:>27} {old['p50_ms']:>8.2f} -> {row['p50_ms']:>8.2f} ms ({change:+.1f}%)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark retrieval latency and recall")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 5000], help="Corpus sizes (chunks)")
+    parser.add_argument("--queries", type=int, default=100)
+    parser.add_argument("--dim", type=int, default=256)
+    parser.add_argument("--k", type=int, default=6)
+    parser.add_argument("--profiles", nargs="+", default=list(TUNING_PROFILES), choices=list(TUNING_PROFILES))
+    parser.add_argument("--url", help="Qdrant server URL")
+    parser.add_argument("--path", help="Qdrant local mode storage directory (default: in memory)")
+    parser.add_argument("--json", dest="json_path", help="Write results to this JSON file")
+    parser.add_argument("--baseline", help="JSON results of a previous run to compare against")
+    args = parser.parse_args()
+
+    if args.url:
+        client = QdrantClient(url=args.url)
+    else:
+        client = QdrantClient(path=args.path) if args.path else QdrantClient(":memory:")
+    embeddings = FakeEmbeddings(args.dim)
+    queries = synthetic_queries(args.queries)
+    vectors = embeddings.embed_documents(queries)
+    results = {"commit": git_commit(), "config": vars(args), "latency": {}, "profiles": {}}
+
+    with tempfile.TemporaryDirectory() as state_dir:
+        for size in args.sizes:
+            chunks = synthetic_corpus(size)
+            print(f"\n📚 Corpus of {size} chunks")
+
+            settings = Settings(collection=f"bench_retrieval_{size}", state_dir=state_dir, final_k=args.k,
+                                embed_tokens_per_minute=0, embed_requests_per_minute=0)
+            build_collection(client, settings, chunks, embeddings, args.dim)
+            latency = bench_latency(client, settings, queries, vectors, embeddings)
+            results["latency"][str(size)] = latency
+            print(f"{'stage':>27} {'p50 (ms)':>9} {'p95 (ms)':>9} {'p99 (ms)':>9} {'qps':>9}")
+            for name, row in latency.items():
+                print(f"{name:>27} {row['p50_ms']:>9.2f} {row['p95_ms']:>9.2f} {row['p99_ms']:>9.2f} {row['throughput_qps']:>9.1f}")
+
+            results["profiles"][str(size)] = {}
+            print(f"{'profile':>27} {'recall@k':>9} {'p50 (ms)':>9} {'p95 (ms)':>9} {'p99 (ms)':>9}")
+            for profile in args.profiles:
+                settings = Settings(collection=f"bench_retrieval_{size}_{profile.replace('-', '_')}", state_dir=state_dir,
+                                    final_k=args.k, tuning_profile=profile,
+                                    embed_tokens_per_minute=0, embed_requests_per_minute=0)
+                build_collection(client, settings, chunks, embeddings, args.dim)
+                row = bench_recall(client, settings, vectors, args.k)
+                results["profiles"][str(size)][profile] = row
+                print(f"{profile:>27} {row['recall_at_k']:>9.3f} {row['p50_ms']:>9.2f} {row['p95_ms']:>9.2f} {row['p99_ms']:>9.2f}")
+                client.delete_collection(settings.collection)
+
+    if args.json_path:
+        with open(args.json_path, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+        print(f"💾 Results written to {args.json_path}")
+    if args.baseline:
+        print_baseline_diff(results, args.baseline)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,233 @@
+"""
+Headless batch quiz generation driven by a job manifest.
+
+A manifest lists quiz requests, either as YAML (a list, or a mapping with a
+``jobs`` list) or as JSONL (one job per line)::
+
+    jobs:
+      - provider: azure
+        certification: AI_900
+        topic: "1"
+        number_of_questions: 5
+        question_type: Mixed
+        id: ai900-luis          # optional
+
+Every job is validated against the dataset tree before anything runs. The
+vector database of each certification is initialized once, then the jobs run
+through ``QuizGeneratorFlow`` in up to ``concurrency`` worker processes. Each
+job uses ``<output_dir>/<batch_id>/<job_id>/`` as its run workspace (flow
+``run_id``/``output_dir``) and logs to ``flow.log`` there; ``summary.json``
+reports throughput and failures.
+
+Usage:
+    batch manifest.yaml [--concurrency 2] [--output-dir outputs/batch]
+"""
+
+import argparse
+import json
+import multiprocessing
+import os
+import re
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+from .utils.user_utils import validate_selections
+
+DATASET_PATH = os.path.join(os.path.dirname(__file__), "dataset")
+JOB_FIELDS = ("provider", "certification", "topic", "number_of_questions", "question_type")
+
+
+def load_manifest(path: str) -> List[Dict[str, Any]]:
+    """
+    Load the jobs of a YAML or JSONL manifest.
+
+    Args:
+        path (str): Manifest path (``.jsonl`` is read as JSONL, anything else as YAML)
+
+    Returns:
+        List[Dict[str, Any]]: One dict per job, in manifest order
+    """
+    with open(path, "r", encoding="utf-8") as f:
+        if path.endswith(".jsonl"):
+            return [json.loads(line) for line in f if line.strip()]
+        import yaml
+
+        data = yaml.safe_load(f) or []
+    jobs = data.get("jobs", []) if isinstance(data, dict) else data
+    if not isinstance(jobs, list) or not all(isinstance(job, dict) for job in jobs):
+        raise ValueError(f"Manifest {path} must contain a list of jobs")
+    return jobs
+
+
+def job_id(index: int, job: Dict[str, Any]) -> str:
+    """Return a filesystem-safe, unique id for the ``index``-th job."""
+    name = job.get("id") or f"{job.get('provider')}_{job.get('certification')}_{job.get('topic')}"
+    return f"{index:03d}_{re.sub(r'[^A-Za-z0-9_.-]+', '-', str(name))}"
+
+
+def normalize_job(job: Dict[str, Any]) -> Dict[str, Any]:
+    """Return ``job`` with its dataset names as strings (YAML reads ``topic: 1`` as an int)."""
+    return {**job, **{field: str(job[field]) for field in ("provider", "certification", "topic")
+                      if job.get(field) is not None}}
+
+
+def validate_job(job: Dict[str, Any], dataset_path: str = DATASET_PATH) -> List[str]:
+    """Return the problems of a job (missing fields, unknown dataset entries, bad options)."""
+    job = normalize_job(job)
+    missing = [field for field in JOB_FIELDS if job.get(field) in (None, "")]
+    if missing:
+        return [f"Missing fields: {', '.join(missing)}"]
+    return validate_selections(dataset_path, *(job[field] for field in JOB_FIELDS))
+
+
+def _run_job(job: Dict[str, Any], job_dir: str, dataset_path: str) -> Dict[str, Any]:
+    """Run one job through the flow with ``job_dir`` as run workspace (executed in a worker process)."""
+    os.makedirs(job_dir, exist_ok=True)
+    # Redirect at the fd level so crewai/litellm output lands in the log too; flush
+    # first so nothing buffered before the redirect is written to this job's log
+    sys.stdout.flush()
+    sys.stderr.flush()
+    log = os.open(os.path.join(job_dir, "flow.log"), os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+    os.dup2(log, 1)
+    os.dup2(log, 2)
+    os.close(log)
+
+    from .main import QuizGeneratorFlow
+
+    start = time.perf_counter()
+    flow = QuizGeneratorFlow()
+    try:
+        flow.kickoff(inputs={**{field: job[field] for field in JOB_FIELDS}, "database_initialized": True,
+                             "dataset_path": dataset_path, "run_id": os.path.basename(job_dir),
+                             "output_dir": job_dir})
+        error = flow.state.error_message
+        if not error and not flow.state.quiz_generated:
+            error = "Quiz was not generated"
+    except Exception as e:
+        error = f"{type(e).__name__}: {e}"
+    finally:
+        sys.stdout.flush()
+        sys.stderr.flush()
+    outputs = sorted(name for name in os.listdir(job_dir) if name != "flow.log")
+    return {"status": "failed" if error else "succeeded", "error": error,
+            "seconds": round(time.perf_counter() - start, 2), "outputs": outputs}
+
+
+def run_batch(jobs: List[Dict[str, Any]], concurrency: int = 1, output_dir: str = "outputs/batch",
+              dataset_path: str = DATASET_PATH, batch_id: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Validate and run ``jobs``, writing per-job outputs and ``summary.json``.
+
+    Args:
+        jobs (List[Dict]): Jobs as returned by ``load_manifest``
+        concurrency (int): Jobs running at the same time (worker processes)
+        output_dir (str): Root folder of the batch runs
+        dataset_path (str): Dataset folder the jobs are validated against
+        batch_id (str, optional): Folder name of this run (default: timestamp)
+
+    Returns:
+        Dict[str, Any]: The summary also written to ``summary.json``
+    """
+    batch_id = batch_id or datetime.now().strftime("%Y%m%d_%H%M%S")
+    batch_dir = os.path.abspath(os.path.join(output_dir, batch_id))
+    os.makedirs(batch_dir, exist_ok=True)
+    start = time.perf_counter()
+
+    results: Dict[str, Dict[str, Any]] = {}
+    runnable: Dict[str, Dict[str, Any]] = {}
+    for index, job in enumerate(jobs):
+        jid = job_id(index, job)
+        errors = validate_job(job, dataset_path)
+        if errors:
+            results[jid] = {"job": job, "status": "invalid", "error": "; ".join(errors)}
+            print(f"❌ Job {jid} is invalid: {results[jid]['error']}")
+        else:
+            runnable[jid] = normalize_job(job)
+    print(f"📋 {len(runnable)}/{len(jobs)} valid jobs, running with concurrency {concurrency}")
+
+    # Initialize each certification once, before jobs start sharing its collection
+    from .utils.database_utils import initialize_database
+
+    failed_databases = set()
+    for provider, certification in dict.fromkeys((job["provider"], job["certification"]) for job in runnable.values()):
+        try:
+            ok = initialize_database(provider, certification, dataset_path)
+        except Exception as e:
+            print(f"❌ Database initialization failed for {provider}/{certification}: {e}")
+            ok = False
+        if not ok:
+            failed_databases.add((provider, certification))
+    for jid, job in list(runnable.items()):
+        if (job["provider"], job["certification"]) in failed_databases:
+            results[jid] = {"job": job, "status": "failed", "error": "Database initialization failed"}
+            del runnable[jid]
+
+    # Worker processes are spawned and used for a single job: each job gets a clean
+    # interpreter, its own log, and no state left over from a previous flow
+    context = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=max(1, concurrency), mp_context=context,
+                             max_tasks_per_child=1) as pool:
+        futures = {pool.submit(_run_job, job, os.path.join(batch_dir, jid), dataset_path): jid for jid, job in runnable.items()}
+        for future in as_completed(futures):
+            jid = futures[future]
+            try:
+                result = future.result()
+            except Exception as e:
+                result = {"status": "failed", "error": f"Worker crashed: {e}"}
+            results[jid] = {"job": runnable[jid], **result}
+            icon = "✅" if result["status"] == "succeeded" else "❌"
+            print(f"{icon} Job {jid} {result['status']} {result.get('error') or ''}".rstrip())
+
+    elapsed = time.perf_counter() - start
+    succeeded = sum(r["status"] == "succeeded" for r in results.values())
+    summary = {
+        "batch_id": batch_id,
+        "jobs": len(jobs),
+        "succeeded": succeeded,
+        "failed": sum(r["status"] == "failed" for r in results.values()),
+        "invalid": sum(r["status"] == "invalid" for r in results.values()),
+        "concurrency": concurrency,
+        "seconds": round(elapsed, 2),
+        "quizzes_per_minute": round(succeeded / elapsed * 60, 2) if elapsed else 0.0,
+        "results": dict(sorted(results.items())),
+    }
+    with open(os.path.join(batch_dir, "summary.json"), "w", encoding="utf-8") as f:
+        json.dump(summary, f, indent=2, ensure_ascii=False)
+    return summary
+
+
+def main():
+    """Entry point of the ``batch`` script."""
+    parser = argparse.ArgumentParser(description="Generate quizzes in batch from a job manifest")
+    parser.add_argument("manifest", help="YAML or JSONL manifest of quiz jobs")
+    parser.add_argument("--concurrency", type=int, default=1, help="Jobs running at the same time")
+    parser.add_argument("--output-dir", default="outputs/batch", help="Root folder of batch outputs")
+    parser.add_argument("--validate-only", action="store_true", help="Only validate the manifest")
+    args = parser.parse_args()
+
+    from .main import init_runtime
+
+    init_runtime()
+    jobs = load_manifest(args.manifest)
+    if args.validate_only:
+        problems = {job_id(i, job): validate_job(job) for i, job in enumerate(jobs)}
+        for jid, errors in problems.items():
+            print(f"{'❌' if errors else '✅'} {jid} {'; '.join(errors)}".rstrip())
+        raise SystemExit(1 if any(problems.values()) else 0)
+
+    summary = run_batch(jobs, concurrency=args.concurrency, output_dir=args.output_dir)
+    print("\n" + "=" * 60)
+    print("📋 BATCH SUMMARY")
+    print("=" * 60)
+    print(f"✅ Succeeded: {summary['succeeded']}/{summary['jobs']}")
+    print(f"❌ Failed: {summary['failed']}  ⚠️ Invalid: {summary['invalid']}")
+    print(f"⏱️ {summary['seconds']}s ({summary['quizzes_per_minute']} quizzes/min)")
+    print(f"💾 Summary written to {os.path.join(args.output_dir, summary['batch_id'], 'summary.json')}")
+    raise SystemExit(0 if summary["succeeded"] == summary["jobs"] else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -8,15 +8,17 @@ YAML for both agents and tasks.
 Classes
 -------
 QuizEvaluatorCrew
-    Crew that generates `outputs/quiz_evaluation.md` from inputs.
+    Crew that generates `<output_dir>/quiz_evaluation.md` from inputs.
 
 Examples
 --------
 >>> from quiz_generator.crews.quiz_evaluator_crew.quiz_evaluator_crew import QuizEvaluatorCrew
 >>> crew = QuizEvaluatorCrew()
->>> result = crew.crew().kickoff()
+>>> result = crew.crew().kickoff(inputs={..., "output_dir": "outputs/runs/<run_id>"})
 """
 
+import os
+
 from crewai import Agent, Crew, Process, Task
 from crewai.project import CrewBase, agent, crew, task
 from crewai.agents.agent_builder.base_agent import BaseAgent
@@ -37,10 +39,22 @@ class QuizEvaluatorCrew():
     Attributes:
         agents (List[BaseAgent]): Agents created from YAML configuration.
         tasks (List[Task]): Tasks created from YAML configuration.
+        output_dir (str): Run output directory with the quiz and answers.
     """
 
     agents: List[BaseAgent]
     tasks: List[Task]
+    output_dir: str = "outputs"
+
+    def __init__(self, output_dir: str = "outputs", **kwargs):
+        """Initialize crew with the run output directory.
+
+        Args:
+            output_dir (str): Run output directory read and written by the tasks.
+            **kwargs: Additional keyword arguments forwarded to the base class.
+        """
+        super().__init__(**kwargs)
+        self.output_dir = output_dir
 
     # Learn more about YAML configuration files here:
     # Agents: https://docs.crewai.com/concepts/agents#yaml-configuration-recommended
@@ -61,8 +75,8 @@ class QuizEvaluatorCrew():
         return Agent(
             config=self.agents_config['quiz_evaluator'], # type: ignore[index]
             tools=[
-                FileReadTool(file_path='outputs/completed_quiz.md'), # Tool to read the completed quiz
-                FileReadTool(file_path='outputs/questions.json'), # Tool to read the correct answers
+                FileReadTool(file_path=os.path.join(self.output_dir, 'completed_quiz.md')), # Tool to read the completed quiz
+                FileReadTool(file_path=os.path.join(self.output_dir, 'questions.json')), # Tool to read the correct answers
             ],
             verbose=True
         )
@@ -79,7 +93,7 @@ class QuizEvaluatorCrew():
         """
         return Task(
             config=self.tasks_config['quiz_evaluation_task'], # type: ignore[index]
-            output_file='outputs/quiz_evaluation.md'
+            output_file='{output_dir}/quiz_evaluation.md'  # Interpolated from the kickoff inputs
         )
 
     @crew
@@ -3,20 +3,24 @@ Quiz generation crew for composing and exporting quizzes.
 
 This module defines a crew that assembles a quiz from a Markdown template and
 pre-computed questions, and can export the final result to PDF via a tool.
-Agents and tasks are configured through YAML files.
+Agents and tasks are configured through YAML files. The flow fills templates
+with ``utils.quiz_assembly`` and only runs this crew as a fallback for
+templates whose placeholders cannot be filled deterministically.
 
 Classes
 -------
 QuizMakerCrew
-    Crew that produces `outputs/quiz.md` and optionally a PDF export.
+    Crew that produces `<output_dir>/quiz.md` and optionally a PDF export.
 
 Examples
 --------
 >>> from quiz_generator.crews.quiz_maker_crew.quiz_maker_crew import QuizMakerCrew
 >>> crew = QuizMakerCrew()
->>> result = crew.crew().kickoff()
+>>> result = crew.crew().kickoff(inputs={..., "output_dir": "outputs/runs/<run_id>"})
 """
 
+import os
+
 from crewai import Agent, Crew, Process, Task
 from crewai.project import CrewBase, agent, crew, task
 from crewai.agents.agent_builder.base_agent import BaseAgent
@@ -35,10 +39,22 @@ class QuizMakerCrew():
     Attributes:
         agents (List[BaseAgent]): Agents created from YAML configuration.
         tasks (List[Task]): Tasks created from YAML configuration.
+        output_dir (str): Run output directory for the inputs, quiz and PDF.
     """
 
     agents: List[BaseAgent]
     tasks: List[Task]
+    output_dir: str = "outputs"
+
+    def __init__(self, output_dir: str = "outputs", **kwargs):
+        """Initialize crew with the run output directory.
+
+        Args:
+            output_dir (str): Run output directory read and written by the tasks.
+            **kwargs: Additional keyword arguments forwarded to the base class.
+        """
+        super().__init__(**kwargs)
+        self.output_dir = output_dir
 
     # Learn more about YAML configuration files here:
     # Agents: https://docs.crewai.com/concepts/agents#yaml-configuration-recommended
@@ -58,9 +74,9 @@ class QuizMakerCrew():
         """
         return Agent(
             config=self.agents_config['quiz_maker'], # type: ignore[index]
-            tools=[FileReadTool(file_path='outputs/quiz_template.md'), # Tool to read the quiz template
-                   FileReadTool(file_path='outputs/questions.json'), # Tool to read the questions JSON
-                   MarkdownToPdfExporter() # Tool to convert markdown to PDF
+            tools=[FileReadTool(file_path=os.path.join(self.output_dir, 'quiz_template.md')), # Tool to read the quiz template
+                   FileReadTool(file_path=os.path.join(self.output_dir, 'questions.json')), # Tool to read the questions JSON
+                   MarkdownToPdfExporter(output_dir=self.output_dir) # Tool to convert markdown to PDF
                   ],
             verbose=True
         )
@@ -73,11 +89,11 @@ class QuizMakerCrew():
         """Create the task that composes the quiz Markdown file.
 
         Returns:
-            Task: Task definition producing `outputs/quiz.md`.
+            Task: Task definition producing `<output_dir>/quiz.md`.
         """
         return Task(
             config=self.tasks_config['quiz_maker_task'], # type: ignore[index]
-            output_file='outputs/quiz.md'
+            output_file='{output_dir}/quiz.md'  # Interpolated from the kickoff inputs
         )
     
     @task
@@ -8,15 +8,17 @@ It outputs a completed quiz file ready for evaluation.
 Classes
 -------
 QuizTakerCrew
-    Crew that answers questions and writes `outputs/completed_quiz.md`.
+    Crew that answers questions and writes `<output_dir>/completed_quiz.md`.
 
 Examples
 --------
 >>> from quiz_generator.crews.quiz_taker_crew.quiz_taker_crew import QuizTakerCrew
 >>> crew = QuizTakerCrew(provider="azure", certification="ai900")
->>> result = crew.crew().kickoff()
+>>> result = crew.crew().kickoff(inputs={..., "output_dir": "outputs/runs/<run_id>"})
 """
 
+import os
+
 from crewai import Agent, Crew, Process, Task
 from crewai.project import CrewBase, agent, crew, task
 from crewai.agents.agent_builder.base_agent import BaseAgent
@@ -37,6 +39,7 @@ class QuizTakerCrew():
         tasks (List[Task]): Tasks created from YAML configuration.
         provider (str | None): Provider name used to scope RAG searches.
         certification (str | None): Certification name used to scope RAG searches.
+        output_dir (str): Run output directory with the quiz and answers.
     """
 
     agents: List[BaseAgent]
@@ -45,18 +48,21 @@ class QuizTakerCrew():
     # Provider and certification for RAG tool configuration
     provider: str = None
     certification: str = None
+    output_dir: str = "outputs"
 
-    def __init__(self, provider: str = None, certification: str = None, **kwargs):
+    def __init__(self, provider: str = None, certification: str = None, output_dir: str = "outputs", **kwargs):
         """Initialize crew with scoped Retrieval-Augmented Generation (RAG) options.
 
         Args:
             provider (str | None): Provider name for the RAG collection.
             certification (str | None): Certification name for the RAG collection.
+            output_dir (str): Run output directory read and written by the tasks.
             **kwargs: Additional keyword arguments forwarded to the base class.
         """
         super().__init__(**kwargs)
         self.provider = provider
         self.certification = certification
+        self.output_dir = output_dir
 
     # Learn more about YAML configuration files here:
     # Agents: https://docs.crewai.com/concepts/agents#yaml-configuration-recommended
@@ -77,7 +83,7 @@ class QuizTakerCrew():
         return Agent(
             config=self.agents_config['quiz_taker_student'], # type: ignore[index]
             tools=[
-                FileReadTool(file_path='outputs/quiz.md'), # Tool to read the generated quiz
+                FileReadTool(file_path=os.path.join(self.output_dir, 'quiz.md')), # Tool to read the generated quiz
                 RagTool(provider=self.provider, certification=self.certification) # Tool to search knowledge base
             ],
             verbose=True
@@ -91,11 +97,11 @@ class QuizTakerCrew():
         """Create the task that records the student's answers.
 
         Returns:
-            Task: Task definition producing `outputs/completed_quiz.md`.
+            Task: Task definition producing `<output_dir>/completed_quiz.md`.
         """
         return Task(
             config=self.tasks_config['quiz_taking_task'], # type: ignore[index]
-            output_file='outputs/completed_quiz.md'
+            output_file='{output_dir}/completed_quiz.md'  # Interpolated from the kickoff inputs
         )
 
     @crew
@@ -15,9 +15,11 @@ Examples
 --------
 >>> from quiz_generator.crews.rag_crew.rag_crew import RagCrew
 >>> crew = RagCrew(provider="azure", certification="ai900")
->>> result = crew.crew().kickoff(inputs={"topic": "Fundamentals of AI"})
+>>> result = crew.crew().kickoff(inputs={"topic": "Fundamentals of AI", "output_dir": "outputs/runs/<run_id>"})
 """
 
+import os
+
 from crewai import Agent, Crew, Process, Task
 from crewai.project import CrewBase, agent, crew, task
 from crewai.agents.agent_builder.base_agent import BaseAgent
@@ -37,6 +39,7 @@ class RagCrew():
         tasks (List[Task]): Tasks created from YAML configuration.
         provider (str | None): Provider name used to scope collection search.
         certification (str | None): Certification name used to scope search.
+        output_dir (str): Run output directory for the template and questions.
     """
 
     agents: List[BaseAgent]
@@ -45,18 +48,21 @@ class RagCrew():
     # Provider and certification for RAG tool configuration
     provider: str = None
     certification: str = None
+    output_dir: str = "outputs"
 
-    def __init__(self, provider: str = None, certification: str = None, **kwargs):
+    def __init__(self, provider: str = None, certification: str = None, output_dir: str = "outputs", **kwargs):
         """Initialize crew with collection-scoped RAG options.
 
         Args:
             provider (str | None): Provider name for the RAG collection.
             certification (str | None): Certification name for the RAG collection.
+            output_dir (str): Run output directory read and written by the tasks.
             **kwargs: Additional keyword arguments forwarded to the base class.
         """
         super().__init__(**kwargs)
         self.provider = provider
         self.certification = certification
+        self.output_dir = output_dir
 
     # Learn more about YAML configuration files here:
     # Agents: https://docs.crewai.com/concepts/agents#yaml-configuration-recommended
@@ -87,7 +93,7 @@ class RagCrew():
         return Agent(
             config=self.agents_config['reporting_analyst'], # type: ignore[index]
             tools=[RagTool(provider=self.provider, certification=self.certification),
-                   FileReadTool(file_path='outputs/quiz_template.md')],
+                   FileReadTool(file_path=os.path.join(self.output_dir, 'quiz_template.md'))],
             verbose=True
         )
 
@@ -110,11 +116,11 @@ class RagCrew():
         """Create the task that compiles the research into structured output.
 
         Returns:
-            Task: Task definition producing `outputs/questions.json`.
+            Task: Task definition producing `<output_dir>/questions.json`.
         """
         return Task(
             config=self.tasks_config['reporting_task'], # type: ignore[index]
-            output_file='outputs/questions.json'
+            output_file='{output_dir}/questions.json'  # Interpolated from the kickoff inputs
         )
 
     @crew
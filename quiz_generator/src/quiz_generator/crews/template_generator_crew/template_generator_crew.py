@@ -7,13 +7,13 @@ the quiz. Agents and tasks are configured via YAML.
 Classes
 -------
 TemplateGeneratorCrew
-    Crew that outputs `outputs/quiz_template.md`.
+    Crew that outputs `<output_dir>/quiz_template.md` (``output_dir`` kickoff input).
 
 Examples
 --------
 >>> from quiz_generator.crews.template_generator_crew.template_generator_crew import TemplateGeneratorCrew
 >>> crew = TemplateGeneratorCrew()
->>> result = crew.crew().kickoff()
+>>> result = crew.crew().kickoff(inputs={..., "output_dir": "outputs/runs/<run_id>"})
 """
 
 from crewai import Agent, Crew, Process, Task
@@ -62,11 +62,11 @@ class TemplateGeneratorCrew():
         """Create the task that outputs the quiz template Markdown file.
 
         Returns:
-            Task: Task definition producing `outputs/quiz_template.md`.
+            Task: Task definition producing `<output_dir>/quiz_template.md`.
         """
         return Task(
             config=self.tasks_config['template_generator_task'],
-            output_file='outputs/quiz_template.md'
+            output_file='{output_dir}/quiz_template.md'  # Interpolated from the kickoff inputs
         )
 
     @crew
@@ -3,46 +3,137 @@ Main module for Quiz Generator application.
 This module implements the main Flow following CrewAI best practices.
 """
 
+import asyncio
+import functools
 import os
+import time
 from datetime import datetime
-from typing import Optional
+from typing import Dict, Optional, Tuple
 from pydantic import BaseModel
-from crewai.flow import Flow, listen, start
-from .crews.rag_crew.rag_crew import RagCrew
-from .crews.template_generator_crew.template_generator_crew import TemplateGeneratorCrew
-from .crews.quiz_maker_crew.quiz_maker_crew import QuizMakerCrew
+from crewai.flow import Flow, and_, listen, start
+# Crews, MLflow and pandas are imported where they are used: importing this
+# module (e.g. for ``plot``) must stay cheap and free of side effects
 #from .crews.quiz_taker_crew.quiz_taker_crew import QuizTakerCrew
 #from .crews.quiz_evaluator_crew.quiz_evaluator_crew import QuizEvaluatorCrew
-from .utils.user_utils import get_user_selections, get_user_choices, display_selection_summary
-from .utils.database_utils import initialize_database
+from .utils.user_utils import get_user_selections, get_user_choices, display_selection_summary, validate_selections
+from .utils.instrumentation import configure_from_env, format_summary, is_enabled, span, traced
+from .utils.workspace import new_run_id, run_output_dir
 import json
-import mlflow  # MLflow tracking & evaluation
-import pandas as pd
 from dotenv import load_dotenv
-load_dotenv(override=False)
-# ---------- MLflow base config ----------
-mlflow.set_tracking_uri("http://127.0.0.1:5001")
-mlflow.autolog()  
-mlflow.set_experiment("FlowGruppo2")
 
-#mlflow.crewai.autolog()
+DATASET_PATH = os.path.join(os.path.dirname(__file__), "dataset")
+
+# Steps started together after user input; the RAG step joins on both
+PARALLEL_STEPS = ("initialize_vector_database", "generate_quiz_template")
+
+_RUNTIME_INITIALIZED = False
+
+
+def init_mlflow():
+    """
+    Configure MLflow tracking (URI, autologging, experiment) and return the module.
+
+    Uses ``MLFLOW_TRACKING_URI`` (default ``http://127.0.0.1:5001``) and
+    ``MLFLOW_EXPERIMENT_NAME`` (default ``FlowGruppo2``).
+    """
+    import mlflow  # MLflow tracking & evaluation
+
+    mlflow.set_tracking_uri(os.getenv("MLFLOW_TRACKING_URI", "http://127.0.0.1:5001"))
+    mlflow.autolog()
+    mlflow.set_experiment(os.getenv("MLFLOW_EXPERIMENT_NAME", "FlowGruppo2"))
+    #mlflow.crewai.autolog()
+    return mlflow
+
+
+def init_runtime():
+    """
+    One-time process initialization: load ``.env``, configure
+    instrumentation and, if ``MLFLOW_ENABLED`` is set, MLflow tracking.
+
+    Called by the entry points and by the first flow step; later calls are no-ops.
+    """
+    global _RUNTIME_INITIALIZED
+    if _RUNTIME_INITIALIZED:
+        return
+    _RUNTIME_INITIALIZED = True
+    load_dotenv(override=False)
+    configure_from_env()
+    if os.getenv("MLFLOW_ENABLED", "").lower() in ("1", "true", "yes"):
+        init_mlflow()
+        print("📊 MLflow tracking enabled")
+
+
+def timed_step(func):
+    """Decorator recording the (start, end) ``perf_counter`` of a flow step in ``state.step_timings``."""
+    if asyncio.iscoroutinefunction(func):
+        @functools.wraps(func)
+        async def async_wrapper(self, *args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return await func(self, *args, **kwargs)
+            finally:
+                self.state.step_timings[func.__name__] = (start, time.perf_counter())
+        return async_wrapper
+
+    @functools.wraps(func)
+    def wrapper(self, *args, **kwargs):
+        start = time.perf_counter()
+        try:
+            return func(self, *args, **kwargs)
+        finally:
+            self.state.step_timings[func.__name__] = (start, time.perf_counter())
+    return wrapper
+
+
+def format_step_timings(step_timings: Dict[str, Tuple[float, float]]) -> str:
+    """
+    Format the step timings of a run, with the wall-clock saved by ``PARALLEL_STEPS``.
+
+    Args:
+        step_timings (Dict[str, Tuple[float, float]]): (start, end) of every step
+
+    Returns:
+        str: One line per step (start offset and duration) plus the overlap gain
+    """
+    if not step_timings:
+        return "   (no steps recorded)"
+    origin = min(start for start, _ in step_timings.values())
+    lines = [f"   {name:<30} +{start - origin:7.2f}s {end - start:8.2f}s"
+             for name, (start, end) in sorted(step_timings.items(), key=lambda item: item[1][0])]
+    parallel = [step_timings[name] for name in PARALLEL_STEPS if name in step_timings]
+    if len(parallel) == len(PARALLEL_STEPS):
+        sequential = sum(end - start for start, end in parallel)
+        wall_clock = max(end for _, end in parallel) - min(start for start, _ in parallel)
+        lines.append(f"   ⚡ {' + '.join(PARALLEL_STEPS)}: {wall_clock:.2f}s wall-clock "
+                     f"instead of {sequential:.2f}s sequential (saved {sequential - wall_clock:.2f}s)")
+    return "\n".join(lines)
+
 
 class QuizGeneratorState(BaseModel):
     """State model for the Quiz Generator Flow."""
     provider: Optional[str] = None
     certification: Optional[str] = None
     topic: Optional[str] = None
-    number_of_questions: int = None
-    question_type: str = None
+    number_of_questions: Optional[int] = None
+    question_type: Optional[str] = None
     database_initialized: bool = False
     quiz_generated: bool = False
     quiz_completed: bool = False
     quiz_evaluated: bool = False
     output_filename: Optional[str] = None
     error_message: Optional[str] = None
-    contexts: str = None          # se vuoi passare contesto ai judge
-    ground_truths: str = None     # opzionale: se vuoi attivare similarity/correctness
+    contexts: Optional[str] = None          # se vuoi passare contesto ai judge
+    ground_truths: Optional[str] = None     # opzionale: se vuoi attivare similarity/correctness
     mode: str = "flow"
+    dataset_path: Optional[str] = None    # Dataset folder (default DATASET_PATH)
+    run_id: Optional[str] = None          # Run identifier, generated when not given
+    output_dir: Optional[str] = None      # Run workspace (default outputs/runs/<run_id>)
+    template_generated: bool = False
+    step_timings: Dict[str, Tuple[float, float]] = {}  # Step name -> (start, end) perf_counter
+    quiz_maker_fallback: bool = True      # Use the Quiz Maker crew for templates that cannot be filled directly
+    quiz_assembly: Optional[str] = None   # How quiz.md was built: "template" or "crew"
+    template_source: str = "crew"         # "crew" (LLM, cached per configuration) or "builtin" (no LLM)
+    template_cache_hit: Optional[bool] = None
 
 class QuizGeneratorFlow(Flow[QuizGeneratorState]):
     """
@@ -50,28 +141,49 @@ class QuizGeneratorFlow(Flow[QuizGeneratorState]):
     
     This flow orchestrates the complete quiz generation process:
     1. User input collection
-    2. Database initialization
-    3. Quiz generation using RAG crew
-    4. Results saving
+    2. Database initialization and quiz template generation, in parallel
+    3. Quiz generation using RAG crew (once both steps of 2. are done)
+    4. Final quiz creation and summary
     """
 
 
     @start()
+    @traced("flow.collect_user_input")
+    @timed_step
     def collect_user_input(self):
         """
         Step 1: Collect user input for provider, certification, and topic selection.
         Step 2: Collect user choice about the number of questions and their type to generate for the practice quiz.
         """
+        init_runtime()
         print("🚀 Starting Quiz Generator Flow...")
+        self.state.run_id = self.state.run_id or new_run_id()
+        if self.state.output_dir:
+            os.makedirs(self.state.output_dir, exist_ok=True)
+        else:
+            self.state.output_dir = run_output_dir(self.state.run_id)
+        print(f"📂 Run {self.state.run_id}: outputs in {self.state.output_dir}")
         # if self.state.mode == "flow":
         #     azure_endpoint = os.getenv("AZURE_OPENAI_ENDPOINT")
         # else:
         #     azure_endpoint = os.getenv("OPENAI_API_BASE")
 
         # Get dataset path
-        dataset_path = os.path.join(os.path.dirname(__file__), "dataset")
+        dataset_path = self.state.dataset_path or DATASET_PATH
         
         try:
+            selections = (self.state.provider, self.state.certification, self.state.topic,
+                          self.state.number_of_questions, self.state.question_type)
+            if all(selections):
+                # Selections given through kickoff(inputs=...) (batch mode, tests): no prompts
+                errors = validate_selections(dataset_path, *selections)
+                if errors:
+                    self.state.error_message = f"Invalid quiz request: {'; '.join(errors)}"
+                    print(f"❌ {self.state.error_message}")
+                    return
+                display_selection_summary(*selections)
+                print("✅ Quiz request taken from the flow inputs")
+                return
 
             # Step 1: Collect info about certification
             # Get user selections
@@ -107,22 +219,33 @@ class QuizGeneratorFlow(Flow[QuizGeneratorState]):
             print(f"❌ {self.state.error_message}")
 
     @listen(collect_user_input)
-    def initialize_vector_database(self):
+    @traced("flow.initialize_vector_database")
+    @timed_step
+    async def initialize_vector_database(self):
         """
         Step 3: Initialize the Qdrant vector database with documents from the selected certification.
+
+        Runs in a worker thread, concurrently with ``generate_quiz_template``.
         """
         if self.state.error_message:
             print("⏭️ Skipping database initialization due to previous error")
             return
         
+        if self.state.database_initialized:
+            print("⏭️ Database already initialized for this run")
+            return
+        
         print(f"\n� Initializing database for {self.state.provider}/{self.state.certification}...")
         
         try:
             # Get dataset path
-            dataset_path = os.path.join(os.path.dirname(__file__), "dataset")
+            dataset_path = self.state.dataset_path or DATASET_PATH
             
-            # Initialize database
-            success = initialize_database(
+            from .utils.database_utils import initialize_database
+
+            # Initialize database (blocking: off the event loop so the template step can run)
+            success = await asyncio.to_thread(
+                initialize_database,
                 self.state.provider, 
                 self.state.certification, 
                 dataset_path
@@ -139,10 +262,17 @@ class QuizGeneratorFlow(Flow[QuizGeneratorState]):
             self.state.error_message = f"Error during database initialization: {str(e)}"
             print(f"❌ {self.state.error_message}")
 
-    @listen(initialize_vector_database)
-    def generate_quiz_template(self):
+    @listen(collect_user_input)
+    @traced("flow.generate_quiz_template")
+    @timed_step
+    async def generate_quiz_template(self):
         """
         Step 2.5: Generate quiz template using the Template Generator crew.
+
+        The template only depends on the user choices, so it runs concurrently
+        with ``initialize_vector_database``. Crew templates are cached per
+        configuration, so later runs with the same choices skip the LLM call;
+        with ``template_source="builtin"`` the template is rendered without any LLM.
         """
         if self.state.error_message:
             print("⏭️ Skipping quiz template generation due to previous error")
@@ -151,29 +281,66 @@ class QuizGeneratorFlow(Flow[QuizGeneratorState]):
         print(f"\n� Generating quiz template for {self.state.provider}/{self.state.certification}... with choices done")
         
         try:
+            from .utils.quiz_templates import build_template, get_template_cache, template_key
+
+            provider = self.state.provider.capitalize()
+            template_path = os.path.join(self.state.output_dir, "quiz_template.md")
+            if self.state.template_source == "builtin":
+                template_result = build_template(provider, self.state.certification,
+                                                 self.state.number_of_questions, self.state.question_type)
+                with open(template_path, "w", encoding="utf-8") as f:
+                    f.write(template_result)
+                self.state.template_generated = True
+                print("✅ Quiz template rendered (built-in generator)")
+                return
+
+            cache = get_template_cache()
+            key = template_key(provider, self.state.certification,
+                               self.state.number_of_questions, self.state.question_type)
+            template_result = cache.get(key, self.state.number_of_questions, self.state.question_type)
+            self.state.template_cache_hit = template_result is not None
+            if template_result is not None:
+                with open(template_path, "w", encoding="utf-8") as f:
+                    f.write(template_result)
+                self.state.template_generated = True
+                print("♻️ Quiz template loaded from cache")
+                return
+
+            from .crews.template_generator_crew.template_generator_crew import TemplateGeneratorCrew
+
             # Initialize and run Template Generator crew with provider/certification configuration
             template_crew = TemplateGeneratorCrew()
-            template_result = template_crew.crew().kickoff(inputs={
-                "provider": self.state.provider.capitalize(),
-                "certification": self.state.certification,
-                "number_of_questions": self.state.number_of_questions,
-                "question_type": self.state.question_type
-            })
+            with span("crew.template_generator"):
+                template_result = await template_crew.crew().kickoff_async(inputs={
+                    "provider": provider,
+                    "certification": self.state.certification,
+                    "number_of_questions": self.state.number_of_questions,
+                    "question_type": self.state.question_type,
+                    "output_dir": self.state.output_dir
+                })
+            self.state.template_generated = True
             
             print("✅ Quiz template generated successfully!")
             print(f"📝 Generated Template:\n{template_result}")
+            with open(template_path, "r", encoding="utf-8") as f:
+                if cache.put(key, f.read(), self.state.number_of_questions, self.state.question_type):
+                    print("💾 Quiz template cached for this configuration")
             
         except Exception as e:
             self.state.error_message = f"Error during quiz template generation: {str(e)}"
             print(f"❌ {self.state.error_message}")
 
-    @listen(generate_quiz_template)
+    @listen(and_(initialize_vector_database, generate_quiz_template))
+    @traced("flow.generate_quiz_with_rag_crew")
+    @timed_step
     def generate_quiz_with_rag_crew(self):
         """
         Step 4: Generate quiz questions using the RAG crew with the initialized database.
+
+        Starts once both the database and the template are ready.
         """
-        if self.state.error_message or not self.state.database_initialized:
-            print("⏭️ Skipping quiz generation due to previous error or failed database initialization")
+        if self.state.error_message or not (self.state.database_initialized and self.state.template_generated):
+            print("⏭️ Skipping quiz generation due to previous error, failed database initialization or missing template")
             return
         
         print(f"\n📝 Starting RAG crew for topic: {self.state.topic}")
@@ -181,14 +348,19 @@ class QuizGeneratorFlow(Flow[QuizGeneratorState]):
         try:
             current_year = datetime.now().year
             
+            from .crews.rag_crew.rag_crew import RagCrew
+
             # Initialize and run RAG crew with provider/certification configuration
-            rag_crew = RagCrew(provider=self.state.provider, certification=self.state.certification)
-            rag_crew.crew().kickoff(inputs={
-                "topic": self.state.topic,
-                "current_year": current_year,
-                "number_of_questions": self.state.number_of_questions,
-                "question_type": self.state.question_type
-            })
+            rag_crew = RagCrew(provider=self.state.provider, certification=self.state.certification,
+                               output_dir=self.state.output_dir)
+            with span("crew.rag"):
+                rag_crew.crew().kickoff(inputs={
+                    "topic": self.state.topic,
+                    "current_year": current_year,
+                    "number_of_questions": self.state.number_of_questions,
+                    "question_type": self.state.question_type,
+                    "output_dir": self.state.output_dir
+                })
             
             print("✅ RAG crew completed successfully!")
             print("📊 Quiz questions generated in JSON format!")
@@ -198,26 +370,47 @@ class QuizGeneratorFlow(Flow[QuizGeneratorState]):
             print(f"❌ {self.state.error_message}")
 
     @listen(generate_quiz_with_rag_crew)
+    @traced("flow.create_final_quiz")
+    @timed_step
     def create_final_quiz(self):
         """
-        Step 5: Create final quiz using Quiz Maker crew to combine template and questions.
+        Step 5: Create the final quiz by filling the template placeholders with the questions.
+
+        The template is filled deterministically (no LLM call); the Quiz Maker
+        crew is only used as a fallback for templates that cannot be filled
+        that way (free-form templates, mismatching questions), if
+        ``quiz_maker_fallback`` is enabled.
         """
         if self.state.error_message:
             print("⏭️ Skipping final quiz creation due to previous error")
             return
         
-        print(f"\n📋 Creating final quiz with Quiz Maker crew...")
+        print(f"\n📋 Assembling final quiz from template and questions...")
         
         try:
-            # Initialize and run Quiz Maker crew
-            quiz_maker_crew = QuizMakerCrew()
-            quiz_result = quiz_maker_crew.crew().kickoff(inputs={
-                "number_of_questions": self.state.number_of_questions
-            })
+            from .utils.quiz_assembly import TemplateMismatchError, assemble_quiz
+
+            try:
+                with span("quiz_assembly"):
+                    assemble_quiz(self.state.output_dir)
+                self.state.quiz_assembly = "template"
+            except TemplateMismatchError as e:
+                if not self.state.quiz_maker_fallback:
+                    raise
+                print(f"⚠️ Template cannot be filled directly ({e}), falling back to the Quiz Maker crew")
+                from .crews.quiz_maker_crew.quiz_maker_crew import QuizMakerCrew
+
+                # Initialize and run Quiz Maker crew
+                quiz_maker_crew = QuizMakerCrew(output_dir=self.state.output_dir)
+                with span("crew.quiz_maker"):
+                    quiz_maker_crew.crew().kickoff(inputs={
+                        "number_of_questions": self.state.number_of_questions,
+                        "output_dir": self.state.output_dir
+                    })
+                self.state.quiz_assembly = "crew"
             self.state.quiz_generated = True
             
-            print("✅ Quiz Maker crew completed successfully!")
-            print(f"📊 Final quiz generated successfully!")
+            print(f"📊 Final quiz generated successfully! (assembled by: {self.state.quiz_assembly})")
 
         except Exception as e:
             self.state.error_message = f"Error during final quiz creation: {str(e)}"
@@ -236,16 +429,18 @@ class QuizGeneratorFlow(Flow[QuizGeneratorState]):
         
         try:
             # Initialize and run Quiz Taker crew
-            quiz_taker_crew = QuizTakerCrew(provider=self.state.provider, certification=self.state.certification)
+            quiz_taker_crew = QuizTakerCrew(provider=self.state.provider, certification=self.state.certification,
+                                            output_dir=self.state.output_dir)
             quiz_taker_result = quiz_taker_crew.crew().kickoff(inputs={
                 "topic": self.state.topic,
-                "certification": self.state.certification
+                "certification": self.state.certification,
+                "output_dir": self.state.output_dir
             })
             self.state.quiz_completed = True
             
             print("✅ Quiz Taker crew completed successfully!")
             print(f"📝 Student has completed the quiz!")
-            print(f"💾 Completed quiz saved to: outputs/completed_quiz.md")
+            print(f"💾 Completed quiz saved to: {self.state.output_dir}/completed_quiz.md")
 
         except Exception as e:
             self.state.error_message = f"Error during quiz taking: {str(e)}"
@@ -264,15 +459,16 @@ class QuizGeneratorFlow(Flow[QuizGeneratorState]):
         
         try:
             # Initialize and run Quiz Evaluator crew
-            quiz_evaluator_crew = QuizEvaluatorCrew()
+            quiz_evaluator_crew = QuizEvaluatorCrew(output_dir=self.state.output_dir)
             quiz_evaluation_result = quiz_evaluator_crew.crew().kickoff(inputs={
-                "topic": self.state.topic
+                "topic": self.state.topic,
+                "output_dir": self.state.output_dir
             })
             self.state.quiz_evaluated = True
             
             print("✅ Quiz Evaluator crew completed successfully!")
             print(f"📈 Quiz evaluation completed!")
-            print(f"💾 Evaluation report saved to: outputs/quiz_evaluation.md")
+            print(f"💾 Evaluation report saved to: {self.state.output_dir}/quiz_evaluation.md")
 
         except Exception as e:
             self.state.error_message = f"Error during quiz evaluation: {str(e)}"
@@ -287,6 +483,19 @@ class QuizGeneratorFlow(Flow[QuizGeneratorState]):
         print("📋 QUIZ GENERATOR FLOW SUMMARY")
         print("=" * 60)
         
+        print("⏱️ Step timings (start offset, duration):")
+        print(format_step_timings(self.state.step_timings))
+        if self.state.template_cache_hit is not None:
+            from .utils.quiz_templates import get_template_cache
+
+            stats = get_template_cache().stats()
+            print(f"🗂️ Quiz template cache: {'hit' if self.state.template_cache_hit else 'miss'} "
+                  f"(hits: {stats['hits']}, misses: {stats['misses']}, entries: {stats['entries']})")
+        
+        if is_enabled():
+            print("⏱️ Stage timings and counters:")
+            print(format_summary())
+        
         if self.state.error_message:
             print(f"❌ Flow completed with errors: {self.state.error_message}")
             return
@@ -300,16 +509,18 @@ class QuizGeneratorFlow(Flow[QuizGeneratorState]):
             print(f"📝 Question Type: {self.state.question_type}")
             print("✅ Database initialized: Yes")
             print("✅ Quiz generated: Yes")
+            print(f"🧩 Quiz assembled by: {self.state.quiz_assembly}")
+            print(f"📂 Run outputs: {self.state.output_dir}")
             #print(f"✅ Quiz completed by student: {self.state.quiz_completed}")
             #print(f"✅ Quiz evaluated: {self.state.quiz_evaluated}")
             if self.state.quiz_evaluated:
                 print("📄 Files generated:")
-                print("   - outputs/quiz_template.md (template)")
-                print("   - outputs/questions.json (questions data)")
-                print("   - outputs/quiz.md (blank quiz)")
-                print("   - outputs/quiz.pdf (blank quiz PDF)")
-                #print("   - outputs/completed_quiz.md (completed quiz)")
-                #print("   - outputs/quiz_evaluation.md (evaluation report)")
+                print(f"   - {self.state.output_dir}/quiz_template.md (template)")
+                print(f"   - {self.state.output_dir}/questions.json (questions data)")
+                print(f"   - {self.state.output_dir}/quiz.md (blank quiz)")
+                print(f"   - {self.state.output_dir}/quiz.pdf (blank quiz PDF)")
+                #print(f"   - {self.state.output_dir}/completed_quiz.md (completed quiz)")
+                #print(f"   - {self.state.output_dir}/quiz_evaluation.md (evaluation report)")
         else:
             print("⚠️ Flow completed with issues")
             print(f"✅ Database initialized: {self.state.database_initialized}")
@@ -326,6 +537,7 @@ def evaluation_flow():
     # else:
     #     azure_endpoint = os.getenv("OPENAI_API_BASE")
 
+    mlflow = init_mlflow()
         
     with open("c:/Users/SV273YL/OneDrive - EY/Documents/GitHub/FGBS_academy/quiz_generator/outputs/questions.json", "r", encoding="utf-8") as f:
         data = json.load(f)
@@ -368,6 +580,9 @@ def _run_llm_judge_mlflow(
     Le metriche e la tabella vengono loggate automaticamente nel run attivo.
     """
 
+    import mlflow
+    import pandas as pd
+
     # Tabella di valutazione a 1 riga (scalabile a molte righe)
     data = {
         "inputs": [user_query],
@@ -420,6 +635,7 @@ def main():
     as a Flow with proper state management and step-by-step execution.
     """
     try:
+        init_runtime()
         # Initialize and run the Quiz Generator Flow
         quiz_flow = QuizGeneratorFlow()
         quiz_flow.kickoff()
@@ -437,6 +653,7 @@ def plot():
 
 def kickoff():
     """Alternative entry point for the flow (CrewAI convention)."""
+    init_runtime()
     plot()
     #main()
     evaluation_flow()
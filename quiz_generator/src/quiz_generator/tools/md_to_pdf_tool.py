@@ -1,3 +1,5 @@
+import os
+
 import markdown2
 import pdfkit
 from crewai.tools import BaseTool
@@ -7,13 +9,16 @@ class MarkdownToPdfExporter(BaseTool):
 
     name: str = "markdown_to_pdf_exporter"
 
-    description: str = "Convert Markdown text into a PDF file and save it in ./outputs"
+    description: str = "Convert Markdown text into a PDF file and save it in the run output folder"
+
+    output_dir: str = "./outputs"
 
     def _run(self, markdown_content: str) -> str:
         filename = "quiz.pdf"
-        out_path: str = f"./outputs/{filename}"
+        os.makedirs(self.output_dir, exist_ok=True)
+        out_path: str = os.path.join(self.output_dir, filename)
         pdf = MarkdownPdf()
         pdf.meta["title"] = filename
         pdf.add_section(Section(markdown_content, toc=False))
         pdf.save(out_path)
-        return f"PDF file saved to {out_path}"
\ No newline at end of file
+        return f"PDF file saved to {out_path}"
@@ -1,19 +1,27 @@
 """CrewAI tool that wraps simple RAG retrieval utilities.
 
-Accepts a question and a ``k`` value to retrieve top-k contexts from a local
-vector store. Useful as an agent tool step before generation.
+Accepts a question (or a list of related questions) and a ``k`` value to
+retrieve top-k contexts from a local vector store. Useful as an agent tool
+step before generation.
 """
 
+import asyncio
 from typing import Type, List, Optional
 from crewai.tools import BaseTool
 from pydantic import BaseModel, Field
-from ..utils.rag_qdrant_hybrid import search_rag, search_rag_with_collection
+from ..utils.rag_qdrant_hybrid import search_rag, search_rag_batch, search_rag_with_collection
+from ..utils.rag_qdrant_async import asearch_rag_with_collection
 
 
 class RagToolInput(BaseModel):
     """Input schema for ``RagTool``."""
-    question: str = Field(..., description="Question to answer using RAG search.")
+    question: str = Field("", description="Question to answer using RAG search.")
     k: int = Field(3, description="Number of documents to retrieve for context.")
+    questions: Optional[List[str]] = Field(
+        None,
+        description="Several related questions to search at once (faster than one call per question). "
+                    "Documents are not repeated across questions.",
+    )
 
 
 class RagTool(BaseTool):
@@ -24,7 +32,8 @@ class RagTool(BaseTool):
         "A tool that performs a Retrieval-Augmented Generation (RAG) search "
         "given a question and a number of documents to retrieve. "
         "Uses a local vector store and LLM to retrieve and answer based on "
-        "context. Returns a list of document strings with source and content information."
+        "context. Returns a list of document strings with source and content information. "
+        "Pass a list of related questions in 'questions' to search them all in one call."
     )
     args_schema: Type[BaseModel] = RagToolInput
     
@@ -44,8 +53,17 @@ class RagTool(BaseTool):
         self.provider = provider
         self.certification = certification
 
-    def _run(self, question: str, k: int) -> List[str]:
+    def _run(self, question: str = "", k: int = 3, questions: Optional[List[str]] = None) -> List[str]:
         """Run retrieval with the provided inputs."""
+        if questions:
+            batches = search_rag_batch(
+                list(questions),
+                k=k,
+                provider=self.provider,
+                certification=self.certification
+            )
+            return [f"Question: {q}\n{doc}" for q, docs in zip(questions, batches) for doc in docs]
+        
         if not question:
             raise ValueError("Please provide a question for RAG search.")
         
@@ -62,3 +80,29 @@ class RagTool(BaseTool):
             results = search_rag(question, k=k)
 
         return results
+
+    async def _arun(self, question: str = "", k: int = 3, questions: Optional[List[str]] = None) -> List[str]:
+        """Run retrieval without blocking the event loop, with the same results as ``_run``."""
+        if questions:
+            # One batched search (cross-question dedup with top-up) in a worker thread
+            batches = await asyncio.to_thread(
+                search_rag_batch,
+                list(questions),
+                k=k,
+                provider=self.provider,
+                certification=self.certification
+            )
+            return [f"Question: {q}\n{doc}" for q, docs in zip(questions, batches) for doc in docs]
+        
+        if not question:
+            raise ValueError("Please provide a question for RAG search.")
+        
+        if self.provider and self.certification:
+            return await asearch_rag_with_collection(
+                question,
+                k=k,
+                provider=self.provider,
+                certification=self.certification
+            )
+        # Fallback to default search, as in ``_run``
+        return await asyncio.to_thread(search_rag, question, k=k)
@@ -0,0 +1,77 @@
+"""
+Process-wide registry of long-lived clients.
+
+Qdrant clients and embedding models keep pooled HTTP sessions (and, for
+Qdrant, optional gRPC channels). Building them once per process and reusing
+them avoids paying connection setup on every retrieval.
+"""
+
+from __future__ import annotations
+import threading
+import time
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+
+class ClientRegistry:
+    """Thread-safe cache of objects built once per key."""
+
+    def __init__(self):
+        self._items: Dict[Hashable, Any] = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable, factory: Callable[[], Any]) -> Any:
+        """Return the object registered under ``key``, building it on first use."""
+        item = self._items.get(key)
+        if item is not None:
+            return item
+        with self._lock:
+            item = self._items.get(key)
+            if item is None:
+                item = factory()
+                self._items[key] = item
+            return item
+
+    def clear(self):
+        """Drop every registered object (they are rebuilt on next use)."""
+        with self._lock:
+            self._items.clear()
+
+
+class TTLCache:
+    """
+    Small thread-safe key/value cache whose entries expire after ``ttl`` seconds.
+
+    Args:
+        ttl (float): Entry lifetime in seconds; ``<= 0`` disables caching
+    """
+
+    def __init__(self, ttl: float):
+        self.ttl = ttl
+        self._items: Dict[Hashable, Tuple[float, Any]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """Return the cached value, or ``None`` if missing or expired."""
+        with self._lock:
+            entry = self._items.get(key)
+            if entry is None:
+                return None
+            if entry[0] < time.monotonic():
+                del self._items[key]
+                return None
+            return entry[1]
+
+    def set(self, key: Hashable, value: Any):
+        """Cache ``value`` under ``key``."""
+        if self.ttl <= 0:
+            return
+        with self._lock:
+            self._items[key] = (time.monotonic() + self.ttl, value)
+
+    def invalidate(self, key: Optional[Hashable] = None):
+        """Forget ``key`` (or every key)."""
+        with self._lock:
+            if key is None:
+                self._items.clear()
+            else:
+                self._items.pop(key, None)
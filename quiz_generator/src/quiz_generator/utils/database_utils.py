@@ -11,11 +11,17 @@ from .rag_qdrant_hybrid import (
     recreate_collection_for_rag, 
     split_documents, 
     upsert_chunks,
-    load_pdf,
+    load_pdfs,
     get_settings_for_certification,
     get_collection_name,
-    retry_with_backoff
+    retry_with_backoff,
+    delete_source_points,
+    chunk_point_id,
+    get_result_cache,
+    tuning_profile_drift,
+    apply_tuning_profile,
 )
+from .ingest_state import FileManifest, IngestCheckpoint
 
 
 def initialize_database(provider, certification, dataset_base_path):
@@ -23,6 +29,12 @@ def initialize_database(provider, certification, dataset_base_path):
     Initialize Qdrant database with documents from the specified provider and certification.
     Each provider/certification gets its own collection for better organization.
     
+    Ingestion is incremental: a manifest of (file, size, mtime, content hash)
+    -> point IDs is kept per collection, so only new or changed PDFs are
+    embedded, points of removed PDFs are deleted and unchanged PDFs are left
+    untouched. An existing collection whose index configuration differs from
+    the selected tuning profile is moved to that profile.
+    
     Args:
         provider (str): The provider name
         certification (str): The certification name
@@ -45,50 +57,88 @@ def initialize_database(provider, certification, dataset_base_path):
         embeddings = get_embeddings(settings)
         client = get_qdrant_client(settings)
         
-        # Check if collection already exists and has data
-        if client.collection_exists(settings.collection):
-            collection_count = client.count(collection_name=settings.collection).count
-            if collection_count > 0:
-                print(f"✅ Collection '{collection_name}' already exists with {collection_count} documents")
-                print("⏭️ Skipping database initialization (reusing existing collection)")
-                return True
-        
-        # Load all PDF documents from the certification folder
+        # Compare the certification folder against the ingestion manifest
         dataset_path = os.path.join(dataset_base_path, provider, certification)
-        pdf_files = [f for f in os.listdir(dataset_path) if f.endswith('.pdf')]
+        pdf_files = {f: os.path.join(dataset_path, f) for f in sorted(os.listdir(dataset_path)) if f.endswith('.pdf')}
         
         if not pdf_files:
             print(f"❌ No PDF files found in {dataset_path}")
             return False
         
-        print(f"📚 Found {len(pdf_files)} PDF files to process")
-        
-        all_documents = []
-        for pdf_file in pdf_files:
-            pdf_path = os.path.join(dataset_path, pdf_file)
-            print(f"📄 Loading {pdf_file}...")
-            documents = load_pdf(pdf_path)
-            all_documents.extend(documents)
-        
-        print(f"📄 Loaded {len(all_documents)} documents")
+        manifest = FileManifest(settings.state_dir, settings.collection)
+        collection_exists = client.collection_exists(settings.collection)
+        if not collection_exists:
+            # Stale manifest for a dropped collection: ingest everything again
+            manifest.entries.clear()
+        else:
+            # Settings may select another tuning profile than the collection was built with
+            drift = tuning_profile_drift(client, settings)
+            if drift:
+                print(f"🎛️ Applying tuning profile '{settings.tuning_profile}' to '{collection_name}' "
+                      f"({', '.join(drift)})")
+                apply_tuning_profile(client, settings)
+        to_ingest, removed, unchanged = manifest.diff(pdf_files)
+        pending_checkpoint = IngestCheckpoint(settings.state_dir, settings.collection).exists()
+        
+        print(f"📚 Found {len(pdf_files)} PDF files: {len(to_ingest)} new/changed, "
+              f"{len(removed)} removed, {len(unchanged)} unchanged")
+        
+        if not to_ingest and not removed and not pending_checkpoint:
+            manifest.save()
+            print(f"✅ Collection '{collection_name}' is up to date")
+            print("⏭️ Skipping database initialization (reusing existing collection)")
+            return True
+        
+        # The collection is about to change: cached retrieval results are stale
+        result_cache = get_result_cache(settings)
+        result_cache.invalidate(settings.collection)
+        
+        if not collection_exists:
+            # Get vector size for collection creation
+            def get_vector_size():
+                return len(embeddings.embed_query("hello world"))
+            
+            vector_size = retry_with_backoff(get_vector_size, max_retries=5, base_delay=2.0)
+            recreate_collection_for_rag(client, settings, vector_size)
+        
+        # Drop points of files that disappeared from the dataset
+        for pdf_file in removed:
+            print(f"🗑️ Removing points of {pdf_file}...")
+            delete_source_points(client, settings, pdf_file)
+            manifest.remove(pdf_file)
+        manifest.save()
+        
+        # Load and split new/changed files
+        chunks = []
+        file_chunks = {}
+        print(f"📄 Loading {len(to_ingest)} PDF files...")
+        parsed = load_pdfs([pdf_files[f] for f in to_ingest], settings)
+        for pdf_file in to_ingest:
+            doc_chunks = split_documents(parsed[pdf_files[pdf_file]], settings)
+            for index, chunk in enumerate(doc_chunks):
+                chunk.metadata["chunk_index"] = index
+            file_chunks[pdf_file] = doc_chunks
+            chunks.extend(doc_chunks)
         
-        # Split documents into chunks
-        chunks = split_documents(all_documents, settings)
         print(f"🔪 Split into {len(chunks)} chunks")
         
-        # Get vector size for collection creation
-        def get_vector_size():
-            return len(embeddings.embed_query("hello world"))
-        
-        vector_size = retry_with_backoff(get_vector_size, max_retries=5, base_delay=2.0)
-        
-        # Create or recreate collection
-        recreate_collection_for_rag(client, settings, vector_size)
-        
         # Upsert chunks to database
         print("📥 Upserting chunks to database...")
         upsert_chunks(client, settings, chunks, embeddings)
         
+        # Drop points left over from previous versions of the re-ingested files
+        for pdf_file, doc_chunks in file_chunks.items():
+            ids = [chunk_point_id(c) for c in doc_chunks]
+            delete_source_points(client, settings, pdf_file, keep_ids=ids)
+            manifest.record(pdf_file, pdf_files[pdf_file], ids)
+        manifest.save()
+        # Also drop results cached by searches that ran during the ingestion
+        result_cache.invalidate(settings.collection)
+        
+        if hasattr(embeddings, "stats"):
+            stats = embeddings.stats()
+            print(f"💾 Embedding cache: {stats['hits']} hits, {stats['misses']} misses, {stats['entries']} entries")
+        
         print("✅ Database initialization completed successfully!")
         return True
         
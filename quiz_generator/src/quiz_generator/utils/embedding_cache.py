@@ -0,0 +1,211 @@
+"""
+Persistent embedding cache for the RAG pipeline.
+
+Embeddings are stored in a local SQLite database keyed by
+(embedding model, SHA-256 of the text). The store uses WAL journaling so
+several processes can read and write it at the same time, and it is bounded
+by an LRU policy on the last access time.
+"""
+
+from __future__ import annotations
+import asyncio
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+from array import array
+from typing import Dict, List, Optional
+
+from langchain_core.embeddings import Embeddings
+
+from . import instrumentation
+
+
+def text_key(model: str, text: str) -> str:
+    """Return the cache key for ``text`` embedded with ``model``."""
+    return hashlib.sha256(f"{model}\0{text}".encode("utf-8")).hexdigest()
+
+
+class EmbeddingCache:
+    """
+    Size-bounded, multi-process safe embedding store backed by SQLite.
+
+    Args:
+        path (str): SQLite database file
+        max_entries (int): Maximum number of vectors kept; the least recently
+            used entries are evicted beyond this size
+        timeout (float): Seconds to wait on a locked database
+    """
+
+    def __init__(self, path: str, max_entries: int = 200_000, timeout: float = 30.0):
+        self.path = path
+        self.max_entries = max_entries
+        self.timeout = timeout
+        self._local = threading.local()
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        with self._connect() as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS embeddings ("
+                " key TEXT PRIMARY KEY,"
+                " model TEXT NOT NULL,"
+                " vector BLOB NOT NULL,"
+                " last_access REAL NOT NULL)"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_embeddings_last_access ON embeddings(last_access)")
+
+    def _connect(self) -> sqlite3.Connection:
+        """Return a connection owned by the current thread and process."""
+        conn = getattr(self._local, "conn", None)
+        if conn is None or getattr(self._local, "pid", None) != os.getpid():
+            conn = sqlite3.connect(self.path, timeout=self.timeout, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+            self._local.pid = os.getpid()
+        return conn
+
+    def get_many(self, model: str, texts: List[str]) -> List[Optional[List[float]]]:
+        """Return cached vectors for ``texts`` (``None`` for misses)."""
+        if not texts:
+            return []
+        keys = [text_key(model, t) for t in texts]
+        found: Dict[str, List[float]] = {}
+        conn = self._connect()
+        unique = list(dict.fromkeys(keys))
+        for i in range(0, len(unique), 500):
+            part = unique[i:i + 500]
+            marks = ",".join("?" * len(part))
+            rows = conn.execute(f"SELECT key, vector FROM embeddings WHERE key IN ({marks})", part).fetchall()
+            for key, blob in rows:
+                vec = array("f")
+                vec.frombytes(blob)
+                found[key] = vec.tolist()
+            if rows:
+                conn.execute(
+                    f"UPDATE embeddings SET last_access = ? WHERE key IN ({','.join('?' * len(rows))})",
+                    [time.time()] + [key for key, _ in rows],
+                )
+        return [found.get(k) for k in keys]
+
+    def put_many(self, model: str, texts: List[str], vectors: List[List[float]]):
+        """Store vectors for ``texts`` and evict least recently used entries."""
+        if not texts:
+            return
+        now = time.time()
+        rows = [(text_key(model, t), model, array("f", v).tobytes(), now) for t, v in zip(texts, vectors)]
+        conn = self._connect()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            conn.executemany("INSERT OR REPLACE INTO embeddings (key, model, vector, last_access) VALUES (?, ?, ?, ?)", rows)
+            count = conn.execute("SELECT COUNT(*) FROM embeddings").fetchone()[0]
+            if count > self.max_entries:
+                conn.execute(
+                    "DELETE FROM embeddings WHERE key IN (SELECT key FROM embeddings ORDER BY last_access LIMIT ?)",
+                    (count - self.max_entries,),
+                )
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+
+    def __len__(self) -> int:
+        return self._connect().execute("SELECT COUNT(*) FROM embeddings").fetchone()[0]
+
+    def clear(self):
+        """Remove every cached vector."""
+        self._connect().execute("DELETE FROM embeddings")
+
+
+_CACHES: Dict[str, EmbeddingCache] = {}
+_CACHES_LOCK = threading.Lock()
+
+
+def get_embedding_cache(path: str, max_entries: int = 200_000) -> EmbeddingCache:
+    """Return the process-wide ``EmbeddingCache`` for ``path``."""
+    key = os.path.abspath(path)
+    with _CACHES_LOCK:
+        cache = _CACHES.get(key)
+        if cache is None:
+            cache = EmbeddingCache(path, max_entries=max_entries)
+            _CACHES[key] = cache
+        return cache
+
+
+class CachedEmbeddings(Embeddings):
+    """
+    Embeddings wrapper that serves repeated texts from an ``EmbeddingCache``.
+
+    Only texts missing from the cache are sent to the wrapped model, in a
+    single ``embed_documents`` call. Hit and miss counters are kept per
+    wrapper instance.
+
+    Args:
+        embeddings (Embeddings): Underlying embedding model
+        cache (EmbeddingCache): Persistent vector store
+        model (str): Model name used in the cache key
+    """
+
+    def __init__(self, embeddings: Embeddings, cache: EmbeddingCache, model: str):
+        self.embeddings = embeddings
+        self.cache = cache
+        self.model = model
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    def _count(self, hits: int, misses: int):
+        with self._lock:
+            self.hits += hits
+            self.misses += misses
+        if hits:
+            instrumentation.count("rag_embedding_cache_hits_total", hits)
+        if misses:
+            instrumentation.count("rag_embedding_cache_misses_total", misses)
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        vectors = self.cache.get_many(self.model, texts)
+        missing = list(dict.fromkeys(t for t, v in zip(texts, vectors) if v is None))
+        n_missing = sum(v is None for v in vectors)
+        self._count(len(texts) - n_missing, n_missing)
+        if missing:
+            fresh = dict(zip(missing, self.embeddings.embed_documents(missing)))
+            self.cache.put_many(self.model, missing, [fresh[t] for t in missing])
+            vectors = [v if v is not None else fresh[t] for t, v in zip(texts, vectors)]
+        return vectors
+
+    def embed_query(self, text: str) -> List[float]:
+        cached = self.cache.get_many(self.model, [text])[0]
+        if cached is not None:
+            self._count(1, 0)
+            return cached
+        self._count(0, 1)
+        vector = self.embeddings.embed_query(text)
+        self.cache.put_many(self.model, [text], [vector])
+        return vector
+
+    async def aembed_documents(self, texts: List[str]) -> List[List[float]]:
+        vectors = await asyncio.to_thread(self.cache.get_many, self.model, texts)
+        missing = list(dict.fromkeys(t for t, v in zip(texts, vectors) if v is None))
+        n_missing = sum(v is None for v in vectors)
+        self._count(len(texts) - n_missing, n_missing)
+        if missing:
+            fresh = dict(zip(missing, await self.embeddings.aembed_documents(missing)))
+            await asyncio.to_thread(self.cache.put_many, self.model, missing, [fresh[t] for t in missing])
+            vectors = [v if v is not None else fresh[t] for t, v in zip(texts, vectors)]
+        return vectors
+
+    async def aembed_query(self, text: str) -> List[float]:
+        cached = (await asyncio.to_thread(self.cache.get_many, self.model, [text]))[0]
+        if cached is not None:
+            self._count(1, 0)
+            return cached
+        self._count(0, 1)
+        vector = await self.embeddings.aembed_query(text)
+        await asyncio.to_thread(self.cache.put_many, self.model, [text], [vector])
+        return vector
+
+    def stats(self) -> Dict[str, int]:
+        """Return hit/miss counters and the current cache size."""
+        return {"hits": self.hits, "misses": self.misses, "entries": len(self.cache)}
@@ -0,0 +1,478 @@
+"""
+Concurrent, rate-limit-aware embedding scheduler.
+
+Texts are grouped into batches sized by an estimated token count and sent to
+the embedding model from a thread pool. A shared token bucket paces requests
+and adapts to the service: every 429 halves the allowed rate and pauses all
+workers for the ``Retry-After`` / ``x-ratelimit-reset-*`` interval, and every
+successful batch slowly raises the rate back towards the configured limit.
+The ``x-ratelimit-remaining-*`` headers of every response (successful ones
+included, through ``rate_limit_event_hooks``) also cap the buckets, so the
+schedulers slow down before the server starts rejecting requests.
+Async counterparts (``async_retry_with_backoff``, ``aiter_batches``) wait
+with ``asyncio.sleep`` so they never block the event loop.
+"""
+
+from __future__ import annotations
+import asyncio
+import random
+import re
+import threading
+import time
+import weakref
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from email.utils import parsedate_to_datetime
+from typing import AsyncIterator, Awaitable, Callable, Deque, Dict, Iterator, List, Mapping, Optional, Tuple, TypeVar
+
+from . import instrumentation
+
+T = TypeVar("T")
+
+_DURATION_PART = re.compile(r"(\d+(?:\.\d+)?)(ms|h|m|s)")
+
+
+# ========== Rate-limit detection ==========
+
+def _response_headers(exc: BaseException) -> Mapping[str, str]:
+    """Return HTTP response headers attached to an SDK exception, if any."""
+    response = getattr(exc, "response", None)
+    headers = getattr(response, "headers", None)
+    return headers or {}
+
+
+def is_rate_limit_error(exc: BaseException) -> bool:
+    """Return True if ``exc`` is a 429 / rate limit error."""
+    status = getattr(exc, "status_code", None) or getattr(getattr(exc, "response", None), "status_code", None)
+    if status == 429:
+        return True
+    text = str(exc).lower()
+    return "429" in text or "rate limit" in text
+
+
+def parse_duration(value: str) -> Optional[float]:
+    """
+    Parse a rate-limit duration header into seconds.
+
+    Accepts plain seconds (``"2"``, ``"0.5"``), Go-style durations used by the
+    ``x-ratelimit-reset-*`` headers (``"1m30s"``, ``"250ms"``) and HTTP dates.
+    """
+    value = (value or "").strip()
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    parts = _DURATION_PART.findall(value)
+    if parts and "".join(n + u for n, u in parts) == value:
+        scale = {"h": 3600.0, "m": 60.0, "s": 1.0, "ms": 0.001}
+        return sum(float(n) * scale[u] for n, u in parts)
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+def retry_after_seconds(exc: BaseException) -> Optional[float]:
+    """Return the server-requested wait carried by a rate-limit error."""
+    headers = _response_headers(exc)
+    lowered = {k.lower(): v for k, v in headers.items()}
+    if "retry-after-ms" in lowered:
+        ms = parse_duration(lowered["retry-after-ms"])
+        if ms is not None:
+            return ms / 1000.0
+    for name in ("retry-after", "x-ratelimit-reset-tokens", "x-ratelimit-reset-requests"):
+        if name in lowered:
+            seconds = parse_duration(lowered[name])
+            if seconds is not None:
+                return seconds
+    match = re.search(r"retry after (\d+(?:\.\d+)?) seconds?", str(exc), re.IGNORECASE)
+    return float(match.group(1)) if match else None
+
+
+def _backoff_delay(exc: BaseException, attempt: int, max_retries: int, base_delay: float, max_delay: float,
+                   on_rate_limit: Optional[Callable[[BaseException, Optional[float]], None]]) -> float:
+    """Return how long to wait before retrying after ``exc``, or re-raise it."""
+    if not is_rate_limit_error(exc):
+        raise exc
+    instrumentation.count("rag_rate_limit_errors_total")
+    server_wait = retry_after_seconds(exc)
+    # Slow the shared limiter down even when this caller gives up
+    if on_rate_limit is not None:
+        on_rate_limit(exc, server_wait)
+    if attempt == max_retries - 1:
+        raise exc
+    instrumentation.count("rag_retries_total")
+    if server_wait is not None:
+        delay = min(max_delay, server_wait + random.uniform(0, base_delay))
+    else:
+        delay = random.uniform(0, min(max_delay, base_delay * (2 ** attempt)))
+    print(f"Rate limit hit, waiting {delay:.1f} seconds before retry {attempt + 1}/{max_retries}")
+    return delay
+
+
+def retry_with_backoff(
+    func: Callable[[], T],
+    max_retries: int = 3,
+    base_delay: float = 1.0,
+    max_delay: float = 60.0,
+    on_rate_limit: Optional[Callable[[BaseException, Optional[float]], None]] = None,
+) -> T:
+    """
+    Retry ``func`` on rate limit errors with jittered exponential backoff.
+
+    The wait honours ``Retry-After`` when the server sends it; otherwise it
+    uses "full jitter" (a uniform draw up to ``base_delay * 2**attempt``).
+    Non rate limit errors are raised immediately.
+
+    Args:
+        func: Zero-argument callable to execute
+        max_retries (int): Total attempts before giving up
+        base_delay (float): Backoff base in seconds
+        max_delay (float): Upper bound for a single wait
+        on_rate_limit: Optional callback receiving the error and the
+            server-requested wait, e.g. to slow down a shared limiter
+    """
+    for attempt in range(max_retries):
+        try:
+            return func()
+        except Exception as e:
+            time.sleep(_backoff_delay(e, attempt, max_retries, base_delay, max_delay, on_rate_limit))
+    raise RuntimeError("retry_with_backoff called with max_retries < 1")
+
+
+async def async_retry_with_backoff(
+    func: Callable[[], Awaitable[T]],
+    max_retries: int = 3,
+    base_delay: float = 1.0,
+    max_delay: float = 60.0,
+    on_rate_limit: Optional[Callable[[BaseException, Optional[float]], None]] = None,
+) -> T:
+    """
+    Async ``retry_with_backoff``: ``func`` returns an awaitable and the
+    backoff waits with ``asyncio.sleep``.
+    """
+    for attempt in range(max_retries):
+        try:
+            return await func()
+        except Exception as e:
+            await asyncio.sleep(_backoff_delay(e, attempt, max_retries, base_delay, max_delay, on_rate_limit))
+    raise RuntimeError("async_retry_with_backoff called with max_retries < 1")
+
+
+# ========== Token bucket ==========
+
+class TokenBucket:
+    """
+    Thread-safe token bucket with adaptive (AIMD) rate.
+
+    Args:
+        rate_per_minute (float): Maximum refill rate; ``<= 0`` disables limiting
+        burst (float, optional): Bucket capacity, defaults to one second of
+            tokens or the largest single request, whichever is bigger
+    """
+
+    def __init__(self, rate_per_minute: float, burst: Optional[float] = None):
+        self.max_rate = rate_per_minute / 60.0
+        self.rate = self.max_rate
+        self.capacity = burst if burst is not None else max(self.max_rate, 1.0)
+        self.tokens = self.capacity
+        self.paused_until = 0.0
+        self.updated = time.monotonic()
+        self._cond = threading.Condition()
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_rate > 0
+
+    def _refill(self, now: float):
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def _try_take(self, amount: float) -> float:
+        """Take ``amount`` tokens and return 0, or return the seconds to wait (lock held)."""
+        now = time.monotonic()
+        if now < self.paused_until:
+            return self.paused_until - now
+        self._refill(now)
+        if self.tokens >= amount:
+            self.tokens -= amount
+            return 0.0
+        return (amount - self.tokens) / self.rate
+
+    def acquire(self, amount: float = 1.0):
+        """Block until ``amount`` tokens are available, then take them."""
+        if not self.enabled:
+            return
+        with self._cond:
+            # Oversized requests are allowed once the bucket is full
+            amount = min(amount, self.capacity)
+            while True:
+                wait = self._try_take(amount)
+                if not wait:
+                    return
+                self._cond.wait(wait)
+
+    async def aacquire(self, amount: float = 1.0):
+        """Async ``acquire``: waits with ``asyncio.sleep`` instead of blocking."""
+        if not self.enabled:
+            return
+        amount = min(amount, self.capacity)
+        while True:
+            with self._cond:
+                wait = self._try_take(amount)
+            if not wait:
+                return
+            await asyncio.sleep(wait)
+
+    def on_success(self):
+        """Additively recover the rate after a successful request."""
+        if not self.enabled:
+            return
+        with self._cond:
+            self.rate = min(self.max_rate, self.rate + self.max_rate * 0.05)
+
+    def on_rate_limited(self, wait: Optional[float] = None):
+        """Halve the rate and pause every caller for ``wait`` seconds."""
+        if not self.enabled:
+            return
+        with self._cond:
+            self.rate = max(self.max_rate * 0.05, self.rate / 2)
+            self.tokens = 0.0
+            if wait:
+                self.paused_until = max(self.paused_until, time.monotonic() + wait)
+            self._cond.notify_all()
+
+    def observe(self, remaining: Optional[float], reset: Optional[float] = None):
+        """
+        Pace ahead of the server limit using its ``x-ratelimit-*`` headers.
+
+        Args:
+            remaining (float, optional): Units the server still allows in its window
+            reset (float, optional): Seconds until the server window is replenished
+        """
+        if not self.enabled or remaining is None:
+            return
+        with self._cond:
+            now = time.monotonic()
+            self._refill(now)
+            self.tokens = min(self.tokens, max(0.0, remaining))
+            if reset:
+                # Never spend faster than the remaining budget over the reset interval
+                self.rate = min(self.rate, max(self.max_rate * 0.05, remaining / reset))
+                if remaining <= 0:
+                    self.paused_until = max(self.paused_until, now + reset)
+
+
+# ========== Response header feedback ==========
+
+_SCHEDULERS: "weakref.WeakSet[EmbeddingScheduler]" = weakref.WeakSet()
+
+
+def rate_limit_state(headers: Mapping[str, str]) -> Dict[str, Tuple[Optional[float], Optional[float]]]:
+    """
+    Read the ``x-ratelimit-remaining-*`` / ``x-ratelimit-reset-*`` headers of a response.
+
+    Returns:
+        Dict: ``{"tokens": (remaining, reset_seconds), "requests": (remaining, reset_seconds)}``
+    """
+    lowered = {k.lower(): v for k, v in headers.items()}
+    state = {}
+    for kind in ("tokens", "requests"):
+        remaining = parse_duration(lowered.get(f"x-ratelimit-remaining-{kind}", ""))
+        state[kind] = (remaining, parse_duration(lowered.get(f"x-ratelimit-reset-{kind}", "")))
+    return state
+
+
+def observe_rate_limit_headers(headers: Mapping[str, str]):
+    """Feed the rate-limit headers of an embedding response to every live scheduler."""
+    state = rate_limit_state(headers)
+    if state["tokens"][0] is None and state["requests"][0] is None:
+        return
+    for scheduler in list(_SCHEDULERS):
+        scheduler.observe(state)
+
+
+def rate_limit_event_hooks(asynchronous: bool = False) -> Dict[str, list]:
+    """Return httpx ``event_hooks`` calling ``observe_rate_limit_headers`` on every response."""
+    if asynchronous:
+        async def ahook(response):
+            observe_rate_limit_headers(response.headers)
+        return {"response": [ahook]}
+    return {"response": [lambda response: observe_rate_limit_headers(response.headers)]}
+
+
+# ========== Batching ==========
+
+def estimate_tokens(text: str) -> int:
+    """Cheap token estimate (~4 characters per token for English text)."""
+    return max(1, (len(text) + 3) // 4)
+
+
+def make_batches(texts: List[str], max_tokens: int, max_items: int) -> List[Tuple[int, int]]:
+    """
+    Group consecutive texts into batches bounded by tokens and item count.
+
+    Returns:
+        List[Tuple[int, int]]: ``(start, end)`` slices into ``texts``
+    """
+    batches: List[Tuple[int, int]] = []
+    start, tokens = 0, 0
+    for i, text in enumerate(texts):
+        t = estimate_tokens(text)
+        if i > start and (tokens + t > max_tokens or i - start >= max_items):
+            batches.append((start, i))
+            start, tokens = i, 0
+        tokens += t
+    if start < len(texts):
+        batches.append((start, len(texts)))
+    return batches
+
+
+# ========== Scheduler ==========
+
+class EmbeddingScheduler:
+    """
+    Embed texts with several batches in flight under a shared rate limit.
+
+    Args:
+        embeddings: Object exposing ``embed_documents(List[str])``
+        max_concurrency (int): Batches in flight at the same time
+        max_batch_tokens (int): Estimated token budget per request
+        max_batch_size (int): Maximum texts per request
+        tokens_per_minute (int): Token rate limit (``0`` = unlimited)
+        requests_per_minute (int): Request rate limit (``0`` = unlimited)
+        max_retries (int): Attempts per batch on rate limit errors
+        base_delay (float): Backoff base in seconds
+    """
+
+    def __init__(
+        self,
+        embeddings,
+        max_concurrency: int = 4,
+        max_batch_tokens: int = 8000,
+        max_batch_size: int = 64,
+        tokens_per_minute: int = 0,
+        requests_per_minute: int = 0,
+        max_retries: int = 6,
+        base_delay: float = 1.0,
+    ):
+        self.embeddings = embeddings
+        self.max_concurrency = max(1, max_concurrency)
+        self.max_batch_tokens = max_batch_tokens
+        self.max_batch_size = max_batch_size
+        self.token_bucket = TokenBucket(tokens_per_minute, burst=max(tokens_per_minute / 60.0, max_batch_tokens))
+        self.request_bucket = TokenBucket(requests_per_minute)
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.rate_limited = 0
+        _SCHEDULERS.add(self)
+
+    @classmethod
+    def from_settings(cls, embeddings, settings) -> "EmbeddingScheduler":
+        """Build a scheduler from the ``embed_*`` fields of ``Settings``."""
+        return cls(
+            embeddings,
+            max_concurrency=settings.embed_concurrency,
+            max_batch_tokens=settings.embed_batch_tokens,
+            max_batch_size=settings.embed_batch_size,
+            tokens_per_minute=settings.embed_tokens_per_minute,
+            requests_per_minute=settings.embed_requests_per_minute,
+        )
+
+    def observe(self, state: Dict[str, Tuple[Optional[float], Optional[float]]]):
+        """Apply the server rate-limit state (see ``rate_limit_state``) to both buckets."""
+        self.token_bucket.observe(*state["tokens"])
+        self.request_bucket.observe(*state["requests"])
+
+    def _on_rate_limit(self, exc: BaseException, wait: Optional[float]):
+        self.rate_limited += 1
+        self.token_bucket.on_rate_limited(wait)
+        self.request_bucket.on_rate_limited(wait)
+
+    def _embed_batch(self, texts: List[str]) -> List[List[float]]:
+        tokens = sum(estimate_tokens(t) for t in texts)
+
+        def call():
+            self.request_bucket.acquire(1)
+            self.token_bucket.acquire(tokens)
+            return self.embeddings.embed_documents(texts)
+
+        vectors = retry_with_backoff(
+            call,
+            max_retries=self.max_retries,
+            base_delay=self.base_delay,
+            on_rate_limit=self._on_rate_limit,
+        )
+        self.token_bucket.on_success()
+        self.request_bucket.on_success()
+        return vectors
+
+    async def _aembed_batch(self, texts: List[str]) -> List[List[float]]:
+        tokens = sum(estimate_tokens(t) for t in texts)
+
+        async def call():
+            await self.request_bucket.aacquire(1)
+            await self.token_bucket.aacquire(tokens)
+            return await self.embeddings.aembed_documents(texts)
+
+        vectors = await async_retry_with_backoff(
+            call,
+            max_retries=self.max_retries,
+            base_delay=self.base_delay,
+            on_rate_limit=self._on_rate_limit,
+        )
+        self.token_bucket.on_success()
+        self.request_bucket.on_success()
+        return vectors
+
+    def iter_batches(self, texts: List[str]) -> Iterator[Tuple[int, List[List[float]]]]:
+        """
+        Yield ``(start, vectors)`` per batch, in input order.
+
+        At most ``max_concurrency`` batches are pending at any time, so memory
+        stays bounded when the caller consumes results as they arrive.
+        """
+        batches = make_batches(texts, self.max_batch_tokens, self.max_batch_size)
+        pending: Deque[Tuple[int, Future]] = deque()
+        with ThreadPoolExecutor(max_workers=self.max_concurrency) as pool:
+            try:
+                for start, end in batches:
+                    if len(pending) >= self.max_concurrency:
+                        done_start, future = pending.popleft()
+                        yield done_start, future.result()
+                    pending.append((start, pool.submit(self._embed_batch, texts[start:end])))
+                while pending:
+                    done_start, future = pending.popleft()
+                    yield done_start, future.result()
+            finally:
+                for _, future in pending:
+                    future.cancel()
+
+    async def aiter_batches(self, texts: List[str]) -> AsyncIterator[Tuple[int, List[List[float]]]]:
+        """
+        Async ``iter_batches``: batches run as tasks on the event loop, with
+        at most ``max_concurrency`` pending, and are yielded in input order.
+        """
+        batches = make_batches(texts, self.max_batch_tokens, self.max_batch_size)
+        pending: Deque[Tuple[int, asyncio.Task]] = deque()
+        try:
+            for start, end in batches:
+                if len(pending) >= self.max_concurrency:
+                    done_start, task = pending.popleft()
+                    yield done_start, await task
+                pending.append((start, asyncio.ensure_future(self._aembed_batch(texts[start:end]))))
+            while pending:
+                done_start, task = pending.popleft()
+                yield done_start, await task
+        finally:
+            for _, task in pending:
+                task.cancel()
+
+    def embed(self, texts: List[str]) -> List[List[float]]:
+        """Embed every text and return vectors in input order."""
+        vectors: List[List[float]] = []
+        for _, batch in self.iter_batches(texts):
+            vectors.extend(batch)
+        return vectors
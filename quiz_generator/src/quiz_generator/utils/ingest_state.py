@@ -0,0 +1,199 @@
+"""
+Local ingestion state for the RAG pipeline.
+
+Holds the resumable checkpoint written while chunks are streamed into
+Qdrant, so an interrupted ingestion can continue where it stopped instead of
+re-embedding the whole corpus, the per-collection file manifest used to
+re-ingest only new or changed source files, and the cache of text extracted
+from PDFs.
+"""
+
+from __future__ import annotations
+import hashlib
+import json
+import os
+import threading
+from dataclasses import asdict, dataclass, field
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from langchain.schema import Document
+
+
+def chunk_key(ordinal: int, chunk: Document) -> str:
+    """Return the checkpoint key of the ``ordinal``-th chunk of an ingestion."""
+    digest = hashlib.sha256()
+    digest.update(str(chunk.metadata.get("source", "")).encode("utf-8"))
+    digest.update(b"\0")
+    digest.update(chunk.page_content.encode("utf-8"))
+    return f"{ordinal}:{digest.hexdigest()}"
+
+
+class IngestCheckpoint:
+    """
+    Append-only record of the chunks already stored in a collection.
+
+    Every line of the checkpoint file is one ``chunk_key``; lines are flushed
+    as soon as their upsert is acknowledged, so the file survives crashes.
+
+    Args:
+        state_dir (str): Directory holding ingestion state files
+        collection (str): Qdrant collection the checkpoint belongs to
+    """
+
+    def __init__(self, state_dir: str, collection: str):
+        self.path = os.path.join(state_dir, f"{collection}.checkpoint")
+        self._lock = threading.Lock()
+        self._done: Set[str] = set()
+        if os.path.exists(self.path):
+            with open(self.path, "r", encoding="utf-8") as f:
+                self._done = {line.strip() for line in f if line.strip()}
+
+    def exists(self) -> bool:
+        """Return True if an unfinished ingestion left a checkpoint behind."""
+        return os.path.exists(self.path)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._done
+
+    def __len__(self) -> int:
+        return len(self._done)
+
+    def mark_done(self, keys: Iterable[str]):
+        """Durably record ``keys`` as stored."""
+        keys = [k for k in keys if k not in self._done]
+        if not keys:
+            return
+        with self._lock:
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write("".join(f"{k}\n" for k in keys))
+                f.flush()
+                os.fsync(f.fileno())
+            self._done.update(keys)
+
+    def clear(self):
+        """Forget the checkpoint (ingestion finished or collection was reset)."""
+        with self._lock:
+            self._done.clear()
+            if os.path.exists(self.path):
+                os.remove(self.path)
+
+
+# ========== File manifest ==========
+
+def file_sha256(path: str) -> str:
+    """Return the SHA-256 of a file's content."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+@dataclass
+class ManifestEntry:
+    """Ingestion record of one source file."""
+    size: int
+    mtime: float
+    sha256: str
+    point_ids: List[str] = field(default_factory=list)
+
+
+class FileManifest:
+    """
+    Maps source files of a collection to their fingerprint and point IDs.
+
+    Args:
+        state_dir (str): Directory holding ingestion state files
+        collection (str): Qdrant collection the manifest belongs to
+    """
+
+    def __init__(self, state_dir: str, collection: str):
+        self.path = os.path.join(state_dir, f"{collection}.manifest.json")
+        self.entries: Dict[str, ManifestEntry] = {}
+        if os.path.exists(self.path):
+            with open(self.path, "r", encoding="utf-8") as f:
+                self.entries = {name: ManifestEntry(**entry) for name, entry in json.load(f).items()}
+
+    def diff(self, files: Dict[str, str]) -> Tuple[List[str], List[str], List[str]]:
+        """
+        Compare ``files`` (name -> path) against the manifest.
+
+        Files whose size and mtime are unchanged are not re-hashed; files with
+        a new mtime but identical content only get their mtime refreshed.
+
+        Returns:
+            Tuple[List[str], List[str], List[str]]: ``(to_ingest, removed, unchanged)`` names
+        """
+        to_ingest: List[str] = []
+        unchanged: List[str] = []
+        for name, path in sorted(files.items()):
+            entry = self.entries.get(name)
+            stat = os.stat(path)
+            if entry is None:
+                to_ingest.append(name)
+            elif entry.size == stat.st_size and entry.mtime == stat.st_mtime:
+                unchanged.append(name)
+            elif entry.size == stat.st_size and entry.sha256 == file_sha256(path):
+                entry.mtime = stat.st_mtime
+                unchanged.append(name)
+            else:
+                to_ingest.append(name)
+        removed = sorted(set(self.entries) - set(files))
+        return to_ingest, removed, unchanged
+
+    def record(self, name: str, path: str, point_ids: List[str]):
+        """Store the current fingerprint and point IDs of ``name``."""
+        stat = os.stat(path)
+        self.entries[name] = ManifestEntry(stat.st_size, stat.st_mtime, file_sha256(path), list(point_ids))
+
+    def remove(self, name: str):
+        """Forget ``name``."""
+        self.entries.pop(name, None)
+
+    def save(self):
+        """Atomically write the manifest to disk."""
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        tmp = f"{self.path}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump({name: asdict(e) for name, e in self.entries.items()}, f, indent=2)
+        os.replace(tmp, self.path)
+
+
+# ========== Parse cache ==========
+
+class ParseCache:
+    """
+    Extracted PDF text keyed by file content hash.
+
+    Each entry is a JSON file ``<sha256>.<variant>.json`` holding the
+    documents produced by the loader (``variant`` identifies the backend and
+    extraction mode), written atomically so concurrent runs never see
+    partial entries.
+
+    Args:
+        state_dir (str): Directory holding ingestion state files
+    """
+
+    def __init__(self, state_dir: str):
+        self.directory = os.path.join(state_dir, "parsed")
+
+    def _path(self, file_hash: str, variant: str) -> str:
+        return os.path.join(self.directory, f"{file_hash}.{variant}.json")
+
+    def get(self, file_hash: str, variant: str) -> Optional[List[Document]]:
+        """Return cached documents, or ``None`` if the file was never parsed."""
+        path = self._path(file_hash, variant)
+        if not os.path.exists(path):
+            return None
+        with open(path, "r", encoding="utf-8") as f:
+            return [Document(page_content=d["page_content"], metadata=d["metadata"]) for d in json.load(f)]
+
+    def put(self, file_hash: str, variant: str, docs: List[Document]):
+        """Store the documents extracted from a file."""
+        os.makedirs(self.directory, exist_ok=True)
+        path = self._path(file_hash, variant)
+        tmp = f"{path}.{os.getpid()}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump([{"page_content": d.page_content, "metadata": d.metadata} for d in docs], f)
+        os.replace(tmp, path)
@@ -0,0 +1,254 @@
+"""
+Lightweight instrumentation for the RAG pipeline and the quiz flow.
+
+Spans time a stage (embedding, search, fusion, MMR, crew kickoff, ...) and
+counters track events (cache hits, retries, 429s, points upserted). Both are
+no-ops until instrumentation is enabled, so instrumented code pays a single
+flag check when it is off.
+
+When enabled, every span feeds a latency histogram and every counter is
+kept in an in-process registry that can be rendered in the Prometheus text
+format, served on ``/metrics``, or printed as a summary. With the
+``otel`` exporter, spans are also emitted through the OpenTelemetry API
+(if the ``opentelemetry-api`` package is installed).
+
+Enable it from the environment with ``configure_from_env``::
+
+    RAG_INSTRUMENTATION=metrics             # in-process registry only
+    RAG_INSTRUMENTATION=prometheus          # + /metrics on RAG_METRICS_PORT (default 9464)
+    RAG_METRICS_HOST=0.0.0.0                # bind address of /metrics (default 127.0.0.1)
+    RAG_INSTRUMENTATION=otel,prometheus     # + OpenTelemetry spans
+"""
+
+from __future__ import annotations
+import functools
+import inspect
+import os
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Dict, Iterator, Optional, Tuple, TypeVar
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+# Histogram buckets in seconds (Prometheus defaults extended for LLM calls)
+BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0)
+
+_ENABLED = False
+_TRACER = None
+_NOOP = nullcontext()
+
+LabelKey = Tuple[str, Tuple[Tuple[str, str], ...]]
+
+
+# ========== Registry ==========
+
+class MetricsRegistry:
+    """Thread-safe store of counters and stage latency histograms."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.counters: Dict[LabelKey, float] = {}
+        self.histograms: Dict[LabelKey, list] = {}  # key -> [bucket counts..., sum, count]
+
+    def inc(self, name: str, value: float, labels: Dict[str, Any]):
+        key = (name, tuple(sorted((k, str(v)) for k, v in labels.items())))
+        with self._lock:
+            self.counters[key] = self.counters.get(key, 0.0) + value
+
+    def observe(self, name: str, seconds: float, labels: Dict[str, Any]):
+        key = (name, tuple(sorted((k, str(v)) for k, v in labels.items())))
+        with self._lock:
+            hist = self.histograms.get(key)
+            if hist is None:
+                hist = self.histograms[key] = [0] * len(BUCKETS) + [0.0, 0]
+            for i, bound in enumerate(BUCKETS):
+                if seconds <= bound:
+                    hist[i] += 1
+            hist[-2] += seconds
+            hist[-1] += 1
+
+    def clear(self):
+        with self._lock:
+            self.counters.clear()
+            self.histograms.clear()
+
+    def render_prometheus(self) -> str:
+        """Return every metric in the Prometheus text exposition format."""
+        def fmt(labels, extra=()):
+            pairs = list(labels) + list(extra)
+            if not pairs:
+                return ""
+            return "{" + ",".join(f'{k}="{v}"' for k, v in pairs) + "}"
+
+        lines = []
+        with self._lock:
+            for name in sorted({n for n, _ in self.counters}):
+                lines.append(f"# TYPE {name} counter")
+                for (n, labels), value in sorted(self.counters.items()):
+                    if n == name:
+                        lines.append(f"{name}{fmt(labels)} {value:g}")
+            for name in sorted({n for n, _ in self.histograms}):
+                lines.append(f"# TYPE {name} histogram")
+                for (n, labels), hist in sorted(self.histograms.items()):
+                    if n != name:
+                        continue
+                    for bound, bucket in zip(BUCKETS, hist):
+                        lines.append(f"{name}_bucket{fmt(labels, [('le', f'{bound:g}')])} {bucket}")
+                    lines.append(f"{name}_bucket{fmt(labels, [('le', '+Inf')])} {hist[-1]}")
+                    lines.append(f"{name}_sum{fmt(labels)} {hist[-2]:.6f}")
+                    lines.append(f"{name}_count{fmt(labels)} {hist[-1]}")
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = MetricsRegistry()
+
+
+# ========== Configuration ==========
+
+def is_enabled() -> bool:
+    """Return True if spans and counters are being recorded."""
+    return _ENABLED
+
+
+def configure(enabled: bool = True, otel: bool = False, prometheus_port: Optional[int] = None,
+              prometheus_host: str = "127.0.0.1"):
+    """
+    Turn instrumentation on or off.
+
+    Args:
+        enabled (bool): Record spans and counters
+        otel (bool): Also emit spans through the OpenTelemetry API
+        prometheus_port (int, optional): Serve ``/metrics`` on this port
+        prometheus_host (str): Bind address of ``/metrics`` (loopback only by default)
+    """
+    global _ENABLED, _TRACER
+    _ENABLED = enabled
+    _TRACER = None
+    if enabled and otel:
+        try:
+            from opentelemetry import trace
+            _TRACER = trace.get_tracer("quiz_generator")
+        except ImportError:
+            print("⚠️ opentelemetry-api is not installed, OpenTelemetry spans are disabled")
+    if enabled and prometheus_port:
+        start_metrics_server(prometheus_port, host=prometheus_host)
+
+
+def configure_from_env():
+    """Configure instrumentation from ``RAG_INSTRUMENTATION``, ``RAG_METRICS_PORT`` and ``RAG_METRICS_HOST``."""
+    modes = {m.strip().lower() for m in os.getenv("RAG_INSTRUMENTATION", "").split(",") if m.strip()}
+    modes.discard("off")
+    if not modes:
+        return
+    port = int(os.getenv("RAG_METRICS_PORT", "9464")) if "prometheus" in modes else None
+    configure(enabled=True, otel="otel" in modes, prometheus_port=port,
+              prometheus_host=os.getenv("RAG_METRICS_HOST", "127.0.0.1"))
+    print(f"📈 Instrumentation enabled ({', '.join(sorted(modes))})")
+
+
+# ========== Spans and counters ==========
+
+@contextmanager
+def _span(name: str, attributes: Dict[str, Any]) -> Iterator[None]:
+    otel = _TRACER.start_as_current_span(name, attributes=attributes) if _TRACER is not None else _NOOP
+    status = "ok"
+    t0 = time.perf_counter()
+    with otel:
+        try:
+            yield
+        except BaseException:
+            status = "error"
+            raise
+        finally:
+            REGISTRY.observe("rag_stage_seconds", time.perf_counter() - t0, {"stage": name, "status": status})
+
+
+def span(name: str, **attributes: Any):
+    """
+    Context manager timing the stage ``name``.
+
+    Returns a shared no-op context when instrumentation is disabled.
+    """
+    if not _ENABLED:
+        return _NOOP
+    return _span(name, attributes)
+
+
+def traced(name: str) -> Callable[[F], F]:
+    """Decorator recording every call of the function (or coroutine) as a span called ``name``."""
+    def decorator(func: F) -> F:
+        if inspect.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                if not _ENABLED:
+                    return await func(*args, **kwargs)
+                with _span(name, {}):
+                    return await func(*args, **kwargs)
+            return async_wrapper  # type: ignore[return-value]
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not _ENABLED:
+                return func(*args, **kwargs)
+            with _span(name, {}):
+                return func(*args, **kwargs)
+        return wrapper  # type: ignore[return-value]
+    return decorator
+
+
+def count(name: str, value: float = 1, **labels: Any):
+    """Add ``value`` to the counter ``name`` (no-op when disabled)."""
+    if _ENABLED:
+        REGISTRY.inc(name, value, labels)
+
+
+# ========== Export ==========
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path.split("?")[0] != "/metrics":
+            self.send_error(404)
+            return
+        body = REGISTRY.render_prometheus().encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; version=0.0.4")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+_SERVERS: Dict[int, ThreadingHTTPServer] = {}
+
+
+def start_metrics_server(port: int, host: str = "127.0.0.1") -> ThreadingHTTPServer:
+    """Serve the registry on ``http://host:port/metrics`` from a daemon thread."""
+    if port not in _SERVERS:
+        server = ThreadingHTTPServer((host, port), _MetricsHandler)
+        threading.Thread(target=server.serve_forever, daemon=True, name="metrics-server").start()
+        _SERVERS[port] = server
+        print(f"📈 Prometheus metrics on http://{host}:{server.server_address[1]}/metrics")
+    return _SERVERS[port]
+
+
+def format_summary() -> str:
+    """Return a human readable table of stage timings and counters."""
+    lines = [f"{'stage':<32} {'calls':>6} {'total (s)':>10} {'mean (ms)':>10}"]
+    totals: Dict[str, list] = {}
+    with REGISTRY._lock:
+        for (name, labels), hist in REGISTRY.histograms.items():
+            stage = dict(labels).get("stage", name)
+            entry = totals.setdefault(stage, [0, 0.0])
+            entry[0] += hist[-1]
+            entry[1] += hist[-2]
+        counters = sorted(REGISTRY.counters.items())
+    for stage, (calls, total) in sorted(totals.items(), key=lambda kv: -kv[1][1]):
+        lines.append(f"{stage:<32} {calls:>6} {total:>10.3f} {total / calls * 1e3:>10.1f}")
+    for (name, labels), value in counters:
+        label_text = ",".join(f"{k}={v}" for k, v in labels)
+        lines.append(f"{name}{'{' + label_text + '}' if label_text else ''} = {value:g}")
+    return "\n".join(lines)
@@ -1,6 +1,5 @@
 from __future__ import annotations
 import os
-import time
 from dataclasses import dataclass
 from pathlib import Path
 from typing import List, Dict, Any, Iterable, Tuple
@@ -35,6 +34,8 @@ from qdrant_client.models import (
     PointStruct,
 )
 
+from .embedding_scheduler import retry_with_backoff
+
 CURRENT_FILE_PATH = os.path.abspath(__file__)
 CURRENT_DIRECTORY_PATH = os.path.dirname(CURRENT_FILE_PATH)
  
@@ -88,23 +89,6 @@ def get_embeddings(settings: Settings) -> AzureOpenAIEmbeddings:
 def get_vector_size(embeddings: AzureOpenAIEmbeddings) -> int:
     return len(embeddings.embed_query("hello world"))
 
-def retry_with_backoff(func, max_retries=3, base_delay=1.0):
-    """Retry function with exponential backoff for rate limiting"""
-    for attempt in range(max_retries):
-        try:
-            return func()
-        except Exception as e:
-            if "429" in str(e) or "rate limit" in str(e).lower():
-                if attempt == max_retries - 1:
-                    raise e
-                delay = base_delay * (2 ** attempt)
-                print(f"Rate limit hit, waiting {delay} seconds before retry {attempt + 1}/{max_retries}")
-                time.sleep(delay)
-            else:
-                raise e
-    return None
-
-
 def split_documents(docs: List[Document], settings: Settings) -> List[Document]:
     """Split docs into chunks"""
     splitter = RecursiveCharacterTextSplitter(
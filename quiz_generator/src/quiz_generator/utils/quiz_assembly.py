@@ -0,0 +1,141 @@
+"""
+Deterministic quiz assembly.
+
+Fills the placeholders of ``quiz_template.md`` (``[TF_Question_1]``,
+``[MC_Question_3]``, ``[MC_Option_A_3]``, ``[Open_Question_5]``, ...) with the
+questions of ``questions.json`` and writes ``quiz.md`` and ``quiz.pdf``,
+without any LLM call. Question numbers come from the template, so the
+numbering is always continuous. Templates without placeholders, or whose
+placeholders do not match the generated questions, raise
+``TemplateMismatchError`` so the caller can fall back to the Quiz Maker crew.
+"""
+
+import json
+import os
+import re
+from typing import Dict, List
+
+PLACEHOLDER_PATTERN = re.compile(r"\[(TF_Question|MC_Question|MC_Option_([A-Z])|Open_Question)_(\d+)\]")
+
+# Placeholder kind -> question types (as written by the RAG crew) that can fill it
+QUESTION_KINDS = {
+    "TF": ("true_false",),
+    "MC": ("multiple_choice",),
+    "Open": ("open_ended", "open"),
+}
+
+_CODE_FENCE = re.compile(r"^\s*```[\w-]*\n(.*?)\n```\s*$", re.DOTALL)
+_OPTION_PREFIX = re.compile(r"^\s*[A-Z][).:]\s+")
+
+
+class TemplateMismatchError(ValueError):
+    """The template cannot be filled deterministically from the questions."""
+
+
+def strip_code_fence(text: str) -> str:
+    """Remove a Markdown code fence wrapping the whole ``text``, if any."""
+    match = _CODE_FENCE.match(text)
+    return match.group(1) if match else text
+
+
+def parse_placeholders(template: str) -> Dict[int, str]:
+    """
+    Return the question slots of a template.
+
+    Args:
+        template (str): Markdown quiz template
+
+    Returns:
+        Dict[int, str]: Question number -> kind (``TF``, ``MC`` or ``Open``), by number
+
+    Raises:
+        TemplateMismatchError: If a number is used by placeholders of different kinds
+    """
+    slots: Dict[int, str] = {}
+    for match in PLACEHOLDER_PATTERN.finditer(template):
+        name, number = match.group(1), int(match.group(3))
+        kind = "MC" if name.startswith("MC_") else name.split("_")[0]
+        if slots.setdefault(number, kind) != kind:
+            raise TemplateMismatchError(f"Question {number} has both {slots[number]} and {kind} placeholders")
+    return dict(sorted(slots.items()))
+
+
+def fill_template(template: str, questions: List[dict]) -> str:
+    """
+    Replace every placeholder of ``template`` with the matching question.
+
+    Questions are assigned to the template slots in order, per kind: the
+    first true/false question fills the first ``TF`` slot, and so on.
+
+    Args:
+        template (str): Markdown quiz template
+        questions (List[dict]): Questions with ``type``, ``question`` and ``options``
+
+    Returns:
+        str: The populated Markdown quiz
+
+    Raises:
+        TemplateMismatchError: If the template has no placeholders or its slots
+            do not match the number and types of the questions
+    """
+    slots = parse_placeholders(template)
+    if not slots:
+        raise TemplateMismatchError("Template has no question placeholders")
+
+    questions = [q for q in questions if isinstance(q, dict)]
+    queues = {kind: [q for q in questions if q.get("type") in types] for kind, types in QUESTION_KINDS.items()}
+    wanted = {kind: sum(k == kind for k in slots.values()) for kind in QUESTION_KINDS}
+    available = {kind: len(queue) for kind, queue in queues.items()}
+    if wanted != available or sum(available.values()) != len(questions):
+        raise TemplateMismatchError(f"Template expects {wanted} questions, got {available} of {len(questions)}")
+
+    assigned = {number: queues[kind].pop(0) for number, kind in slots.items()}
+    empty = [number for number, question in assigned.items() if not question.get("question")]
+    if empty:
+        raise TemplateMismatchError(f"Questions {empty} have no text")
+
+    def replace(match: re.Match) -> str:
+        question = assigned[int(match.group(3))]
+        letter = match.group(2)
+        if letter is None:
+            return str(question["question"]).strip()
+        options = question.get("options") or []
+        index = ord(letter) - ord("A")
+        if index >= len(options):
+            raise TemplateMismatchError(f"Question {match.group(3)} has no option {letter}")
+        return _OPTION_PREFIX.sub("", str(options[index])).strip()
+
+    return PLACEHOLDER_PATTERN.sub(replace, template)
+
+
+def assemble_quiz(output_dir: str, pdf: bool = True) -> str:
+    """
+    Build ``quiz.md`` (and ``quiz.pdf``) of a run from its template and questions.
+
+    Args:
+        output_dir (str): Run output directory with ``quiz_template.md`` and ``questions.json``
+        pdf (bool): Whether to export ``quiz.pdf`` too
+
+    Returns:
+        str: Path of the written ``quiz.md``
+
+    Raises:
+        TemplateMismatchError: If the template cannot be filled deterministically
+    """
+    with open(os.path.join(output_dir, "quiz_template.md"), "r", encoding="utf-8") as f:
+        template = strip_code_fence(f.read())
+    with open(os.path.join(output_dir, "questions.json"), "r", encoding="utf-8") as f:
+        try:
+            questions = json.loads(strip_code_fence(f.read()))["questions"]
+        except (ValueError, KeyError, TypeError) as e:
+            raise TemplateMismatchError(f"Invalid questions.json: {e}") from e
+
+    quiz = fill_template(template, questions)
+    quiz_path = os.path.join(output_dir, "quiz.md")
+    with open(quiz_path, "w", encoding="utf-8") as f:
+        f.write(quiz)
+    if pdf:
+        from ..tools.md_to_pdf_tool import MarkdownToPdfExporter
+
+        MarkdownToPdfExporter(output_dir=output_dir)._run(quiz)
+    return quiz_path
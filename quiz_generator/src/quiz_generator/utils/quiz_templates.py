@@ -0,0 +1,224 @@
+"""
+Quiz template cache and built-in template generator.
+
+A quiz template only depends on (provider, certification, number of
+questions, question type), so the template written by the
+``TemplateGeneratorCrew`` is stored on disk under that key and reused by
+later runs with the same configuration, skipping the LLM call. The key also
+hashes the crew's YAML configuration, so editing the prompts invalidates the
+cache. ``build_template`` renders the same layout without any LLM call.
+"""
+
+import glob
+import hashlib
+import json
+import os
+import tempfile
+import threading
+from typing import Dict, Optional
+
+from . import instrumentation
+from .quiz_assembly import parse_placeholders, strip_code_fence
+
+TEMPLATE_CACHE_PATH = os.path.join("outputs", "template_cache")
+TEMPLATE_CONFIG_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)),
+                                   "crews", "template_generator_crew", "config")
+
+# Question type (as chosen by the user) -> placeholder kind
+QUESTION_TYPE_KINDS = {
+    "true/false": "TF",
+    "multiple choice": "MC",
+    "short open question": "Open",
+}
+
+_SECTIONS = [
+    ("TF", "## True/False Questions"),
+    ("MC", "## Multiple Choice Questions\n\n*Note: Select the most appropriate answer. Only one option is correct.*"),
+    ("Open", "## Short Open Questions"),
+]
+
+
+def question_blueprint(number_of_questions: int, question_type: str) -> Dict[str, int]:
+    """
+    Return how many questions of each kind a quiz has.
+
+    ``Mixed`` splits the questions in thirds; the remainder goes to
+    true/false first, then multiple choice.
+
+    Args:
+        number_of_questions (int): Total number of questions
+        question_type (str): One of ``user_utils.QUESTION_TYPES``
+
+    Returns:
+        Dict[str, int]: Count per kind (``TF``, ``MC``, ``Open``)
+    """
+    kind = QUESTION_TYPE_KINDS.get(question_type.strip().lower())
+    if kind:
+        return {k: number_of_questions if k == kind else 0 for k, _ in _SECTIONS}
+    base, remainder = divmod(number_of_questions, 3)
+    return {k: base + (i < remainder) for i, (k, _) in enumerate(_SECTIONS)}
+
+
+def build_template(provider: str, certification: str, number_of_questions: int, question_type: str) -> str:
+    """
+    Render a quiz template deterministically (no LLM call).
+
+    Args:
+        provider (str): Provider shown in the title
+        certification (str): Certification shown in the title
+        number_of_questions (int): Total number of questions
+        question_type (str): One of ``user_utils.QUESTION_TYPES``
+
+    Returns:
+        str: Markdown template with ``[TF_Question_n]``-style placeholders
+    """
+    blocks = [f"# **{provider} - {certification}**"]
+    number = 0
+    for kind, heading in _SECTIONS:
+        count = question_blueprint(number_of_questions, question_type)[kind]
+        if not count:
+            continue
+        blocks.append(heading)
+        for number in range(number + 1, number + count + 1):
+            if kind == "TF":
+                blocks.append(f"{number}. **[TF_Question_{number}]**\n   [] True\n   [] False")
+            elif kind == "MC":
+                options = "\n".join(f"   {letter}) [MC_Option_{letter}_{number}]" for letter in "ABCD")
+                blocks.append(f"{number}. **[MC_Question_{number}]**\n{options}")
+            else:
+                lines = "\n\n".join(["   " + "_" * 56] * 4)
+                blocks.append(f"{number}. **[Open_Question_{number}]**\n\n{lines}")
+    return "\n\n".join(blocks) + "\n"
+
+
+def matches_blueprint(template: str, number_of_questions: int, question_type: str) -> bool:
+    """
+    Return whether the slots of ``template`` fit the requested quiz.
+
+    Questions must be numbered ``1..number_of_questions`` and the count of each
+    kind must equal ``question_blueprint(number_of_questions, question_type)``.
+    """
+    try:
+        slots = parse_placeholders(template)
+    except ValueError:
+        return False
+    if list(slots) != list(range(1, number_of_questions + 1)):
+        return False
+    kinds = list(slots.values())
+    return {kind: kinds.count(kind) for kind, _ in _SECTIONS} == question_blueprint(number_of_questions, question_type)
+
+
+def config_hash(config_dir: str = TEMPLATE_CONFIG_DIR) -> str:
+    """Return a short hash of the template crew's YAML configuration."""
+    digest = hashlib.sha256()
+    for path in sorted(glob.glob(os.path.join(config_dir, "*.yaml"))):
+        with open(path, "rb") as f:
+            digest.update(f.read())
+    return digest.hexdigest()[:16]
+
+
+def template_key(provider: str, certification: str, number_of_questions: int, question_type: str,
+                 version: Optional[str] = None) -> str:
+    """Return the cache key of a template configuration."""
+    raw = json.dumps([provider.lower(), certification, int(number_of_questions),
+                      question_type.strip().lower(), version or config_hash()])
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+class TemplateCache:
+    """
+    Directory of cached templates, one Markdown file per key.
+
+    Writes go through a temporary file and an atomic rename, so concurrent
+    runs (threads or batch worker processes) can share the directory.
+
+    Args:
+        path (str): Cache directory
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        os.makedirs(path, exist_ok=True)
+
+    def __len__(self) -> int:
+        return len(glob.glob(os.path.join(self.path, "*.md")))
+
+    def _count(self, hits: int = 0, misses: int = 0):
+        with self._lock:
+            self.hits += hits
+            self.misses += misses
+        if hits:
+            instrumentation.count("quiz_template_cache_hits_total", hits)
+        if misses:
+            instrumentation.count("quiz_template_cache_misses_total", misses)
+
+    def get(self, key: str, number_of_questions: int, question_type: str) -> Optional[str]:
+        """
+        Return the cached template of ``key``, or ``None``.
+
+        Entries that no longer match the question blueprint (e.g. written by an
+        older version) are evicted and count as a miss.
+        """
+        path = os.path.join(self.path, f"{key}.md")
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                template = f.read()
+        except FileNotFoundError:
+            self._count(misses=1)
+            return None
+        if not matches_blueprint(template, number_of_questions, question_type):
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            self._count(misses=1)
+            return None
+        self._count(hits=1)
+        return template
+
+    def put(self, key: str, template: str, number_of_questions: int, question_type: str) -> bool:
+        """
+        Store ``template`` under ``key`` if it is usable.
+
+        Only templates whose slots match ``question_blueprint`` (one slot per
+        question, with the requested kinds) are stored, so a malformed LLM
+        answer is never served again.
+
+        Returns:
+            bool: Whether the template was stored
+        """
+        template = strip_code_fence(template)
+        if not matches_blueprint(template, number_of_questions, question_type):
+            return False
+        fd, tmp_path = tempfile.mkstemp(dir=self.path, suffix=".tmp")
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            f.write(template)
+        os.replace(tmp_path, os.path.join(self.path, f"{key}.md"))
+        return True
+
+    def clear(self):
+        """Remove every cached template."""
+        for path in glob.glob(os.path.join(self.path, "*.md")):
+            os.remove(path)
+
+    def stats(self) -> Dict[str, int]:
+        """Return hit/miss counters and the current cache size."""
+        return {"hits": self.hits, "misses": self.misses, "entries": len(self)}
+
+
+_CACHES: Dict[str, TemplateCache] = {}
+_CACHES_LOCK = threading.Lock()
+
+
+def get_template_cache(path: Optional[str] = None) -> TemplateCache:
+    """Return the process-wide ``TemplateCache`` for ``path`` (default ``QUIZ_TEMPLATE_CACHE`` or ``TEMPLATE_CACHE_PATH``)."""
+    key = os.path.abspath(path or os.getenv("QUIZ_TEMPLATE_CACHE", TEMPLATE_CACHE_PATH))
+    with _CACHES_LOCK:
+        cache = _CACHES.get(key)
+        if cache is None:
+            cache = TemplateCache(key)
+            _CACHES[key] = cache
+        return cache
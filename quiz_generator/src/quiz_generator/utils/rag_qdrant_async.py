@@ -0,0 +1,292 @@
+"""
+Async RAG pipeline with AsyncQdrantClient and async embeddings.
+
+Mirrors the retrieval and ingestion entry points of ``rag_qdrant_hybrid`` so
+several flows or agents running in one event loop overlap their network
+waits instead of blocking threads. Request building, fusion, MMR and point
+construction are shared with the sync module; only the I/O differs. Retries
+wait with ``asyncio.sleep`` and local SQLite caches are accessed from worker
+threads, so nothing here blocks the event loop.
+"""
+
+from __future__ import annotations
+import asyncio
+import weakref
+from typing import Any, Deque, Dict, Hashable, List, Optional, Set, Tuple
+from collections import deque
+
+from langchain.schema import Document
+from langchain_core.embeddings import Embeddings
+from qdrant_client import AsyncQdrantClient
+from qdrant_client.models import ExtendedPointId, FieldCondition, Filter, MatchText
+
+from .embedding_scheduler import EmbeddingScheduler, async_retry_with_backoff
+from .ingest_state import IngestCheckpoint, chunk_key
+from .instrumentation import count, span, traced
+from .rag_qdrant_hybrid import (
+    _COLLECTION_EXISTS,
+    _VECTOR_LAYOUTS,
+    Settings,
+    VectorLayout,
+    boost_fuse,
+    build_points,
+    chunk_point_id,
+    format_search_result,
+    fusion_request,
+    get_embeddings,
+    get_result_cache,
+    get_search_params,
+    get_settings_for_certification,
+    get_sparse_encoder,
+    mmr_rerank,
+    settings_fingerprint,
+    vector_layout_from_info,
+)
+
+# Async clients are bound to the event loop that created them
+_ASYNC_CLIENTS: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[Hashable, AsyncQdrantClient]]" = weakref.WeakKeyDictionary()
+
+
+# ========== Qdrant ==========
+
+def get_async_qdrant_client(settings: Settings) -> AsyncQdrantClient:
+    """Return the Qdrant async client of the running event loop for ``settings.qdrant_url``"""
+    clients = _ASYNC_CLIENTS.setdefault(asyncio.get_running_loop(), {})
+    key = ("qdrant", settings.qdrant_url, settings.prefer_grpc, settings.grpc_port)
+    if key not in clients:
+        clients[key] = AsyncQdrantClient(
+            url=settings.qdrant_url,
+            timeout=30,
+            prefer_grpc=settings.prefer_grpc,
+            grpc_port=settings.grpc_port,
+        )
+    return clients[key]
+
+async def acollection_exists_cached(client: AsyncQdrantClient, settings: Settings) -> bool:
+    """Async ``collection_exists_cached`` (shares its cache)"""
+    key = (settings.qdrant_url, settings.collection)
+    if _COLLECTION_EXISTS.get(key):
+        return True
+    exists = await client.collection_exists(settings.collection)
+    if exists:
+        _COLLECTION_EXISTS.set(key, True)
+    return exists
+
+async def aget_vector_layout(client: AsyncQdrantClient, settings: Settings) -> VectorLayout:
+    """Async ``get_vector_layout`` (shares its cache)"""
+    key = (settings.qdrant_url, settings.collection)
+    layout = _VECTOR_LAYOUTS.get(key)
+    if layout is None:
+        layout = vector_layout_from_info(await client.get_collection(settings.collection), settings)
+        _VECTOR_LAYOUTS.set(key, layout)
+    return layout
+
+# ========== Ingest ==========
+
+async def aexisting_point_ids(client: AsyncQdrantClient, settings: Settings, ids: List[ExtendedPointId]) -> Set[str]:
+    """Return the subset of ``ids`` already stored in the collection"""
+    found = set()
+    for i in range(0, len(ids), 256):
+        records = await client.retrieve(settings.collection, ids=ids[i:i + 256], with_payload=False, with_vectors=False)
+        found.update(str(r.id) for r in records)
+    return found
+
+@traced("ingest.upsert")
+async def aupsert_chunks(client: AsyncQdrantClient, settings: Settings, chunks: List[Document], embeddings: Embeddings):
+    """
+    Async ``upsert_chunks``: embedding batches and upserts run as tasks on
+    the event loop, with the same bounds, idempotent point IDs and
+    resumable checkpoint.
+    """
+    checkpoint = IngestCheckpoint(settings.state_dir, settings.collection)
+    if len(checkpoint) and not (await client.count(collection_name=settings.collection)).count:
+        # The collection was reset since the checkpoint was written
+        checkpoint.clear()
+    keys = [chunk_key(i, c) for i, c in enumerate(chunks)]
+    todo = [i for i, key in enumerate(keys) if key not in checkpoint]
+    if len(todo) < len(chunks):
+        print(f"Resuming ingestion: {len(chunks) - len(todo)} chunks already stored")
+    stored_ids = await aexisting_point_ids(client, settings, [chunk_point_id(chunks[i], i) for i in todo])
+    if stored_ids:
+        todo = [i for i in todo if chunk_point_id(chunks[i], i) not in stored_ids]
+        print(f"Skipping {len(stored_ids)} chunks already stored with identical content")
+    print(f"Embedding {len(todo)} chunks...")
+
+    scheduler = EmbeddingScheduler.from_settings(embeddings, settings)
+    layout = await aget_vector_layout(client, settings)
+    sparse_encoder = get_sparse_encoder(settings)
+    texts = [chunks[i].page_content for i in todo]
+    pending: Deque[Tuple[asyncio.Task, List[str]]] = deque()
+    max_pending = max(1, settings.upsert_parallelism) * 2
+    stored = 0
+
+    async def abandon():
+        # Keep the progress of requests that did succeed, cancel the others
+        # and wait for them so no upsert outlives the call
+        for task, done_keys in pending:
+            if task.done() and not task.cancelled() and task.exception() is None:
+                checkpoint.mark_done(done_keys)
+            else:
+                task.cancel()
+        await asyncio.gather(*(task for task, _ in pending), return_exceptions=True)
+        pending.clear()
+
+    async def drain(limit: int):
+        nonlocal stored
+        while len(pending) > limit:
+            task, done_keys = pending[0]
+            await task
+            pending.popleft()
+            checkpoint.mark_done(done_keys)
+            stored += len(done_keys)
+            count("rag_points_upserted_total", len(done_keys), collection=settings.collection)
+
+    try:
+        async for start, batch_vecs in scheduler.aiter_batches(texts):
+            ordinals = todo[start:start + len(batch_vecs)]
+            points = build_points([chunks[i] for i in ordinals], batch_vecs, ordinals=ordinals,
+                                  layout=layout, sparse_encoder=sparse_encoder)
+            for j in range(0, len(points), settings.upsert_batch_size):
+                part = points[j:j + settings.upsert_batch_size]
+                task = asyncio.ensure_future(client.upsert(collection_name=settings.collection, points=part, wait=True))
+                pending.append((task, [keys[o] for o in ordinals[j:j + settings.upsert_batch_size]]))
+                await drain(max_pending)
+            print(f"Embedded {start + len(batch_vecs)}/{len(todo)} chunks, stored {stored}")
+        await drain(0)
+    except BaseException:
+        # Embedding, an upsert or the caller failed: settle the in-flight upserts first
+        await abandon()
+        raise
+    if scheduler.rate_limited:
+        print(f"Rate limited {scheduler.rate_limited} times while embedding")
+    checkpoint.clear()
+
+# ========== Search ==========
+
+@traced("embed.query")
+async def aembed_query_vector(embeddings: Embeddings, query: str) -> List[float]:
+    """Embed a query with async retry logic"""
+    return await async_retry_with_backoff(lambda: embeddings.aembed_query(query), max_retries=5, base_delay=2.0)
+
+@traced("fusion.client")
+async def aclient_side_fusion(client: AsyncQdrantClient, settings: Settings, query: str, query_vector: List[float]) -> List[Any]:
+    """
+    Async ``client_side_fusion``: the dense and the lexical searches run
+    concurrently, then hits are fused with ``boost_fuse``.
+    """
+    layout = await aget_vector_layout(client, settings)
+    dense = client.query_points(
+        collection_name=settings.collection,
+        query=query_vector,
+        using=layout.dense,
+        limit=settings.top_n_semantic,
+        with_payload=True,
+        with_vectors=[layout.dense] if layout.dense else True,
+        search_params=get_search_params(settings),
+    )
+    res, text_ids = await asyncio.gather(dense, _alexical_ids(client, settings, layout, query))
+    if not res.points: return []
+    return boost_fuse(settings, res.points, text_ids)
+
+async def _alexical_ids(client: AsyncQdrantClient, settings: Settings, layout: VectorLayout, query: str) -> Set[ExtendedPointId]:
+    """Ids of the BM25 matches (or ``MatchText`` matches on legacy collections)"""
+    if layout.sparse:
+        sparse_query = get_sparse_encoder(settings).encode_query(query)
+        if not sparse_query.indices:
+            return set()
+        res = await client.query_points(
+            collection_name=settings.collection,
+            query=sparse_query,
+            using=layout.sparse,
+            limit=settings.top_n_text,
+            with_payload=False,
+            with_vectors=False,
+        )
+        return {p.id for p in res.points}
+    matched_ids: Set[ExtendedPointId] = set()
+    next_page = None
+    while True:
+        points, next_page = await client.scroll(
+            collection_name=settings.collection,
+            scroll_filter=Filter(must=[FieldCondition(key="text", match=MatchText(text=query))]),
+            limit=min(256, settings.top_n_text - len(matched_ids)),
+            offset=next_page,
+            with_payload=False,
+            with_vectors=False,
+        )
+        matched_ids.update(p.id for p in points)
+        if not next_page or len(matched_ids) >= settings.top_n_text:
+            return matched_ids
+
+@traced("hybrid_search")
+async def ahybrid_search(client: AsyncQdrantClient, settings: Settings, query: str, embeddings: Embeddings,
+                         query_vector: Optional[List[float]] = None) -> List[Any]:
+    """
+    Async ``hybrid_search``: server-side fusion in one Query API call, with
+    the client-side fusion as fallback, then MMR.
+    """
+    qv = query_vector if query_vector is not None else await aembed_query_vector(embeddings, query)
+    layout = await aget_vector_layout(client, settings)
+    fused = None
+    if settings.hybrid_mode == "server":
+        try:
+            request = fusion_request(settings, layout, query, qv)
+            with span("fusion.server"):
+                fused = (await client.query_batch_points(collection_name=settings.collection, requests=[request]))[0].points
+        except Exception as e:
+            print(f"Server-side fusion failed ({e}), falling back to client-side fusion")
+    if fused is None:
+        fused = await aclient_side_fusion(client, settings, query, qv)
+    return mmr_rerank(settings, layout, qv, fused)
+
+# ========== Main ==========
+
+async def asearch_rag_with_collection(q: str, k: int, provider: Optional[str] = None, certification: Optional[str] = None,
+                                      query_vector: Optional[List[float]] = None) -> List[str]:
+    """
+    Async ``search_rag_with_collection`` (same result cache and output format).
+
+    Args:
+        q (str): Query string
+        k (int): Number of results to return
+        provider (str, optional): Provider name for collection selection
+        certification (str, optional): Certification name for collection selection
+        query_vector (List[float], optional): Precomputed embedding of ``q``
+
+    Returns:
+        List of documents from hybrid search
+    """
+    s = get_settings_for_certification(provider, certification) if provider and certification else Settings()
+    print(f"--------- Starting async RAG Search (Collection: {s.collection}) -----------")
+    s.final_k = k
+    embeddings = get_embeddings(s)
+    client = get_async_qdrant_client(s)
+
+    if not await acollection_exists_cached(client, s):
+        print(f"❌ Collection '{s.collection}' not found. Please initialize the database first.")
+        return []
+
+    cache = get_result_cache(s) if s.use_result_cache else None
+    if cache is not None:
+        fingerprint = settings_fingerprint(s)
+        cached = await asyncio.to_thread(cache.get, s.collection, q, k, fingerprint)
+        if cached is not None:
+            print("♻️ Reusing cached retrieval results")
+            return cached
+        if s.semantic_cache:
+            if query_vector is None:
+                query_vector = await aembed_query_vector(embeddings, q)
+            cached = await asyncio.to_thread(cache.get_similar, s.collection, query_vector, k, fingerprint,
+                                             s.semantic_cache_threshold)
+            if cached is not None:
+                print("♻️ Reusing cached retrieval results of a similar query")
+                return cached
+        cache.record_miss()
+
+    hits = await ahybrid_search(client, s, q, embeddings, query_vector=query_vector)
+    results = [format_search_result(hit) for hit in hits]
+
+    if cache is not None:
+        await asyncio.to_thread(cache.put, s.collection, q, k, fingerprint, results,
+                                query_vector if s.semantic_cache else None)
+    return results
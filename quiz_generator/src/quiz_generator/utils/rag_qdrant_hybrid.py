@@ -3,33 +3,35 @@ RAG pipeline with Qdrant and AzureOpenAI embeddings
 """
  
 from __future__ import annotations
+import hashlib
 import os
 import time
+import uuid
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor, as_completed
 from dataclasses import dataclass
 from pathlib import Path
-from typing import List, Dict, Any, Iterable, Tuple
+from typing import List, Deque, Dict, Any, Iterable, Optional, Set, Tuple
  
+import httpx
+import numpy as np
 from dotenv import load_dotenv
 from langchain.schema import Document
+from langchain_core.embeddings import Embeddings
 from langchain_openai import AzureOpenAIEmbeddings
 from langchain.text_splitter import RecursiveCharacterTextSplitter
 
-from langchain_community.document_loaders import PyPDFLoader, PDFMinerLoader
+from langchain_community.document_loaders import PyPDFLoader, PDFMinerLoader, PyMuPDFLoader
  
 from langchain_core.prompts import ChatPromptTemplate
 from langchain_core.output_parsers import StrOutputParser
 from langchain_core.runnables import RunnablePassthrough
 from langchain.chat_models import init_chat_model
  
-from qdrant_client.models import ScalarType
 from qdrant_client import QdrantClient
 from qdrant_client.models import (
     Distance,
     VectorParams,
-    HnswConfigDiff,
-    OptimizersConfigDiff,
-    ScalarQuantization,
-    ScalarQuantizationConfig,
     PayloadSchemaType,
     FieldCondition,
     MatchValue,
@@ -37,8 +39,27 @@ from qdrant_client.models import (
     Filter,
     SearchParams,
     PointStruct,
+    FilterSelector,
+    HasIdCondition,
+    ExtendedPointId,
+    Prefetch,
+    FusionQuery,
+    Fusion,
+    SparseVectorParams,
+    SparseVector,
+    Modifier,
+    QueryRequest,
 )
 
+from .client_registry import ClientRegistry, TTLCache
+from .embedding_cache import CachedEmbeddings, get_embedding_cache
+from .retrieval_cache import RetrievalCache, get_retrieval_cache
+from .embedding_scheduler import EmbeddingScheduler, rate_limit_event_hooks, retry_with_backoff
+from .instrumentation import count, traced
+from .sparse_encoder import BM25SparseEncoder
+from .ingest_state import IngestCheckpoint, ParseCache, chunk_key, file_sha256
+from .tuning_profiles import collection_kwargs, collection_update_kwargs, get_tuning_profile, profile_drift, search_params, sparse_index_params
+
 CURRENT_FILE_PATH = os.path.abspath(__file__)
 CURRENT_DIRECTORY_PATH = os.path.dirname(CURRENT_FILE_PATH)
  
@@ -49,6 +70,9 @@ load_dotenv()
 class Settings:
     """Config settings for RAG pipeline"""
     qdrant_url: str = "http://localhost:6333"  # Qdrant URL
+    prefer_grpc: bool = False                  # Talk to Qdrant over gRPC instead of REST
+    grpc_port: int = 6334                      # Qdrant gRPC port
+    collection_check_ttl: float = 60.0         # Seconds a positive collection_exists check is cached
     collection: str = "rag_chunks"             # Collection name (can be dynamic)
     emb_model_name: str = "embedding_model"  # Embedding model
     chunk_size: int = 10000                      # Chunk size
@@ -58,13 +82,40 @@ class Settings:
     final_k: int = 6                           # Final results count
     alpha: float = 0.75                        # Semantic weight
     text_boost: float = 0.20                   # Text boost
+    use_sparse: bool = True                    # New collections get named dense + BM25 sparse vectors
+    dense_vector_name: str = "dense"           # Named dense vector
+    sparse_vector_name: str = "bm25"           # Named sparse vector (IDF applied by Qdrant)
+    bm25_k1: float = 1.2                       # BM25 term frequency saturation
+    bm25_b: float = 0.75                       # BM25 length normalization
+    bm25_avg_doc_len: Optional[float] = None   # Expected chunk length in BM25 terms (None = derived from chunk_size)
+    hybrid_mode: str = "server"                # "server" (Query API prefetch + fusion) or "client"
+    fusion: str = "rrf"                        # Server-side fusion: "rrf" or "dbsf"
     use_mmr: bool = True                       # Use MMR diversification
     mmr_lambda: float = 0.6                    # MMR balance
     lm_base_env: str = "AZURE_OPENAI_ENDPOINT" # LLM base URL env
     lm_key_env: str = "AZURE_OPENAI_API_KEY"   # LLM API key env
     lm_model_env: str = "MODEL"                # LLM model env
     use_cache: bool = True                     # Enable embedding cache
-    cache_file: str = "embedding_cache.pkl"   # Cache file path
+    cache_file: str = "embedding_cache.sqlite3"  # Cache file path (SQLite)
+    cache_max_entries: int = 200_000           # LRU bound for the embedding cache
+    use_result_cache: bool = True              # Cache retrieval results of search_rag_with_collection
+    result_cache_file: str = "retrieval_cache.sqlite3"  # Result cache file path (SQLite)
+    result_cache_ttl: float = 86_400.0         # Seconds a cached result stays valid
+    result_cache_max_entries: int = 10_000     # LRU bound for the result cache
+    semantic_cache: bool = False               # Reuse results of near-duplicate queries (costs one query embedding)
+    semantic_cache_threshold: float = 0.95     # Min cosine similarity for a semantic cache hit
+    embed_concurrency: int = 4                 # Embedding batches in flight
+    embed_batch_tokens: int = 8000             # Estimated tokens per embedding request
+    embed_batch_size: int = 64                 # Max texts per embedding request
+    embed_tokens_per_minute: int = 120_000     # Embedding TPM limit (0 = unlimited)
+    embed_requests_per_minute: int = 720       # Embedding RPM limit (0 = unlimited)
+    upsert_batch_size: int = 256               # Points per Qdrant upsert request
+    upsert_parallelism: int = 2                # Concurrent Qdrant upsert requests
+    state_dir: str = ".rag_state"              # Local ingestion state (checkpoints, manifests, parse cache)
+    pdf_workers: int = max(1, min(8, os.cpu_count() or 1))  # Processes for PDF parsing
+    pdf_mode: str = "single"                   # PDF extraction: "single" (chunks may span pages) or "page" (opt-in, page numbers in payload)
+    pdf_backend: str = "pdfminer"              # PDF extraction backend: "pdfminer", "pypdf" or "pymupdf"
+    tuning_profile: str = "balanced"           # Qdrant tuning: "balanced", "low-latency", "low-memory", "high-recall"
 
 def get_collection_name(provider: str, certification: str) -> str:
     """
@@ -94,42 +145,82 @@ def get_settings_for_certification(provider: str, certification: str) -> Setting
         
     Returns:
         Settings: Settings instance with specific collection name
+        
+    Raises:
+        ValueError: If the selected PDF backend is not one of ``PDF_LOADERS``
     """
     settings = Settings()
     settings.collection = get_collection_name(provider, certification)
+    # Tuning profile per certification (RAG_TUNING_PROFILE_<COLLECTION>) or for all of them (RAG_TUNING_PROFILE)
+    settings.tuning_profile = (os.getenv(f"RAG_TUNING_PROFILE_{settings.collection.upper()}")
+                               or os.getenv("RAG_TUNING_PROFILE")
+                               or settings.tuning_profile)
+    # PDF extraction backend, chosen the same way (RAG_PDF_BACKEND_<COLLECTION> or RAG_PDF_BACKEND)
+    settings.pdf_backend = (os.getenv(f"RAG_PDF_BACKEND_{settings.collection.upper()}")
+                            or os.getenv("RAG_PDF_BACKEND")
+                            or settings.pdf_backend)
+    if settings.pdf_backend not in PDF_LOADERS:
+        raise ValueError(f"Unknown PDF backend '{settings.pdf_backend}'. Available: {', '.join(PDF_LOADERS)}")
     return settings
  
 SETTINGS = Settings()
+
+# Long-lived clients shared by every call in the process
+_CLIENTS = ClientRegistry()
+_COLLECTION_EXISTS = TTLCache(ttl=SETTINGS.collection_check_ttl)
+_VECTOR_LAYOUTS = TTLCache(ttl=SETTINGS.collection_check_ttl)
  
 # ========== Embeddings & LLM ==========
 
-def retry_with_backoff(func, max_retries=3, base_delay=1.0):
-    """Retry function with exponential backoff for rate limiting"""
-    for attempt in range(max_retries):
-        try:
-            return func()
-        except Exception as e:
-            if "429" in str(e) or "rate limit" in str(e).lower():
-                if attempt == max_retries - 1:
-                    raise e
-                delay = base_delay * (2 ** attempt)
-                print(f"Rate limit hit, waiting {delay} seconds before retry {attempt + 1}/{max_retries}")
-                time.sleep(delay)
-            else:
-                raise e
-    return None
-
-def get_embeddings(settings: Settings) -> AzureOpenAIEmbeddings:
+def get_embeddings(settings: Settings) -> Embeddings:
     # os.environ["OPENAI_API_TYPE"] = "azure"             
     # os.environ["openai_api_type"] = "azure"
-    """Return Azure OpenAI embeddings"""
-    return AzureOpenAIEmbeddings(
-        model=settings.emb_model_name,
-        azure_endpoint=os.getenv("AZURE_OPENAI_ENDPOINT"),
-        api_key=os.getenv("AZURE_OPENAI_API_KEY"),
-        api_version=os.getenv("AZURE_OPENAI_API_VERSION")
-    )
+    """
+    Return Azure OpenAI embeddings, wrapped by the persistent cache if enabled.
+
+    One instance (and its pooled HTTP session) is kept per embedding
+    deployment for the lifetime of the process.
+    """
+    def build():
+        embeddings = AzureOpenAIEmbeddings(
+            model=settings.emb_model_name,
+            azure_endpoint=os.getenv("AZURE_OPENAI_ENDPOINT"),
+            api_key=os.getenv("AZURE_OPENAI_API_KEY"),
+            api_version=os.getenv("AZURE_OPENAI_API_VERSION"),
+            # Rate-limit headers of every response pace the embedding schedulers
+            http_client=httpx.Client(event_hooks=rate_limit_event_hooks()),
+            http_async_client=httpx.AsyncClient(event_hooks=rate_limit_event_hooks(asynchronous=True)),
+        )
+        if settings.use_cache:
+            cache = get_embedding_cache(settings.cache_file, max_entries=settings.cache_max_entries)
+            return CachedEmbeddings(embeddings, cache, model=settings.emb_model_name)
+        return embeddings
+
+    key = ("embeddings", os.getenv("AZURE_OPENAI_ENDPOINT"), settings.emb_model_name,
+           settings.use_cache, settings.cache_file)
+    return _CLIENTS.get(key, build)
  
+def get_result_cache(settings: Settings) -> RetrievalCache:
+    """Return the process-wide retrieval result cache."""
+    return get_retrieval_cache(settings.result_cache_file, ttl=settings.result_cache_ttl,
+                               max_entries=settings.result_cache_max_entries)
+
+# Settings that change what a query returns (``final_k`` is part of the cache key as ``k``).
+# Host-dependent and ingestion-only settings are left out, so the key is stable across
+# machines and ingestion tweaks keep the cache (collection changes drop it anyway).
+RETRIEVAL_SETTINGS = (
+    "collection", "emb_model_name", "use_sparse", "dense_vector_name", "sparse_vector_name",
+    "hybrid_mode", "fusion", "alpha", "text_boost", "top_n_semantic", "top_n_text",
+    "use_mmr", "mmr_lambda", "bm25_k1", "bm25_b",
+)
+
+def settings_fingerprint(settings: Settings) -> str:
+    """Hash of the settings that affect retrieval results, so cached results never outlive a change."""
+    values = [(name, getattr(settings, name)) for name in RETRIEVAL_SETTINGS]
+    values.append(("bm25_avg_doc_len", effective_bm25_avg_doc_len(settings)))
+    values.append(("search_params", get_search_params(settings).model_dump_json()))
+    return hashlib.sha256(repr(values).encode("utf-8")).hexdigest()[:16]
+
 def get_llm(settings: Settings):
     """Initialize LLM if configured"""
     try:
@@ -163,8 +254,25 @@ def get_llm(settings: Settings):
  
 # ========== Data prep ==========
 
-def load_pdf(file_path : str) -> List[Document]:
-    """Load PDF with suppressed warnings for problematic PDF formatting."""
+# Selectable PDF extraction backends (``Settings.pdf_backend``)
+PDF_LOADERS = {
+    "pdfminer": PDFMinerLoader,
+    "pypdf": PyPDFLoader,
+    "pymupdf": PyMuPDFLoader,
+}
+
+def load_pdf(file_path : str, mode: str = "single", backend: str = "pdfminer") -> List[Document]:
+    """
+    Load PDF with suppressed warnings for problematic PDF formatting.
+
+    Args:
+        file_path (str): PDF file to parse
+        mode (str): ``"single"`` for one document per file or ``"page"`` for
+            one document per page (with a ``page`` metadata entry)
+        backend (str): Extraction backend, one of ``PDF_LOADERS``
+    """
+    if backend not in PDF_LOADERS:
+        raise ValueError(f"Unknown PDF backend '{backend}'. Available: {', '.join(PDF_LOADERS)}")
     import warnings
     import logging
     
@@ -180,7 +288,7 @@ def load_pdf(file_path : str) -> List[Document]:
     documents: List[Document] = []
     
     try:
-        loader = PDFMinerLoader(file_path)
+        loader = PDF_LOADERS[backend](file_path, mode=mode)
         docs = loader.load()
         
         for doc in docs:
@@ -192,6 +300,56 @@ def load_pdf(file_path : str) -> List[Document]:
 
     return documents
 
+@traced("ingest.parse")
+def load_pdfs(file_paths: List[str], settings: Settings) -> Dict[str, List[Document]]:
+    """
+    Parse PDFs in parallel, reusing previously extracted text.
+
+    Extracted documents are stored in a ``ParseCache`` keyed by the file's
+    content hash and the backend/mode used, so unchanged PDFs are never parsed twice (e.g. after a
+    crash or a collection rebuild). Cache misses are parsed on a process
+    pool with one file per worker.
+
+    Args:
+        file_paths (List[str]): PDF files to parse
+        settings (Settings): Uses ``state_dir``, ``pdf_workers``, ``pdf_backend`` and ``pdf_mode``
+
+    Returns:
+        Dict[str, List[Document]]: Documents per input path
+    """
+    cache = ParseCache(settings.state_dir)
+    variant = f"{settings.pdf_backend}-{settings.pdf_mode}"
+    hashes = {path: file_sha256(path) for path in file_paths}
+    results: Dict[str, List[Document]] = {}
+    misses: List[str] = []
+    for path in file_paths:
+        cached = cache.get(hashes[path], variant)
+        if cached is None:
+            misses.append(path)
+        else:
+            for doc in cached:
+                doc.metadata["source"] = os.path.basename(path)
+            results[path] = cached
+    if len(file_paths) > len(misses):
+        print(f"📦 Reusing parsed text for {len(file_paths) - len(misses)} PDF files")
+
+    def store(path: str, docs: List[Document]):
+        cache.put(hashes[path], variant, docs)
+        results[path] = docs
+        print(f"📄 Parsed {os.path.basename(path)} ({len(docs)} documents)")
+
+    workers = min(settings.pdf_workers, len(misses))
+    if workers <= 1:
+        for path in misses:
+            store(path, load_pdf(path, mode=settings.pdf_mode, backend=settings.pdf_backend))
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = {pool.submit(load_pdf, path, settings.pdf_mode, settings.pdf_backend): path for path in misses}
+            for future in as_completed(futures):
+                store(futures[future], future.result())
+    return {path: results[path] for path in file_paths}
+
+@traced("ingest.split")
 def split_documents(docs: List[Document], settings: Settings) -> List[Document]:
     """Split docs into chunks"""
     splitter = RecursiveCharacterTextSplitter(
@@ -204,92 +362,339 @@ def split_documents(docs: List[Document], settings: Settings) -> List[Document]:
 # ========== Qdrant ==========
  
 def get_qdrant_client(settings: Settings) -> QdrantClient:
-    """Return Qdrant client"""
-    return QdrantClient(url=settings.qdrant_url, timeout=30)
+    """Return the process-wide Qdrant client for ``settings.qdrant_url`` (REST or gRPC)"""
+    key = ("qdrant", settings.qdrant_url, settings.prefer_grpc, settings.grpc_port)
+    return _CLIENTS.get(key, lambda: QdrantClient(
+        url=settings.qdrant_url,
+        timeout=30,
+        prefer_grpc=settings.prefer_grpc,
+        grpc_port=settings.grpc_port,
+    ))
+
+def collection_exists_cached(client: QdrantClient, settings: Settings) -> bool:
+    """
+    Return whether the collection exists, caching positive answers for
+    ``settings.collection_check_ttl`` seconds to skip the round-trip per query.
+    """
+    key = (settings.qdrant_url, settings.collection)
+    if _COLLECTION_EXISTS.get(key):
+        return True
+    exists = client.collection_exists(settings.collection)
+    if exists:
+        _COLLECTION_EXISTS.set(key, True)
+    return exists
+
+@dataclass
+class VectorLayout:
+    """Vector names of a collection (``None`` = unnamed dense vector / no sparse vector)"""
+    dense: Optional[str] = None
+    sparse: Optional[str] = None
 
+def get_vector_layout(client: QdrantClient, settings: Settings) -> VectorLayout:
+    """
+    Return the vector layout of the collection.
+
+    Collections created before sparse support use a single unnamed dense
+    vector; newer ones use named dense and sparse vectors. The answer is
+    cached like ``collection_exists_cached``.
+    """
+    key = (settings.qdrant_url, settings.collection)
+    layout = _VECTOR_LAYOUTS.get(key)
+    if layout is None:
+        layout = vector_layout_from_info(client.get_collection(settings.collection), settings)
+        _VECTOR_LAYOUTS.set(key, layout)
+    return layout
+
+def vector_layout_from_info(info: Any, settings: Settings) -> VectorLayout:
+    """Build the ``VectorLayout`` described by a ``get_collection`` response"""
+    params = info.config.params
+    named = isinstance(params.vectors, dict) and settings.dense_vector_name in params.vectors
+    sparse = bool(params.sparse_vectors) and settings.sparse_vector_name in params.sparse_vectors
+    return VectorLayout(
+        dense=settings.dense_vector_name if named else None,
+        sparse=settings.sparse_vector_name if sparse else None,
+    )
+
+# Characters per indexed BM25 term in English prose (stopwords, punctuation and
+# single characters are not indexed)
+CHARS_PER_BM25_TERM = 8.0
 
+def effective_bm25_avg_doc_len(settings: Settings) -> float:
+    """``bm25_avg_doc_len``, or the number of BM25 terms of a full ``chunk_size`` chunk."""
+    if settings.bm25_avg_doc_len:
+        return settings.bm25_avg_doc_len
+    return max(1.0, settings.chunk_size / CHARS_PER_BM25_TERM)
+
+def get_sparse_encoder(settings: Settings) -> BM25SparseEncoder:
+    """Return the BM25 encoder configured by ``settings``"""
+    return BM25SparseEncoder(k1=settings.bm25_k1, b=settings.bm25_b, avg_doc_len=effective_bm25_avg_doc_len(settings))
 
 def recreate_collection_for_rag(client: QdrantClient, settings: Settings, vector_size: int):
-    """Create Qdrant collection and indexes only if they don't exist"""
+    """
+    Create Qdrant collection and indexes only if they don't exist.
+
+    With ``settings.use_sparse`` the collection gets a named dense vector and
+    a named BM25 sparse vector whose IDF is computed by Qdrant. HNSW,
+    quantization and on-disk storage follow ``settings.tuning_profile``.
+    """
+    profile = get_tuning_profile(settings.tuning_profile)
+    key = (settings.qdrant_url, settings.collection)
+    _COLLECTION_EXISTS.invalidate(key)
+    _VECTOR_LAYOUTS.invalidate(key)
     if not client.collection_exists(settings.collection):
+        dense = VectorParams(size=vector_size, distance=Distance.COSINE, on_disk=profile.vectors_on_disk)
         client.create_collection(
             collection_name=settings.collection,
-            vectors_config=VectorParams(size=vector_size, distance=Distance.COSINE),
-            hnsw_config=HnswConfigDiff(m=32, ef_construct=256),
-            optimizers_config=OptimizersConfigDiff(default_segment_number=2),
-            quantization_config=ScalarQuantization(
-                scalar=ScalarQuantizationConfig(type=ScalarType.INT8, always_ram=False)
+            vectors_config={settings.dense_vector_name: dense} if settings.use_sparse else dense,
+            sparse_vectors_config=(
+                {settings.sparse_vector_name: SparseVectorParams(index=sparse_index_params(profile), modifier=Modifier.IDF)}
+                if settings.use_sparse else None
             ),
+            **collection_kwargs(profile),
         )
         client.create_payload_index(settings.collection, "text", PayloadSchemaType.TEXT)
         for key in ["doc_id", "source", "title", "lang"]:
             client.create_payload_index(settings.collection, key, PayloadSchemaType.KEYWORD)
     # If collection exists, do nothing (reuse existing collection and indexes)
 
+def apply_tuning_profile(client: QdrantClient, settings: Settings):
+    """
+    Move an existing collection to ``settings.tuning_profile``.
+
+    Qdrant rebuilds indexes and quantized vectors in the background; search
+    keeps working meanwhile.
+    """
+    profile = get_tuning_profile(settings.tuning_profile)
+    layout = get_vector_layout(client, settings)
+    client.update_collection(collection_name=settings.collection, **collection_update_kwargs(profile, layout.dense))
+
+def tuning_profile_drift(client: QdrantClient, settings: Settings) -> List[str]:
+    """Index-time settings where the collection differs from ``settings.tuning_profile`` (see ``profile_drift``)"""
+    profile = get_tuning_profile(settings.tuning_profile)
+    layout = get_vector_layout(client, settings)
+    return profile_drift(profile, client.get_collection(settings.collection), layout.dense)
+
+def get_search_params(settings: Settings) -> SearchParams:
+    """Query-time search parameters (``hnsw_ef``, rescoring) of ``settings.tuning_profile``"""
+    return search_params(get_tuning_profile(settings.tuning_profile))
+
 # ========== Ingest ==========
  
-def build_points(chunks: List[Document], embeds: List[List[float]]) -> List[PointStruct]:
-    """Build Qdrant points"""
+_POINT_ID_NAMESPACE = uuid.UUID("5b0cf2f1-3c2e-4c55-9a53-3b8f0f6e2a61")
+
+def document_id(source: Optional[str]) -> str:
+    """Return the stable ``doc_id`` of a source document"""
+    return str(uuid.uuid5(_POINT_ID_NAMESPACE, f"doc:{source}"))
+
+def point_id(source: Optional[str], chunk_index: int, text: str) -> str:
+    """
+    Return the deterministic Qdrant point ID of a chunk.
+
+    The ID is a UUIDv5 of (source, chunk ordinal, content hash), so the same
+    chunk always maps to the same point and re-upserting it is idempotent.
+    """
+    content_hash = hashlib.sha256(text.encode("utf-8")).hexdigest()
+    return str(uuid.uuid5(_POINT_ID_NAMESPACE, f"{source}:{chunk_index}:{content_hash}"))
+
+def chunk_point_id(chunk: Document, ordinal: int = 0) -> str:
+    """Return the point ID of ``chunk`` (``ordinal`` is used without ``chunk_index`` metadata)"""
+    return point_id(chunk.metadata.get("source"), chunk.metadata.get("chunk_index", ordinal), chunk.page_content)
+
+def build_points(chunks: List[Document], embeds: List[List[float]], ordinals: Optional[List[int]] = None,
+                 layout: Optional[VectorLayout] = None, sparse_encoder: Optional[BM25SparseEncoder] = None) -> List[PointStruct]:
+    """
+    Build Qdrant points.
+
+    Point IDs come from ``chunk_point_id`` and ``doc_id`` defaults to the
+    stable ``document_id`` of the chunk's source.
+
+    Args:
+        ordinals (List[int], optional): Position of each chunk in the whole
+            ingestion; defaults to ``0..len(chunks)-1``
+        layout (VectorLayout, optional): Target vector names; defaults to a
+            single unnamed dense vector
+        sparse_encoder (BM25SparseEncoder, optional): Encoder for the sparse
+            vector when ``layout.sparse`` is set
+    """
+    layout = layout or VectorLayout()
+    if ordinals is None:
+        ordinals = list(range(len(chunks)))
     pts: List[PointStruct] = []
-    for i, (doc, vec) in enumerate(zip(chunks, embeds), start=1):
+    for ordinal, doc, vec in zip(ordinals, chunks, embeds):
+        source = doc.metadata.get("source")
         payload = {
-            "doc_id": doc.metadata.get("id"),
-            "source": doc.metadata.get("source"),
+            "doc_id": doc.metadata.get("id") or document_id(source),
+            "source": source,
             "title": doc.metadata.get("title"),
             "lang": doc.metadata.get("lang", "en"),
             "text": doc.page_content,
-            "chunk_id": i - 1
+            "page": doc.metadata.get("page"),
+            "chunk_id": doc.metadata.get("chunk_index", ordinal)
         }
-        pts.append(PointStruct(id=i, vector=vec, payload=payload))
+        vector: Any = vec
+        if layout.dense:
+            vector = {layout.dense: vec}
+            if layout.sparse:
+                vector[layout.sparse] = sparse_encoder.encode_document(doc.page_content)
+        pts.append(PointStruct(id=chunk_point_id(doc, ordinal), vector=vector, payload=payload))
     return pts
  
-def upsert_chunks(client: QdrantClient, settings: Settings, chunks: List[Document], embeddings: AzureOpenAIEmbeddings):
-    """Embed and upsert chunks with rate limiting"""
-    print(f"Embedding {len(chunks)} chunks...")
-    
-    # Process chunks in smaller batches to avoid rate limits
-    batch_size = 10  # Reduce batch size for rate limiting
-    all_vecs = []
-    
-    for i in range(0, len(chunks), batch_size):
-        batch = chunks[i:i + batch_size]
-        print(f"Processing batch {i//batch_size + 1}/{(len(chunks)-1)//batch_size + 1}")
-        
-        # Use retry logic for embedding
-        def embed_batch():
-            return embeddings.embed_documents([c.page_content for c in batch])
-        
-        batch_vecs = retry_with_backoff(embed_batch, max_retries=5, base_delay=2.0)
-        all_vecs.extend(batch_vecs)
-        
-        # Add small delay between batches
-        if i + batch_size < len(chunks):
-            time.sleep(1.0)
+def existing_point_ids(client: QdrantClient, settings: Settings, ids: List[ExtendedPointId]) -> Set[str]:
+    """Return the subset of ``ids`` already stored in the collection"""
+    found = set()
+    for i in range(0, len(ids), 256):
+        records = client.retrieve(settings.collection, ids=ids[i:i + 256], with_payload=False, with_vectors=False)
+        found.update(str(r.id) for r in records)
+    return found
+ 
+@traced("ingest.upsert")
+def upsert_chunks(client: QdrantClient, settings: Settings, chunks: List[Document], embeddings: Embeddings):
+    """
+    Stream chunks into Qdrant: embed a batch, convert it to points and upsert
+    it while the next batches are being embedded. Chunks whose deterministic
+    point ID is already stored are skipped, so re-running is idempotent.
+
+    Only a bounded number of embedded batches and upsert requests are held
+    at any time, so memory does not grow with the corpus. Stored chunks are
+    recorded in an ``IngestCheckpoint``; an interrupted run resumes from it
+    and the checkpoint is removed once every chunk is stored.
+    """
+    checkpoint = IngestCheckpoint(settings.state_dir, settings.collection)
+    if len(checkpoint) and not client.count(collection_name=settings.collection).count:
+        # The collection was reset since the checkpoint was written
+        checkpoint.clear()
+    keys = [chunk_key(i, c) for i, c in enumerate(chunks)]
+    todo = [i for i, key in enumerate(keys) if key not in checkpoint]
+    if len(todo) < len(chunks):
+        print(f"Resuming ingestion: {len(chunks) - len(todo)} chunks already stored")
+    # Point IDs are content-addressed: chunks already in Qdrant are a no-op
+    stored_ids = existing_point_ids(client, settings, [chunk_point_id(chunks[i], i) for i in todo])
+    if stored_ids:
+        todo = [i for i in todo if chunk_point_id(chunks[i], i) not in stored_ids]
+        print(f"Skipping {len(stored_ids)} chunks already stored with identical content")
+    print(f"Embedding {len(todo)} chunks...")
     
-    points = build_points(chunks, all_vecs)
-    client.upsert(collection_name=settings.collection, points=points, wait=True)
+    scheduler = EmbeddingScheduler.from_settings(embeddings, settings)
+    layout = get_vector_layout(client, settings)
+    sparse_encoder = get_sparse_encoder(settings)
+    texts = [chunks[i].page_content for i in todo]
+    pending: Deque[Tuple[Future, List[str]]] = deque()
+    max_pending = max(1, settings.upsert_parallelism) * 2
+    stored = 0
+
+    def drain(limit: int):
+        nonlocal stored
+        while len(pending) > limit:
+            future, done_keys = pending.popleft()
+            try:
+                future.result()
+            except Exception:
+                # Keep the progress of requests that did succeed before failing
+                for other, other_keys in pending:
+                    if other.exception() is None:
+                        checkpoint.mark_done(other_keys)
+                raise
+            checkpoint.mark_done(done_keys)
+            stored += len(done_keys)
+            count("rag_points_upserted_total", len(done_keys), collection=settings.collection)
+
+    with ThreadPoolExecutor(max_workers=max(1, settings.upsert_parallelism)) as pool:
+        for start, batch_vecs in scheduler.iter_batches(texts):
+            ordinals = todo[start:start + len(batch_vecs)]
+            points = build_points([chunks[i] for i in ordinals], batch_vecs, ordinals=ordinals,
+                                  layout=layout, sparse_encoder=sparse_encoder)
+            for j in range(0, len(points), settings.upsert_batch_size):
+                part = points[j:j + settings.upsert_batch_size]
+                future = pool.submit(client.upsert, collection_name=settings.collection, points=part, wait=True)
+                pending.append((future, [keys[o] for o in ordinals[j:j + settings.upsert_batch_size]]))
+                drain(max_pending)
+            print(f"Embedded {start + len(batch_vecs)}/{len(todo)} chunks, stored {stored}")
+        drain(0)
+    if scheduler.rate_limited:
+        print(f"Rate limited {scheduler.rate_limited} times while embedding")
+    checkpoint.clear()
+ 
+def delete_source_points(client: QdrantClient, settings: Settings, source: str, keep_ids: Optional[List[ExtendedPointId]] = None):
+    """
+    Delete the points whose ``source`` payload equals ``source``.
+
+    Args:
+        keep_ids (List, optional): Point IDs of ``source`` to keep, e.g. the
+            ones just upserted for a re-ingested file
+    """
+    must_not = [HasIdCondition(has_id=list(keep_ids))] if keep_ids else None
+    client.delete(
+        collection_name=settings.collection,
+        points_selector=FilterSelector(
+            filter=Filter(must=[FieldCondition(key="source", match=MatchValue(value=source))], must_not=must_not)
+        ),
+        wait=True,
+    )
  
 # ========== Search ==========
  
-def qdrant_semantic_search(client: QdrantClient, settings: Settings, query: str, embeddings: AzureOpenAIEmbeddings, limit: int, with_vectors: bool = False):
-    """Semantic search in Qdrant with retry logic"""
+@traced("embed.query")
+def embed_query_vector(embeddings: Embeddings, query: str) -> List[float]:
+    """Embed a query with retry logic (one embedding call per search)"""
     def embed_query():
         return embeddings.embed_query(query)
-    
-    qv = retry_with_backoff(embed_query, max_retries=5, base_delay=2.0)
+
+    return retry_with_backoff(embed_query, max_retries=5, base_delay=2.0)
+
+@traced("embed.queries")
+def embed_query_vectors(embeddings: Embeddings, queries: List[str]) -> List[List[float]]:
+    """Embed several queries in a single embedding request, with retry logic"""
+    def embed_queries():
+        return embeddings.embed_documents(queries)
+
+    return retry_with_backoff(embed_queries, max_retries=5, base_delay=2.0)
+
+def dense_vector(point: Any, layout: VectorLayout) -> List[float]:
+    """Return the dense vector of a point fetched with ``with_vectors``"""
+    return point.vector[layout.dense] if layout.dense else point.vector
+
+@traced("search.dense")
+def qdrant_semantic_search(client: QdrantClient, settings: Settings, query: str, embeddings: Embeddings, limit: int, with_vectors: bool = False, query_vector: Optional[List[float]] = None):
+    """
+    Semantic search in Qdrant with retry logic.
+
+    Args:
+        query_vector (List[float], optional): Precomputed query embedding;
+            when given, ``embeddings`` is not called
+    """
+    qv = query_vector if query_vector is not None else embed_query_vector(embeddings, query)
+    layout = get_vector_layout(client, settings)
     res = client.query_points(
         collection_name=settings.collection,
         query=qv,
+        using=layout.dense,
         limit=limit,
         with_payload=True,
-        with_vectors=with_vectors,
-        search_params=SearchParams(hnsw_ef=256, exact=False),
+        with_vectors=[layout.dense] if with_vectors and layout.dense else with_vectors,
+        search_params=get_search_params(settings),
     )
     return res.points
  
-def qdrant_text_prefilter_ids(client: QdrantClient, settings: Settings, query: str, max_hits: int) -> List[int]:
+@traced("search.sparse")
+def qdrant_sparse_search_ids(client: QdrantClient, settings: Settings, query: str, limit: int) -> List[ExtendedPointId]:
+    """Return ids of the best BM25 matches (one request, no pagination)"""
+    sparse_query = get_sparse_encoder(settings).encode_query(query)
+    if not sparse_query.indices:
+        return []
+    res = client.query_points(
+        collection_name=settings.collection,
+        query=sparse_query,
+        using=get_vector_layout(client, settings).sparse,
+        limit=limit,
+        with_payload=False,
+        with_vectors=False,
+    )
+    return [p.id for p in res.points]
+ 
+@traced("search.scroll")
+def qdrant_text_prefilter_ids(client: QdrantClient, settings: Settings, query: str, max_hits: int) -> List[ExtendedPointId]:
     """Return ids matching text filter"""
-    matched_ids: List[int] = []
+    matched_ids: List[ExtendedPointId] = []
     next_page = None
     while True:
         points, next_page = client.scroll(
@@ -305,63 +710,249 @@ def qdrant_text_prefilter_ids(client: QdrantClient, settings: Settings, query: s
             break
     return matched_ids
  
+def _normalize_rows(M: np.ndarray) -> np.ndarray:
+    """L2-normalize the last axis of ``M`` (zero vectors stay zero)."""
+    return M / (np.linalg.norm(M, axis=-1, keepdims=True) + 1e-12)
+
+@traced("mmr")
 def mmr_select(query_vec: List[float], candidates_vecs: List[List[float]], k: int, lambda_mult: float) -> List[int]:
-    """Select diverse results with MMR"""
-    import numpy as np
-    V = np.array(candidates_vecs, dtype=float)
-    q = np.array(query_vec, dtype=float)
-    def cos(a, b):
-        na = (a @ a) ** 0.5 + 1e-12
-        nb = (b @ b) ** 0.5 + 1e-12
-        return float((a @ b) / (na * nb))
-    sims = [cos(v, q) for v in V]
+    """
+    Select diverse results with Maximal Marginal Relevance.
+
+    Candidates are normalized once, query relevance is a single matrix-vector
+    product and the max-similarity-to-selected vector is updated incrementally
+    with one row of dot products per pick, so the cost is O(k * N * d).
+
+    Args:
+        query_vec (List[float]): Query embedding
+        candidates_vecs (List[List[float]]): Candidate embeddings
+        k (int): Number of candidates to select
+        lambda_mult (float): Relevance/diversity balance (1.0 = relevance only)
+
+    Returns:
+        List[int]: Indexes of the selected candidates, in selection order
+    """
+    V = np.asarray(candidates_vecs, dtype=float)
+    n = len(V)
+    k = min(k, n)
+    if k <= 0:
+        return []
+    V = _normalize_rows(V.reshape(n, -1))
+    q = _normalize_rows(np.asarray(query_vec, dtype=float))
+    sims = V @ q
+    max_div = np.full(n, -np.inf)
+    available = np.ones(n, dtype=bool)
     selected: List[int] = []
-    remaining = set(range(len(V)))
-    while len(selected) < min(k, len(V)):
-        if not selected:
-            best = max(remaining, key=lambda i: sims[i])
-            selected.append(best)
-            remaining.remove(best)
-            continue
-        best_idx = None
-        best_score = -1e9
-        for i in remaining:
-            max_div = max([cos(V[i], V[j]) for j in selected]) if selected else 0.0
-            score = lambda_mult * sims[i] - (1 - lambda_mult) * max_div
-            if score > best_score:
-                best_score = score
-                best_idx = i
-        selected.append(best_idx)
-        remaining.remove(best_idx)
+    for step in range(k):
+        if step == 0:
+            scores = sims.copy()
+        else:
+            scores = lambda_mult * sims - (1 - lambda_mult) * max_div
+        scores[~available] = -np.inf
+        best = int(np.argmax(scores))
+        selected.append(best)
+        available[best] = False
+        np.maximum(max_div, V @ V[best], out=max_div)
     return selected
+
+@traced("mmr.batch")
+def mmr_select_batch(query_vecs: List[List[float]], candidates_vecs: List[List[List[float]]], k: int, lambda_mult: float) -> List[List[int]]:
+    """
+    Run MMR for several queries at once.
+
+    Candidate lists are padded into a single (Q, N, d) tensor so every
+    selection step is vectorized across all queries.
+
+    Args:
+        query_vecs (List[List[float]]): One embedding per query
+        candidates_vecs (List[List[List[float]]]): Candidate embeddings per query
+        k (int): Number of candidates to select per query
+        lambda_mult (float): Relevance/diversity balance (1.0 = relevance only)
+
+    Returns:
+        List[List[int]]: Selected indexes per query, in selection order
+    """
+    if len(query_vecs) != len(candidates_vecs):
+        raise ValueError("query_vecs and candidates_vecs must have the same length")
+    nq = len(query_vecs)
+    if nq == 0:
+        return []
+    sizes = np.array([len(c) for c in candidates_vecs], dtype=int)
+    n_max = int(sizes.max())
+    if n_max == 0 or k <= 0:
+        return [[] for _ in range(nq)]
+    dim = len(query_vecs[0])
+    V = np.zeros((nq, n_max, dim), dtype=float)
+    for i, cands in enumerate(candidates_vecs):
+        if len(cands):
+            V[i, :len(cands)] = cands
+    V = _normalize_rows(V)
+    Q = _normalize_rows(np.asarray(query_vecs, dtype=float))
+    sims = np.einsum("qnd,qd->qn", V, Q)
+    available = np.arange(n_max)[None, :] < sizes[:, None]
+    max_div = np.full((nq, n_max), -np.inf)
+    rows = np.arange(nq)
+    picks = np.full((nq, min(k, n_max)), -1, dtype=int)
+    for step in range(picks.shape[1]):
+        if step == 0:
+            scores = sims.copy()
+        else:
+            scores = lambda_mult * sims - (1 - lambda_mult) * max_div
+        scores[~available] = -np.inf
+        best = np.argmax(scores, axis=1)
+        active = available[rows, best]
+        picks[active, step] = best[active]
+        available[rows, best] = False
+        np.maximum(max_div, np.einsum("qnd,qd->qn", V, V[rows, best]), out=max_div)
+    return [[int(i) for i in row if i >= 0] for row in picks]
  
-def hybrid_search(client: QdrantClient, settings: Settings, query: str, embeddings: AzureOpenAIEmbeddings):
-    """Hybrid search with semantic + text + MMR"""
-    sem = qdrant_semantic_search(client, settings, query, embeddings, limit=settings.top_n_semantic, with_vectors=True)
+@traced("fusion.client")
+def client_side_fusion(client: QdrantClient, settings: Settings, query: str, query_vector: List[float]) -> List[Any]:
+    """
+    Fuse dense and text results in Python (fallback hybrid mode).
+
+    Runs a dense search plus a lexical search (BM25 sparse vectors when the
+    collection has them, otherwise a paginated ``MatchText`` scroll) and
+    boosts the dense candidates that also match lexically.
+
+    Returns:
+        List of points (with vectors) sorted by fused score
+    """
+    sem = qdrant_semantic_search(client, settings, query, None, limit=settings.top_n_semantic, with_vectors=True, query_vector=query_vector)
     if not sem: return []
-    text_ids = set(qdrant_text_prefilter_ids(client, settings, query, settings.top_n_text))
+    if get_vector_layout(client, settings).sparse:
+        text_ids = set(qdrant_sparse_search_ids(client, settings, query, settings.top_n_text))
+    else:
+        text_ids = set(qdrant_text_prefilter_ids(client, settings, query, settings.top_n_text))
+    return boost_fuse(settings, sem, text_ids)
+
+def boost_fuse(settings: Settings, sem: List[Any], text_ids: Set[ExtendedPointId]) -> List[Any]:
+    """Sort dense hits by ``alpha * normalized score``, plus ``text_boost`` for lexical matches"""
     scores = [p.score for p in sem]
     smin, smax = min(scores), max(scores)
     def norm(x): return 1.0 if smax == smin else (x - smin) / (smax - smin)
-    fused: List[Tuple[int, float, Any]] = []
-    for idx, p in enumerate(sem):
-        base = norm(p.score)
-        fuse = settings.alpha * base
+    fused: List[Tuple[float, Any]] = []
+    for p in sem:
+        fuse = settings.alpha * norm(p.score)
         if p.id in text_ids:
             fuse += settings.text_boost
-        fused.append((idx, fuse, p))
-    fused.sort(key=lambda t: t[1], reverse=True)
+        fused.append((fuse, p))
+    fused.sort(key=lambda t: t[0], reverse=True)
+    return [p for _, p in fused]
+
+def fusion_request(settings: Settings, layout: VectorLayout, query: str, query_vector: List[float]) -> QueryRequest:
+    """
+    Build the Query API request fusing dense and lexical results in Qdrant.
+
+    The request prefetches the dense candidates and the lexical candidates,
+    and fuses both lists server-side with RRF or DBSF (``settings.fusion``).
+    The lexical branch is a BM25 sparse search when the collection has sparse
+    vectors, so terms outside the dense top-N can surface; otherwise it is
+    the dense search restricted by the full-text filter.
+    """
+    params = get_search_params(settings)
+    prefetch = [Prefetch(query=query_vector, using=layout.dense, limit=settings.top_n_semantic, params=params)]
+    if layout.sparse:
+        sparse_query = get_sparse_encoder(settings).encode_query(query)
+        if sparse_query.indices:
+            prefetch.append(Prefetch(query=sparse_query, using=layout.sparse, limit=settings.top_n_text))
+    else:
+        text_filter = Filter(must=[FieldCondition(key="text", match=MatchText(text=query))])
+        prefetch.append(Prefetch(query=query_vector, using=layout.dense, filter=text_filter, limit=settings.top_n_text, params=params))
+    return QueryRequest(
+        prefetch=prefetch,
+        query=FusionQuery(fusion=Fusion(settings.fusion)),
+        limit=settings.top_n_semantic,
+        with_payload=True,
+        with_vector=[layout.dense] if layout.dense else True,
+    )
+
+@traced("fusion.server")
+def server_side_fusion(client: QdrantClient, settings: Settings, query: str, query_vector: List[float]) -> List[Any]:
+    """
+    Fuse dense and lexical results inside Qdrant with a single Query API call.
+
+    Returns:
+        List of points (with vectors) sorted by fused score
+    """
+    request = fusion_request(settings, get_vector_layout(client, settings), query, query_vector)
+    return client.query_batch_points(collection_name=settings.collection, requests=[request])[0].points
+
+@traced("hybrid_search")
+def hybrid_search(client: QdrantClient, settings: Settings, query: str, embeddings: Embeddings, query_vector: Optional[List[float]] = None):
+    """
+    Hybrid search with semantic + text + MMR.
+
+    The query is embedded at most once and the same vector is reused by the
+    semantic and MMR stages. With ``settings.hybrid_mode == "server"`` the
+    fusion runs in Qdrant in one round-trip; if the server rejects the
+    request the client-side fusion is used instead.
+
+    Args:
+        query_vector (List[float], optional): Precomputed query embedding;
+            when given, no embedding call is made
+    """
+    qv = query_vector if query_vector is not None else embed_query_vector(embeddings, query)
+    fused = None
+    if settings.hybrid_mode == "server":
+        try:
+            fused = server_side_fusion(client, settings, query, qv)
+        except Exception as e:
+            print(f"Server-side fusion failed ({e}), falling back to client-side fusion")
+    if fused is None:
+        fused = client_side_fusion(client, settings, query, qv)
+    return mmr_rerank(settings, get_vector_layout(client, settings), qv, fused)
+
+def mmr_rerank(settings: Settings, layout: VectorLayout, query_vector: List[float], fused: List[Any]) -> List[Any]:
+    """Pick the final ``settings.final_k`` hits of a fused list (MMR over its head if enabled)"""
+    if not fused: return []
     if settings.use_mmr:
-        def embed_mmr_query():
-            return embeddings.embed_query(query)
-        
-        qv = retry_with_backoff(embed_mmr_query, max_retries=5, base_delay=2.0)
         N = min(len(fused), max(settings.final_k * 5, settings.final_k))
         cut = fused[:N]
-        vecs = [sem[i].vector for i, _, _ in cut]
-        mmr_idx = mmr_select(qv, vecs, settings.final_k, settings.mmr_lambda)
-        return [cut[i][2] for i in mmr_idx]
-    return [p for _, _, p in fused[:settings.final_k]]
+        mmr_idx = mmr_select(query_vector, [dense_vector(p, layout) for p in cut], settings.final_k, settings.mmr_lambda)
+        return [cut[i] for i in mmr_idx]
+    return fused[:settings.final_k]
+
+@traced("hybrid_search.batch")
+def hybrid_search_batch(client: QdrantClient, settings: Settings, queries: List[str], embeddings: Embeddings,
+                        query_vectors: Optional[List[List[float]]] = None, limit: Optional[int] = None) -> List[List[Any]]:
+    """
+    Hybrid search for several queries in one embedding request and one Qdrant round-trip.
+
+    All queries are embedded together, every fusion request is sent in a
+    single ``query_batch_points`` call and MMR runs vectorized across the
+    queries with ``mmr_select_batch``. If the server rejects the batch, each
+    query falls back to the client-side fusion.
+
+    Args:
+        query_vectors (List[List[float]], optional): Precomputed query embeddings
+        limit (int, optional): Results ranked per query; defaults to
+            ``settings.final_k``, larger values give callers spare hits
+
+    Returns:
+        List[List[Any]]: Ranked points per query, in the order of ``queries``
+    """
+    if not queries:
+        return []
+    qvs = query_vectors if query_vectors is not None else embed_query_vectors(embeddings, queries)
+    limit = limit or settings.final_k
+    fused = None
+    if settings.hybrid_mode == "server":
+        try:
+            layout = get_vector_layout(client, settings)
+            requests = [fusion_request(settings, layout, q, qv) for q, qv in zip(queries, qvs)]
+            fused = [r.points for r in client.query_batch_points(collection_name=settings.collection, requests=requests)]
+        except Exception as e:
+            print(f"Server-side fusion failed ({e}), falling back to client-side fusion")
+    if fused is None:
+        fused = [client_side_fusion(client, settings, q, qv) for q, qv in zip(queries, qvs)]
+    if not settings.use_mmr:
+        return [points[:limit] for points in fused]
+    layout = get_vector_layout(client, settings)
+    N = max(settings.final_k * 5, limit)
+    cuts = [points[:N] for points in fused]
+    picks = mmr_select_batch(qvs, [[dense_vector(p, layout) for p in cut] for cut in cuts], limit, settings.mmr_lambda)
+    return [[cut[i] for i in idx] for cut, idx in zip(cuts, picks)]
  
 # ========== Prompt/Chain ==========
  
@@ -394,7 +985,12 @@ def build_rag_chain(llm):
  
 # ========== Main ==========
  
-def search_rag_with_collection(q, k, provider=None, certification=None):
+def format_search_result(hit: Any) -> str:
+    """Format a hit as returned to agents by the RAG tool"""
+    return f"Source: {hit.payload.get('source', 'Unknown')}\nContent: {hit.payload.get('text', '')}"
+
+
+def search_rag_with_collection(q, k, provider=None, certification=None, query_vector=None):
     """
     RAG search with support for specific provider/certification collections.
     
@@ -403,6 +999,7 @@ def search_rag_with_collection(q, k, provider=None, certification=None):
         k (int): Number of results to return
         provider (str, optional): Provider name for collection selection
         certification (str, optional): Certification name for collection selection
+        query_vector (List[float], optional): Precomputed embedding of ``q``
         
     Returns:
         List of documents from hybrid search
@@ -421,23 +1018,111 @@ def search_rag_with_collection(q, k, provider=None, certification=None):
     embeddings = get_embeddings(s)
     client = get_qdrant_client(s)
     
-    # Check if collection exists
-    if not client.collection_exists(s.collection):
+    # Check if collection exists (cached for collection_check_ttl seconds)
+    if not collection_exists_cached(client, s):
         print(f"❌ Collection '{s.collection}' not found. Please initialize the database first.")
         return []
     
+    cache = get_result_cache(s) if s.use_result_cache else None
+    if cache is not None:
+        fingerprint = settings_fingerprint(s)
+        cached = cache.get(s.collection, q, k, fingerprint)
+        if cached is not None:
+            print("♻️ Reusing cached retrieval results")
+            return cached
+        if s.semantic_cache:
+            if query_vector is None:
+                query_vector = embed_query_vector(embeddings, q)
+            cached = cache.get_similar(s.collection, query_vector, k, fingerprint, s.semantic_cache_threshold)
+            if cached is not None:
+                print("♻️ Reusing cached retrieval results of a similar query")
+                return cached
+        cache.record_miss()
+    
     # Perform hybrid search
-    hits = hybrid_search(client, s, q, embeddings)
+    hits = hybrid_search(client, s, q, embeddings, query_vector=query_vector)
     
-    results = []
-    for hit in hits:
-        source = hit.payload.get("source", "Unknown")
-        content = hit.payload.get("text", "")
-        results.append(f"Source: {source}\nContent: {content}")
+    results = [format_search_result(hit) for hit in hits]
+    
+    if cache is not None:
+        cache.put(s.collection, q, k, fingerprint, results,
+                  query_vector=query_vector if s.semantic_cache else None)
     
     return results
 
 
+def search_rag_batch(queries: List[str], k: int, provider=None, certification=None) -> List[List[str]]:
+    """
+    RAG search for several related questions at once.
+
+    Queries answered by the result cache are served from it; the others are
+    embedded in one request and searched in one Qdrant round-trip with
+    ``hybrid_search_batch``. Chunks already returned for an earlier query are
+    not repeated: later queries are topped up with their next best hits, from
+    ``2 * k`` ranked candidates (also what the result cache stores).
+    
+    Args:
+        queries (List[str]): Query strings
+        k (int): Number of results to return per query
+        provider (str, optional): Provider name for collection selection
+        certification (str, optional): Certification name for collection selection
+        
+    Returns:
+        List[List[str]]: Documents per query, in the order of ``queries``
+    """
+    print(f"--------- Starting batched RAG Search: {len(queries)} queries (Collection: {provider}_{certification}) -----------")
+    
+    if provider and certification:
+        s = get_settings_for_certification(provider, certification)
+    else:
+        s = Settings()
+    print(f"🗄️ Using collection: {s.collection}")
+    
+    s.final_k = k
+    embeddings = get_embeddings(s)
+    client = get_qdrant_client(s)
+    
+    if not collection_exists_cached(client, s):
+        print(f"❌ Collection '{s.collection}' not found. Please initialize the database first.")
+        return [[] for _ in queries]
+    
+    # Ranked candidates per query, ``depth`` deep to replace duplicates. Cache entries
+    # hold the full list (keyed on ``depth``), so warm and cold calls top up alike.
+    depth = k * 2
+    ranked: List[Optional[List[str]]] = [None] * len(queries)
+    cache = get_result_cache(s) if s.use_result_cache else None
+    if cache is not None:
+        fingerprint = settings_fingerprint(s)
+        ranked = [cache.get(s.collection, q, depth, fingerprint) for q in queries]
+    todo = [i for i, r in enumerate(ranked) if r is None]
+    
+    if todo:
+        qvs = embed_query_vectors(embeddings, [queries[i] for i in todo])
+        if cache is not None and s.semantic_cache:
+            for i, qv in zip(todo, qvs):
+                ranked[i] = cache.get_similar(s.collection, qv, depth, fingerprint, s.semantic_cache_threshold)
+            qvs = [qv for i, qv in zip(todo, qvs) if ranked[i] is None]
+            todo = [i for i in todo if ranked[i] is None]
+    if todo:
+        print(f"🔎 Searching {len(todo)} queries ({len(queries) - len(todo)} served from cache)")
+        hits = hybrid_search_batch(client, s, [queries[i] for i in todo], embeddings, query_vectors=qvs, limit=depth)
+        for i, qv, points in zip(todo, qvs, hits):
+            ranked[i] = [format_search_result(p) for p in points]
+            if cache is not None:
+                cache.record_miss()
+                cache.put(s.collection, queries[i], depth, fingerprint, ranked[i],
+                          query_vector=qv if s.semantic_cache else None)
+    
+    # Deduplicate across queries, in query order
+    seen: Set[str] = set()
+    results = []
+    for candidates in ranked:
+        fresh = [doc for doc in candidates if doc not in seen][:k]
+        seen.update(fresh)
+        results.append(fresh)
+    return results
+
+
 # Legacy function for backward compatibility
 def search_rag(q, k):
     """Demo full RAG pipeline (legacy version)"""
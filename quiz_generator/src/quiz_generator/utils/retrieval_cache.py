@@ -0,0 +1,196 @@
+"""
+Persistent cache of RAG retrieval results.
+
+Results are stored in a local SQLite database keyed by
+(collection, normalized query, k, settings hash), expire after a TTL and are
+bounded by an LRU policy on the last access time. In semantic mode the query
+embedding is stored too, so a new query whose embedding is close enough to a
+cached one (cosine similarity above a threshold) reuses its results.
+Entries of a collection are dropped whenever the collection changes.
+"""
+
+from __future__ import annotations
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from array import array
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from . import instrumentation
+
+
+def normalize_query(query: str) -> str:
+    """Lowercase ``query``, collapse whitespace and strip trailing punctuation."""
+    return " ".join(query.lower().split()).rstrip("?!.;: ")
+
+
+def result_key(collection: str, query: str, k: int, settings_hash: str) -> str:
+    """Return the cache key of a retrieval."""
+    raw = f"{collection}\0{normalize_query(query)}\0{k}\0{settings_hash}"
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+class RetrievalCache:
+    """
+    TTL and size-bounded, multi-process safe store of retrieval results.
+
+    Args:
+        path (str): SQLite database file
+        ttl (float): Seconds a result stays valid
+        max_entries (int): Maximum number of results kept; the least recently
+            used entries are evicted beyond this size
+        timeout (float): Seconds to wait on a locked database
+    """
+
+    def __init__(self, path: str, ttl: float = 86_400.0, max_entries: int = 10_000, timeout: float = 30.0):
+        self.path = path
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.timeout = timeout
+        self.hits = 0
+        self.semantic_hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        with self._connect() as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS results ("
+                " key TEXT PRIMARY KEY,"
+                " collection TEXT NOT NULL,"
+                " k INTEGER NOT NULL,"
+                " settings_hash TEXT NOT NULL,"
+                " query_vector BLOB,"
+                " results TEXT NOT NULL,"
+                " created REAL NOT NULL,"
+                " last_access REAL NOT NULL)"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_results_scope ON results(collection, k, settings_hash)")
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_results_last_access ON results(last_access)")
+
+    def _connect(self) -> sqlite3.Connection:
+        """Return a connection owned by the current thread and process."""
+        conn = getattr(self._local, "conn", None)
+        if conn is None or getattr(self._local, "pid", None) != os.getpid():
+            conn = sqlite3.connect(self.path, timeout=self.timeout, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+            self._local.pid = os.getpid()
+        return conn
+
+    def _count(self, hits: int = 0, semantic_hits: int = 0, misses: int = 0):
+        with self._lock:
+            self.hits += hits
+            self.semantic_hits += semantic_hits
+            self.misses += misses
+        if hits or semantic_hits:
+            instrumentation.count("rag_result_cache_hits_total", hits + semantic_hits,
+                                  kind="exact" if hits else "semantic")
+        if misses:
+            instrumentation.count("rag_result_cache_misses_total", misses)
+
+    def _touch(self, key: str, results: str) -> List[str]:
+        self._connect().execute("UPDATE results SET last_access = ? WHERE key = ?", (time.time(), key))
+        return json.loads(results)
+
+    def get(self, collection: str, query: str, k: int, settings_hash: str) -> Optional[List[str]]:
+        """Return the cached results of an identical (normalized) query, or ``None``."""
+        key = result_key(collection, query, k, settings_hash)
+        row = self._connect().execute(
+            "SELECT results FROM results WHERE key = ? AND created >= ?", (key, time.time() - self.ttl)
+        ).fetchone()
+        if row is None:
+            return None
+        self._count(hits=1)
+        return self._touch(key, row[0])
+
+    def get_similar(self, collection: str, query_vector: List[float], k: int, settings_hash: str,
+                    threshold: float) -> Optional[List[str]]:
+        """
+        Return the results of the most similar cached query, or ``None``.
+
+        Args:
+            query_vector (List[float]): Embedding of the new query
+            threshold (float): Minimum cosine similarity to reuse a result
+        """
+        rows = self._connect().execute(
+            "SELECT key, query_vector, results FROM results"
+            " WHERE collection = ? AND k = ? AND settings_hash = ? AND query_vector IS NOT NULL AND created >= ?",
+            (collection, k, settings_hash, time.time() - self.ttl),
+        ).fetchall()
+        if not rows:
+            return None
+        matrix = np.stack([np.frombuffer(blob, dtype=np.float32) for _, blob, _ in rows])
+        q = np.asarray(query_vector, dtype=np.float32)
+        sims = matrix @ q / (np.linalg.norm(matrix, axis=1) * np.linalg.norm(q) + 1e-12)
+        best = int(np.argmax(sims))
+        if sims[best] < threshold:
+            return None
+        self._count(semantic_hits=1)
+        return self._touch(rows[best][0], rows[best][2])
+
+    def put(self, collection: str, query: str, k: int, settings_hash: str, results: List[str],
+            query_vector: Optional[List[float]] = None):
+        """Store the results of a query and evict expired and least recently used entries."""
+        now = time.time()
+        blob = array("f", query_vector).tobytes() if query_vector is not None else None
+        conn = self._connect()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            conn.execute(
+                "INSERT OR REPLACE INTO results"
+                " (key, collection, k, settings_hash, query_vector, results, created, last_access)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (result_key(collection, query, k, settings_hash), collection, k, settings_hash,
+                 blob, json.dumps(results), now, now),
+            )
+            conn.execute("DELETE FROM results WHERE created < ?", (now - self.ttl,))
+            count = conn.execute("SELECT COUNT(*) FROM results").fetchone()[0]
+            if count > self.max_entries:
+                conn.execute(
+                    "DELETE FROM results WHERE key IN (SELECT key FROM results ORDER BY last_access LIMIT ?)",
+                    (count - self.max_entries,),
+                )
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+
+    def record_miss(self):
+        """Count a lookup that had to query Qdrant."""
+        self._count(misses=1)
+
+    def invalidate(self, collection: Optional[str] = None):
+        """Drop every result of ``collection`` (or of every collection)."""
+        if collection is None:
+            self._connect().execute("DELETE FROM results")
+        else:
+            self._connect().execute("DELETE FROM results WHERE collection = ?", (collection,))
+
+    def __len__(self) -> int:
+        return self._connect().execute("SELECT COUNT(*) FROM results").fetchone()[0]
+
+    def stats(self) -> Dict[str, int]:
+        """Return hit/miss counters and the current cache size."""
+        return {"hits": self.hits, "semantic_hits": self.semantic_hits, "misses": self.misses, "entries": len(self)}
+
+
+_CACHES: Dict[str, RetrievalCache] = {}
+_CACHES_LOCK = threading.Lock()
+
+
+def get_retrieval_cache(path: str, ttl: float = 86_400.0, max_entries: int = 10_000) -> RetrievalCache:
+    """Return the process-wide ``RetrievalCache`` for ``path``."""
+    key = os.path.abspath(path)
+    with _CACHES_LOCK:
+        cache = _CACHES.get(key)
+        if cache is None:
+            cache = RetrievalCache(path, ttl=ttl, max_entries=max_entries)
+            _CACHES[key] = cache
+        return cache
@@ -0,0 +1,64 @@
+"""
+Local BM25 sparse encoder for Qdrant sparse vectors.
+
+Documents are encoded with the BM25 term-frequency component; the IDF
+component is applied by Qdrant itself through the ``Modifier.IDF`` setting of
+the sparse vector, so collection statistics never have to be computed
+locally. Terms are mapped to indices with a stable 32-bit hash, which keeps
+the encoder stateless and identical across processes and runs.
+"""
+
+from __future__ import annotations
+import re
+import zlib
+from collections import Counter
+from typing import List
+
+from qdrant_client.models import SparseVector
+
+_TOKEN = re.compile(r"\w+", re.UNICODE)
+
+STOPWORDS = frozenset("""
+a an and are as at be but by for from has have in into is it its of on or that the their then there
+these this to was were which will with you your can may not than so such if do does what when where who how
+""".split())
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercase word tokens without stopwords and single characters."""
+    return [t for t in _TOKEN.findall(text.lower()) if len(t) > 1 and t not in STOPWORDS]
+
+
+def term_index(term: str) -> int:
+    """Stable sparse index of ``term``."""
+    return zlib.crc32(term.encode("utf-8")) & 0x7FFFFFFF
+
+
+class BM25SparseEncoder:
+    """
+    Encode texts into BM25-weighted sparse vectors.
+
+    Args:
+        k1 (float): Term frequency saturation
+        b (float): Document length normalization strength
+        avg_doc_len (float): Expected document length in tokens
+    """
+
+    def __init__(self, k1: float = 1.2, b: float = 0.75, avg_doc_len: float = 300.0):
+        self.k1 = k1
+        self.b = b
+        self.avg_doc_len = avg_doc_len
+
+    def encode_document(self, text: str) -> SparseVector:
+        """Return the BM25 term-frequency weights of a document."""
+        tokens = tokenize(text)
+        counts = Counter(term_index(t) for t in tokens)
+        norm = self.k1 * (1 - self.b + self.b * len(tokens) / self.avg_doc_len)
+        indices = sorted(counts)
+        values = [counts[i] * (self.k1 + 1) / (counts[i] + norm) for i in indices]
+        return SparseVector(indices=indices, values=values)
+
+    def encode_query(self, text: str) -> SparseVector:
+        """Return a query vector with unit weight per distinct term."""
+        indices = sorted({term_index(t) for t in tokenize(text)})
+        return SparseVector(indices=indices, values=[1.0] * len(indices))
@@ -0,0 +1,178 @@
+"""
+Named Qdrant tuning profiles for RAG collections.
+
+A profile bundles the index-time choices (HNSW graph, quantization, what
+lives on disk) with the matching query-time parameters (``hnsw_ef``,
+rescoring with oversampling). ``Settings.tuning_profile`` selects one, so
+each certification can trade memory for latency or recall.
+
+Index-time settings apply when a collection is created (or through
+``collection_update_kwargs`` for an existing one); query-time settings apply
+to every search.
+"""
+
+from __future__ import annotations
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional
+
+from qdrant_client.models import (
+    BinaryQuantization,
+    BinaryQuantizationConfig,
+    CollectionParamsDiff,
+    CompressionRatio,
+    Disabled,
+    HnswConfigDiff,
+    OptimizersConfigDiff,
+    ProductQuantization,
+    ProductQuantizationConfig,
+    QuantizationSearchParams,
+    ScalarQuantization,
+    ScalarQuantizationConfig,
+    ScalarType,
+    SearchParams,
+    SparseIndexParams,
+    VectorParamsDiff,
+)
+
+
+@dataclass(frozen=True)
+class TuningProfile:
+    """Index and query parameters of a collection"""
+    hnsw_m: int = 32                           # HNSW edges per node
+    hnsw_ef_construct: int = 256               # HNSW build-time candidate list
+    hnsw_on_disk: bool = False                 # Keep the HNSW graph on disk (mmap)
+    default_segment_number: int = 2            # Segments (parallelism of a single search)
+    quantization: Optional[str] = "scalar"     # "scalar", "binary", "product" or None
+    quantization_always_ram: bool = False      # Pin quantized vectors in RAM
+    product_compression: str = "x16"           # Product quantization ratio: "x4" ... "x64"
+    vectors_on_disk: bool = False              # Keep original vectors on disk (mmap)
+    payload_on_disk: bool = False              # Keep payloads on disk
+    sparse_on_disk: bool = False               # Keep the sparse index on disk
+    hnsw_ef: int = 256                         # Search-time candidate list
+    rescore: Optional[bool] = None             # Rescore quantized hits with original vectors (None = server default)
+    oversampling: Optional[float] = None       # Quantized candidates fetched per result before rescoring
+
+
+TUNING_PROFILES: Dict[str, TuningProfile] = {
+    # Configuration used before profiles existed
+    "balanced": TuningProfile(),
+    # Everything hot in RAM, small graph and ef: fastest queries
+    "low-latency": TuningProfile(
+        hnsw_m=16, hnsw_ef_construct=128, default_segment_number=4,
+        quantization="scalar", quantization_always_ram=True,
+        hnsw_ef=64, rescore=False,
+    ),
+    # 1-bit vectors in RAM, originals/graph/payload on disk, rescored
+    "low-memory": TuningProfile(
+        hnsw_m=16, hnsw_ef_construct=128, hnsw_on_disk=True,
+        quantization="binary", quantization_always_ram=True,
+        vectors_on_disk=True, payload_on_disk=True, sparse_on_disk=True,
+        hnsw_ef=128, rescore=True, oversampling=3.0,
+    ),
+    # Dense graph, full-precision vectors, wide search
+    "high-recall": TuningProfile(
+        hnsw_m=48, hnsw_ef_construct=512,
+        quantization=None,
+        hnsw_ef=512,
+    ),
+}
+
+
+def get_tuning_profile(name: str) -> TuningProfile:
+    """Return the profile called ``name``."""
+    try:
+        return TUNING_PROFILES[name]
+    except KeyError:
+        raise ValueError(f"Unknown tuning profile '{name}'. Choose from: {', '.join(TUNING_PROFILES)}") from None
+
+
+def quantization_config(profile: TuningProfile) -> Any:
+    """Return the Qdrant quantization config of ``profile`` (``None`` = no quantization)."""
+    if profile.quantization is None:
+        return None
+    if profile.quantization == "scalar":
+        return ScalarQuantization(
+            scalar=ScalarQuantizationConfig(type=ScalarType.INT8, always_ram=profile.quantization_always_ram)
+        )
+    if profile.quantization == "binary":
+        return BinaryQuantization(binary=BinaryQuantizationConfig(always_ram=profile.quantization_always_ram))
+    if profile.quantization == "product":
+        return ProductQuantization(product=ProductQuantizationConfig(
+            compression=CompressionRatio(profile.product_compression), always_ram=profile.quantization_always_ram
+        ))
+    raise ValueError(f"Unknown quantization '{profile.quantization}'. Choose from: scalar, binary, product")
+
+
+def hnsw_config(profile: TuningProfile) -> HnswConfigDiff:
+    """Return the HNSW config of ``profile``."""
+    return HnswConfigDiff(m=profile.hnsw_m, ef_construct=profile.hnsw_ef_construct, on_disk=profile.hnsw_on_disk)
+
+
+def collection_kwargs(profile: TuningProfile) -> Dict[str, Any]:
+    """Collection-level ``create_collection`` arguments of ``profile``."""
+    return {
+        "hnsw_config": hnsw_config(profile),
+        "optimizers_config": OptimizersConfigDiff(default_segment_number=profile.default_segment_number),
+        "quantization_config": quantization_config(profile),
+        "on_disk_payload": profile.payload_on_disk,
+    }
+
+
+def sparse_index_params(profile: TuningProfile) -> SparseIndexParams:
+    """Sparse index parameters of ``profile``."""
+    return SparseIndexParams(on_disk=profile.sparse_on_disk)
+
+
+def collection_update_kwargs(profile: TuningProfile, dense_vector_name: Optional[str]) -> Dict[str, Any]:
+    """
+    ``update_collection`` arguments moving an existing collection to ``profile``.
+
+    Args:
+        dense_vector_name (str, optional): Named dense vector, ``None`` for
+            collections with a single unnamed vector
+    """
+    return {
+        "hnsw_config": hnsw_config(profile),
+        "optimizers_config": OptimizersConfigDiff(default_segment_number=profile.default_segment_number),
+        "quantization_config": quantization_config(profile) or Disabled.DISABLED,
+        "vectors_config": {dense_vector_name or "": VectorParamsDiff(on_disk=profile.vectors_on_disk)},
+        "collection_params": CollectionParamsDiff(on_disk_payload=profile.payload_on_disk),
+    }
+
+
+def profile_drift(profile: TuningProfile, info: Any, dense_vector_name: Optional[str]) -> List[str]:
+    """
+    Return the index-time settings where a collection differs from ``profile``.
+
+    Args:
+        info: ``get_collection`` response of the collection
+        dense_vector_name (str, optional): Named dense vector, ``None`` for
+            collections with a single unnamed vector
+
+    Returns:
+        List[str]: ``"setting: current -> wanted"`` entries, empty when the
+            collection already matches
+    """
+    config = info.config
+    vectors = config.params.vectors
+    dense = vectors.get(dense_vector_name or "") if isinstance(vectors, dict) else vectors
+    quantization = config.quantization_config
+    current = {
+        "hnsw_m": config.hnsw_config.m,
+        "hnsw_ef_construct": config.hnsw_config.ef_construct,
+        "hnsw_on_disk": bool(config.hnsw_config.on_disk),
+        "default_segment_number": config.optimizer_config.default_segment_number,
+        "quantization": type(quantization).__name__.replace("Quantization", "").lower() if quantization else None,
+        "vectors_on_disk": bool(getattr(dense, "on_disk", False)),
+        "payload_on_disk": bool(config.params.on_disk_payload),
+    }
+    return [f"{name}: {value} -> {getattr(profile, name)}"
+            for name, value in current.items() if value != getattr(profile, name)]
+
+
+def search_params(profile: TuningProfile) -> SearchParams:
+    """Query-time search parameters of ``profile``."""
+    quantization = None
+    if profile.quantization is not None and (profile.rescore is not None or profile.oversampling is not None):
+        quantization = QuantizationSearchParams(rescore=profile.rescore, oversampling=profile.oversampling)
+    return SearchParams(hnsw_ef=profile.hnsw_ef, exact=False, quantization=quantization)
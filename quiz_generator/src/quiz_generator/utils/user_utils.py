@@ -5,6 +5,10 @@ This module contains functions for user input and data selection.
 
 import os
 
+QUESTION_TYPES = ['Multiple Choice', 'True/False', 'Short Open Question', 'Mixed']
+MIN_QUESTIONS = 1
+MAX_QUESTIONS = 10
+
 def get_available_providers(dataset_base_path):
     """Get list of available providers from dataset folder."""
     providers = []
@@ -190,8 +194,8 @@ def get_user_number_of_questions():
             num_questions_input = input("\n❓ How many questions would you like to generate? (1-5): ").strip()
             number_of_questions = int(num_questions_input)
 
-            if number_of_questions < 1 or number_of_questions > 10:
-                print("❌ Invalid number of questions. Please enter a number between 1 and 10")
+            if number_of_questions < MIN_QUESTIONS or number_of_questions > MAX_QUESTIONS:
+                print(f"❌ Invalid number of questions. Please enter a number between {MIN_QUESTIONS} and {MAX_QUESTIONS}")
             else:
                 return number_of_questions
         except ValueError:
@@ -207,7 +211,7 @@ def get_user_question_type_selection():
     Returns:
         str or None: Selected question type or None if cancelled
     """
-    question_types = ['Multiple Choice', 'True/False', 'Short Open Question', 'Mixed']
+    question_types = QUESTION_TYPES
     
     print("\n📝 Available question types:")
     for i, qtype in enumerate(question_types, 1):
@@ -266,4 +270,34 @@ def display_selection_summary(provider, certification, topic, number_of_question
     print(f"   Certification: {certification}")
     print(f"   Topic: {topic}")
     print(f"   Total Questions: {number_of_questions}")
-    print(f"   Question's Type: {question_type}")
\ No newline at end of file
+    print(f"   Question's Type: {question_type}")
+
+def validate_selections(dataset_base_path, provider, certification, topic, number_of_questions, question_type):
+    """
+    Check non-interactive selections against the dataset folder and the quiz options.
+    
+    Args:
+        dataset_base_path (str): Base path to the dataset folder
+        provider (str): Provider name
+        certification (str): Certification name
+        topic (str): Topic name (PDF file name without extension)
+        number_of_questions (int): Number of questions to generate
+        question_type (str): Type of questions to generate
+        
+    Returns:
+        list: Error messages, empty if the selections are valid
+    """
+    errors = []
+    if provider not in get_available_providers(dataset_base_path):
+        errors.append(f"Unknown provider '{provider}'")
+    elif certification not in get_available_certifications(provider, dataset_base_path):
+        errors.append(f"Unknown certification '{certification}' for provider '{provider}'")
+    elif topic not in get_available_topics(provider, certification, dataset_base_path):
+        errors.append(f"Unknown topic '{topic}' for '{provider}/{certification}'")
+    
+    if not isinstance(number_of_questions, int) or isinstance(number_of_questions, bool) \
+            or not MIN_QUESTIONS <= number_of_questions <= MAX_QUESTIONS:
+        errors.append(f"number_of_questions must be an integer between {MIN_QUESTIONS} and {MAX_QUESTIONS}")
+    if question_type not in QUESTION_TYPES:
+        errors.append(f"question_type must be one of: {', '.join(QUESTION_TYPES)}")
+    return errors
@@ -0,0 +1,25 @@
+"""
+Per-run output workspaces.
+
+Every flow run writes its template, questions, quiz and PDF to its own
+directory ``outputs/runs/<run_id>/``, so several flows can run on one host
+(threads or processes) without overwriting each other's files.
+"""
+
+import os
+import uuid
+from datetime import datetime
+
+RUNS_ROOT = os.path.join("outputs", "runs")
+
+
+def new_run_id() -> str:
+    """Return a sortable, unique run ID (timestamp + random suffix)."""
+    return f"{datetime.now().strftime('%Y%m%d_%H%M%S')}_{uuid.uuid4().hex[:8]}"
+
+
+def run_output_dir(run_id: str, root: str = RUNS_ROOT) -> str:
+    """Create and return the output directory of ``run_id``."""
+    path = os.path.join(root, run_id)
+    os.makedirs(path, exist_ok=True)
+    return path
@@ -0,0 +1,100 @@
+"""
+Shared fixtures for the RAG tests: fake embedders, PDF writer and Settings
+tuned for Qdrant local mode (no rate limits, state kept under ``tmp_path``).
+"""
+
+import asyncio
+import sys
+from pathlib import Path
+
+import numpy as np
+import pymupdf
+import pytest
+
+# Add src (and the benchmark helpers) to the path for imports
+src_path = Path(__file__).parent.parent / "src"
+sys.path.insert(0, str(src_path))
+sys.path.insert(0, str(Path(__file__).parent.parent / "benchmarks"))
+
+from _common import FakeEmbeddings
+from quiz_generator.utils.rag_qdrant_hybrid import Settings
+
+
+class KeywordEmbeddings:
+    """Embeds a text as normalized counts over a tiny fixed vocabulary (sync and async)."""
+
+    VOCAB = ["vision", "image", "speech", "audio", "language", "text", "azure", "model"]
+
+    def _embed(self, text):
+        words = text.lower().split()
+        vec = np.array([words.count(w) for w in self.VOCAB], dtype=float) + 0.01
+        return (vec / np.linalg.norm(vec)).tolist()
+
+    def embed_documents(self, texts):
+        return [self._embed(t) for t in texts]
+
+    def embed_query(self, text):
+        return self._embed(text)
+
+    async def aembed_documents(self, texts):
+        await asyncio.sleep(0)
+        return self.embed_documents(texts)
+
+    async def aembed_query(self, text):
+        await asyncio.sleep(0)
+        return self.embed_query(text)
+
+
+class RecordingEmbeddings:
+    """Deterministic 3-dimensional embedder recording the texts it embeds."""
+
+    def __init__(self):
+        self.texts = []
+
+    def embed_documents(self, texts):
+        self.texts.extend(texts)
+        return [[float(len(t)), 1.0, float(i % 3)] for i, t in enumerate(texts)]
+
+    def embed_query(self, text):
+        return [float(len(text)), 1.0, 0.5]
+
+
+@pytest.fixture
+def keyword_embeddings():
+    """``KeywordEmbeddings``: collections need ``len(keyword_embeddings.VOCAB)`` dimensions."""
+    return KeywordEmbeddings()
+
+
+@pytest.fixture
+def recording_embeddings():
+    """``RecordingEmbeddings``: collections need 3 dimensions."""
+    return RecordingEmbeddings()
+
+
+@pytest.fixture
+def fake_embeddings():
+    """The benchmarks' bag-of-words ``FakeEmbeddings``, with 8 dimensions."""
+    return FakeEmbeddings(dim=8)
+
+
+@pytest.fixture
+def write_pdf():
+    """Return a function writing a PDF with one page per text."""
+    def write(path, pages):
+        doc = pymupdf.open()
+        for text in [pages] if isinstance(pages, str) else pages:
+            doc.new_page().insert_text((72, 72), text)
+        doc.save(str(path))
+        doc.close()
+    return write
+
+
+@pytest.fixture
+def fast_settings(tmp_path):
+    """Return a ``Settings`` factory with state under ``tmp_path`` and rate limits disabled."""
+    def make(**overrides):
+        values = dict(state_dir=str(tmp_path / "state"), result_cache_file=str(tmp_path / "results.sqlite3"),
+                      embed_tokens_per_minute=0, embed_requests_per_minute=0)
+        values.update(overrides)
+        return Settings(**values)
+    return make
@@ -0,0 +1,140 @@
+"""
+Tests for the async RAG path against Qdrant local mode.
+"""
+
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+from langchain.schema import Document
+from qdrant_client import AsyncQdrantClient, QdrantClient
+
+# Add src to the path for imports
+src_path = Path(__file__).parent.parent / "src"
+sys.path.insert(0, str(src_path))
+
+from quiz_generator.utils.embedding_scheduler import async_retry_with_backoff
+from quiz_generator.utils.rag_qdrant_async import ahybrid_search, aupsert_chunks
+from quiz_generator.utils.ingest_state import IngestCheckpoint
+from quiz_generator.utils.rag_qdrant_hybrid import hybrid_search, recreate_collection_for_rag
+
+
+def test_async_ingest_and_search(tmp_path, fast_settings, keyword_embeddings):
+    """Points written by aupsert_chunks are searchable by the sync and async paths."""
+    settings = fast_settings(collection="async_test")
+    db_path = str(tmp_path / "qdrant")
+    client = QdrantClient(path=db_path)
+    recreate_collection_for_rag(client, settings, len(keyword_embeddings.VOCAB))
+    client.close()
+
+    topics = ["vision image", "speech audio", "language text"]
+    chunks = [Document(page_content=f"{topics[i % 3]} azure model {i}", metadata={"source": f"{i % 3}.pdf"})
+              for i in range(30)]
+    embeddings = keyword_embeddings
+
+    async def ingest_and_search():
+        aclient = AsyncQdrantClient(path=db_path)
+        await aupsert_chunks(aclient, settings, chunks, embeddings)
+        hits = await asyncio.gather(*(ahybrid_search(aclient, settings, q, embeddings) for q in topics))
+        await aclient.close()
+        return hits
+
+    async_hits = asyncio.run(ingest_and_search())
+    client = QdrantClient(path=db_path)
+    assert client.count(settings.collection).count == 30
+    for query, hits in zip(topics, async_hits):
+        sync_hits = hybrid_search(client, settings, query, embeddings)
+        assert len(hits) == len(sync_hits) == settings.final_k
+        assert all(h.payload["text"].startswith(query) for h in hits + sync_hits)
+    client.close()
+
+
+def test_failed_embedding_settles_pending_upserts(tmp_path, monkeypatch, fast_settings, keyword_embeddings):
+    """When embedding fails mid-ingest, finished upserts are checkpointed and none is left running."""
+    settings = fast_settings(collection="async_fail", embed_batch_size=5, embed_concurrency=1,
+                             upsert_batch_size=5, upsert_parallelism=4)
+    db_path = str(tmp_path / "qdrant")
+    client = QdrantClient(path=db_path)
+    recreate_collection_for_rag(client, settings, len(keyword_embeddings.VOCAB))
+    client.close()
+    chunks = [Document(page_content=f"vision azure model {i}", metadata={"source": "a.pdf"}) for i in range(20)]
+
+    calls = []
+    aembed_documents = keyword_embeddings.aembed_documents
+
+    async def failing_aembed_documents(texts):
+        calls.append(texts)
+        if len(calls) == 3:
+            await asyncio.sleep(0.1)
+            raise ValueError("embedding service unavailable")
+        return await aembed_documents(texts)
+
+    monkeypatch.setattr(keyword_embeddings, "aembed_documents", failing_aembed_documents)
+
+    async def ingest():
+        aclient = AsyncQdrantClient(path=db_path)
+        upserts = []
+        upsert = aclient.upsert
+
+        async def slow_upsert(**kwargs):
+            # The first upsert finishes before the failure, the second does not
+            await asyncio.sleep(0 if len(upserts) == 1 else 5)
+            return await upsert(**kwargs)
+
+        def track(**kwargs):
+            upserts.append(asyncio.ensure_future(slow_upsert(**kwargs)))
+            return upserts[-1]
+
+        aclient.upsert = track
+        try:
+            await aupsert_chunks(aclient, settings, chunks, keyword_embeddings)
+        except ValueError:
+            pass
+        else:
+            raise AssertionError("the embedding error was swallowed")
+        finally:
+            await aclient.close()
+        return upserts
+
+    upserts = asyncio.run(ingest())
+    assert len(upserts) == 2 and all(task.done() for task in upserts)
+    assert upserts[1].cancelled()
+    assert len(IngestCheckpoint(settings.state_dir, settings.collection)) == 5
+
+
+def test_async_backoff_does_not_block_the_event_loop(monkeypatch):
+    """Concurrent retries overlap their waits."""
+    monkeypatch.setattr("random.uniform", lambda a, b: 0.2)
+
+    def flaky():
+        failures = [RuntimeError("429 rate limit")]
+
+        async def call():
+            if failures:
+                raise failures.pop()
+            return "ok"
+        return call
+
+    async def run_all():
+        return await asyncio.gather(*(async_retry_with_backoff(flaky(), base_delay=1.0) for _ in range(5)))
+
+    start = time.perf_counter()
+    assert asyncio.run(run_all()) == ["ok"] * 5
+    assert time.perf_counter() - start < 0.6
+
+
+def test_async_tool_matches_sync_tool(monkeypatch):
+    """``_arun`` uses the batched search and the legacy fallback like ``_run``."""
+    from quiz_generator.tools import rag_qdrant_tool
+
+    calls = []
+    monkeypatch.setattr(rag_qdrant_tool, "search_rag_batch",
+                        lambda qs, k, provider, certification: calls.append("batch") or [[f"{q}-doc"] * k for q in qs])
+    monkeypatch.setattr(rag_qdrant_tool, "search_rag", lambda q, k: calls.append("legacy") or [q] * k)
+
+    tool = rag_qdrant_tool.RagTool()
+    questions = ["vision", "speech"]
+    assert asyncio.run(tool._arun(questions=questions, k=2)) == tool._run(questions=questions, k=2)
+    assert asyncio.run(tool._arun(question="vision", k=2)) == tool._run(question="vision", k=2)
+    assert calls == ["batch", "batch", "legacy", "legacy"]
@@ -0,0 +1,64 @@
+"""
+Tests for the headless batch mode.
+"""
+
+import builtins
+import json
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add src to the path for imports
+src_path = Path(__file__).parent.parent / "src"
+sys.path.insert(0, str(src_path))
+
+from quiz_generator.batch import load_manifest, validate_job
+from quiz_generator.main import QuizGeneratorFlow
+
+JOB = {"provider": "azure", "certification": "AI_900", "topic": "1",
+       "number_of_questions": 5, "question_type": "Mixed"}
+
+
+@pytest.fixture
+def dataset(tmp_path):
+    """Dataset tree with one provider, certification and topic."""
+    cert = tmp_path / "dataset" / "azure" / "AI_900"
+    cert.mkdir(parents=True)
+    (cert / "1.pdf").write_bytes(b"%PDF-1.4")
+    return str(tmp_path / "dataset")
+
+
+def test_yaml_and_jsonl_manifests(tmp_path):
+    """Both manifest formats load the same jobs."""
+    (tmp_path / "jobs.yaml").write_text(
+        "jobs:\n  - {provider: azure, certification: AI_900, topic: '1', number_of_questions: 5, question_type: Mixed}\n"
+    )
+    (tmp_path / "jobs.jsonl").write_text(json.dumps(JOB) + "\n\n")
+
+    assert load_manifest(str(tmp_path / "jobs.yaml")) == [JOB]
+    assert load_manifest(str(tmp_path / "jobs.jsonl")) == [JOB]
+
+
+def test_jobs_are_validated_against_dataset(dataset):
+    """Unknown dataset entries, bad options and missing fields are reported."""
+    assert validate_job(JOB, dataset) == []
+    assert validate_job({**JOB, "topic": 1}, dataset) == []  # unquoted YAML ``topic: 1``
+    assert validate_job({**JOB, "topic": "2"}, dataset) == ["Unknown topic '2' for 'azure/AI_900'"]
+    assert len(validate_job({**JOB, "number_of_questions": 50, "question_type": "Essay"}, dataset)) == 2
+    assert validate_job({"provider": "azure"}, dataset)[0].startswith("Missing fields")
+
+
+def test_flow_skips_prompts_when_inputs_are_given(dataset, tmp_path, monkeypatch):
+    """``collect_user_input`` uses pre-populated state instead of ``input()``."""
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(builtins, "input", lambda *a: pytest.fail("input() must not be called"))
+
+    flow = QuizGeneratorFlow()
+    flow._initialize_state({**JOB, "dataset_path": dataset})
+    flow.collect_user_input()
+    assert flow.state.error_message is None
+
+    flow._initialize_state({"topic": "missing"})
+    flow.collect_user_input()
+    assert flow.state.error_message.startswith("Invalid quiz request")
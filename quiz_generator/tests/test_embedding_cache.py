@@ -0,0 +1,66 @@
+"""
+Tests for the persistent embedding cache.
+"""
+
+import sys
+from pathlib import Path
+
+# Add src to the path for imports
+src_path = Path(__file__).parent.parent / "src"
+sys.path.insert(0, str(src_path))
+
+from quiz_generator.utils.embedding_cache import CachedEmbeddings, EmbeddingCache
+
+
+class CountingEmbeddings:
+    """Deterministic embedder that records every text it is asked to embed."""
+
+    def __init__(self):
+        self.calls = []
+
+    def embed_documents(self, texts):
+        self.calls.append(list(texts))
+        return [[float(len(t)), 1.0, 0.5] for t in texts]
+
+    def embed_query(self, text):
+        self.calls.append([text])
+        return [float(len(text)), 1.0, 0.5]
+
+
+def test_cached_embeddings_only_embed_misses(tmp_path):
+    """Repeated texts are served from the cache and counted as hits."""
+    inner = CountingEmbeddings()
+    cache = EmbeddingCache(str(tmp_path / "cache.sqlite3"))
+    emb = CachedEmbeddings(inner, cache, model="m")
+
+    first = emb.embed_documents(["a", "bb", "a"])
+    second = emb.embed_documents(["bb", "ccc"])
+    query = emb.embed_query("ccc")
+
+    assert first == [[1.0, 1.0, 0.5], [2.0, 1.0, 0.5], [1.0, 1.0, 0.5]]
+    assert second == [[2.0, 1.0, 0.5], [3.0, 1.0, 0.5]]
+    assert query == [3.0, 1.0, 0.5]
+    assert inner.calls == [["a", "bb"], ["ccc"]]
+    assert emb.stats() == {"hits": 2, "misses": 4, "entries": 3}
+
+
+def test_cache_is_keyed_by_model_and_persistent(tmp_path):
+    """Entries survive reopening and are isolated per model."""
+    path = str(tmp_path / "cache.sqlite3")
+    EmbeddingCache(path).put_many("m1", ["x"], [[0.25, 0.5]])
+
+    reopened = EmbeddingCache(path)
+    assert reopened.get_many("m1", ["x"]) == [[0.25, 0.5]]
+    assert reopened.get_many("m2", ["x"]) == [None]
+
+
+def test_cache_evicts_least_recently_used(tmp_path):
+    """The store never grows beyond ``max_entries``."""
+    cache = EmbeddingCache(str(tmp_path / "cache.sqlite3"), max_entries=2)
+    cache.put_many("m", ["a"], [[1.0]])
+    cache.put_many("m", ["b"], [[2.0]])
+    cache.get_many("m", ["a"])
+    cache.put_many("m", ["c"], [[3.0]])
+
+    assert len(cache) == 2
+    assert cache.get_many("m", ["a", "b", "c"]) == [[1.0], None, [3.0]]
@@ -0,0 +1,112 @@
+"""
+Tests for the rate-limit-aware embedding scheduler.
+"""
+
+import sys
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+# Add src to the path for imports
+src_path = Path(__file__).parent.parent / "src"
+sys.path.insert(0, str(src_path))
+
+from quiz_generator.utils import embedding_scheduler
+from quiz_generator.utils.embedding_scheduler import (
+    EmbeddingScheduler,
+    make_batches,
+    observe_rate_limit_headers,
+    parse_duration,
+    retry_with_backoff,
+)
+
+
+class FakeResponse:
+    """Minimal HTTP response carrying headers and a status code."""
+
+    def __init__(self, headers):
+        self.headers = headers
+        self.status_code = 429
+
+
+class FakeRateLimitError(Exception):
+    """Exception shaped like the OpenAI SDK ``RateLimitError``."""
+
+    def __init__(self, headers):
+        super().__init__("Error code: 429")
+        self.response = FakeResponse(headers)
+
+
+def test_parse_duration_formats():
+    """Seconds, Go-style durations and milliseconds are understood."""
+    assert parse_duration("2") == 2.0
+    assert parse_duration("1m30s") == 90.0
+    assert parse_duration("250ms") == 0.25
+    assert parse_duration("bogus") is None
+
+
+def test_make_batches_respects_token_and_item_limits():
+    """Batches never exceed the token budget or the item count."""
+    texts = ["x" * 40, "x" * 40, "x" * 40, "x", "x", "x"]
+    assert make_batches(texts, max_tokens=20, max_items=2) == [(0, 2), (2, 4), (4, 6)]
+    assert make_batches(["x" * 400], max_tokens=20, max_items=2) == [(0, 1)]
+
+
+def test_retry_honours_retry_after(monkeypatch):
+    """The wait uses the server's Retry-After header and non-429 errors propagate."""
+    sleeps = []
+    monkeypatch.setattr(embedding_scheduler.time, "sleep", sleeps.append)
+    attempts = []
+
+    def flaky():
+        attempts.append(1)
+        if len(attempts) < 3:
+            raise FakeRateLimitError({"Retry-After": "7"})
+        return "ok"
+
+    assert retry_with_backoff(flaky, max_retries=5, base_delay=0.5) == "ok"
+    assert len(sleeps) == 2 and all(7.0 <= s <= 7.5 for s in sleeps)
+
+    with pytest.raises(ValueError):
+        retry_with_backoff(lambda: (_ for _ in ()).throw(ValueError("boom")), max_retries=5)
+
+    # The limiter is told about the last 429 too, before the error propagates
+    limited = []
+    with pytest.raises(FakeRateLimitError):
+        retry_with_backoff(lambda: (_ for _ in ()).throw(FakeRateLimitError({})), max_retries=2,
+                           on_rate_limit=lambda exc, wait: limited.append(wait))
+    assert len(limited) == 2
+
+
+def test_response_headers_pace_schedulers_before_a_429():
+    """Remaining-budget headers of successful responses cap the token buckets."""
+    scheduler = EmbeddingScheduler(None, tokens_per_minute=60_000, requests_per_minute=600)
+    observe_rate_limit_headers({"x-ratelimit-remaining-tokens": "2000", "x-ratelimit-reset-tokens": "10s",
+                                "x-ratelimit-remaining-requests": "0", "x-ratelimit-reset-requests": "2s"})
+
+    assert scheduler.token_bucket.tokens <= 2000
+    assert scheduler.token_bucket.rate == pytest.approx(200.0)
+    assert scheduler.request_bucket.paused_until > time.monotonic() + 1
+
+
+def test_scheduler_keeps_input_order_with_concurrency():
+    """Batches run concurrently but vectors come back in input order."""
+    active, peak = [0], [0]
+    lock = threading.Lock()
+
+    class SlowEmbeddings:
+        def embed_documents(self, texts):
+            with lock:
+                active[0] += 1
+                peak[0] = max(peak[0], active[0])
+            time.sleep(0.02)
+            with lock:
+                active[0] -= 1
+            return [[float(t)] for t in texts]
+
+    texts = [str(i) for i in range(40)]
+    scheduler = EmbeddingScheduler(SlowEmbeddings(), max_concurrency=4, max_batch_size=3)
+    assert scheduler.embed(texts) == [[float(i)] for i in range(40)]
+    assert 1 < peak[0] <= 4
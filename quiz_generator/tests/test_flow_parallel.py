@@ -0,0 +1,70 @@
+"""
+Tests for the parallel template generation / database initialization steps.
+"""
+
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+# Add src to the path for imports
+src_path = Path(__file__).parent.parent / "src"
+sys.path.insert(0, str(src_path))
+
+from quiz_generator.main import QuizGeneratorFlow, format_step_timings
+from quiz_generator.utils.quiz_templates import build_template
+
+JOB = {"provider": "azure", "certification": "AI_900", "topic": "1",
+       "number_of_questions": 5, "question_type": "Mixed"}
+
+
+class _FakeCrew:
+    """Stand-in for a crew class: ``Crew(...).crew().kickoff(...)`` just waits."""
+
+    def __init__(self, *args, **kwargs):
+        pass
+
+    def crew(self):
+        return self
+
+    def kickoff(self, inputs=None):
+        time.sleep(0.3)
+
+    async def kickoff_async(self, inputs=None):
+        await asyncio.sleep(0.3)
+        template = build_template(inputs["provider"], inputs["certification"],
+                                  inputs["number_of_questions"], inputs["question_type"])
+        (Path(inputs["output_dir"]) / "quiz_template.md").write_text(template, encoding="utf-8")
+
+
+def test_template_and_database_steps_overlap(tmp_path, monkeypatch):
+    """Both steps start after user input and the RAG step waits for both."""
+    cert = tmp_path / "dataset" / "azure" / "AI_900"
+    cert.mkdir(parents=True)
+    (cert / "1.pdf").write_bytes(b"%PDF-1.4")
+    monkeypatch.setenv("QUIZ_TEMPLATE_CACHE", str(tmp_path / "template_cache"))
+    monkeypatch.setattr("quiz_generator.utils.database_utils.initialize_database",
+                        lambda *args: time.sleep(0.3) or True)
+    for module, name in [("template_generator_crew.template_generator_crew", "TemplateGeneratorCrew"),
+                         ("rag_crew.rag_crew", "RagCrew"),
+                         ("quiz_maker_crew.quiz_maker_crew", "QuizMakerCrew")]:
+        monkeypatch.setattr(f"quiz_generator.crews.{module}.{name}", _FakeCrew)
+    monkeypatch.setattr("quiz_generator.utils.quiz_assembly.assemble_quiz", lambda output_dir: None)
+
+    flow = QuizGeneratorFlow()
+    flow.kickoff(inputs={**JOB, "dataset_path": str(tmp_path / "dataset"), "output_dir": str(tmp_path / "run")})
+
+    timings = flow.state.step_timings
+    assert flow.state.quiz_generated and flow.state.error_message is None
+    db, template, rag = (timings[name] for name in
+                         ("initialize_vector_database", "generate_quiz_template", "generate_quiz_with_rag_crew"))
+    assert template[0] < db[1] and db[0] < template[1]
+    assert rag[0] >= max(db[1], template[1])
+    assert "saved" in format_step_timings(timings)
+    assert flow.state.template_cache_hit is False
+
+    # Same configuration again: the template comes from the cache, without the crew
+    flow = QuizGeneratorFlow()
+    flow.kickoff(inputs={**JOB, "dataset_path": str(tmp_path / "dataset"), "output_dir": str(tmp_path / "run2")})
+    assert flow.state.template_cache_hit is True and flow.state.quiz_generated
+    assert "generate_quiz_template" in flow.state.step_timings
@@ -0,0 +1,113 @@
+"""
+Tests for hybrid search against Qdrant local mode.
+"""
+
+import sys
+from pathlib import Path
+
+from langchain.schema import Document
+from qdrant_client import QdrantClient
+
+# Add src to the path for imports
+src_path = Path(__file__).parent.parent / "src"
+sys.path.insert(0, str(src_path))
+
+from quiz_generator.utils import rag_qdrant_hybrid
+from quiz_generator.utils.rag_qdrant_hybrid import Settings, hybrid_search, recreate_collection_for_rag, upsert_chunks
+
+
+def _indexed_client(settings, embeddings):
+    client = QdrantClient(":memory:")
+    recreate_collection_for_rag(client, settings, len(embeddings.VOCAB))
+    topics = ["vision image", "speech audio", "language text"]
+    chunks = [Document(page_content=f"{topics[i % 3]} azure model {i}", metadata={"source": f"{i % 3}.pdf"})
+              for i in range(30)]
+    upsert_chunks(client, settings, chunks, embeddings)
+    return client, settings
+
+
+def test_server_and_client_fusion_return_relevant_hits(fast_settings, keyword_embeddings):
+    """Both hybrid modes return ``final_k`` on-topic results."""
+    client, settings = _indexed_client(fast_settings(collection="hybrid_test"), keyword_embeddings)
+    settings.final_k = 4
+    for mode in ("server", "client"):
+        settings.hybrid_mode = mode
+        hits = hybrid_search(client, settings, "speech audio", keyword_embeddings)
+        assert len(hits) == 4
+        assert all(h.payload["text"].startswith("speech audio") for h in hits)
+
+
+def test_server_fusion_falls_back_to_client_side(fast_settings, keyword_embeddings, monkeypatch):
+    """A server that rejects the Query API request still gets answered."""
+    client, settings = _indexed_client(fast_settings(collection="hybrid_test"), keyword_embeddings)
+    settings.hybrid_mode = "server"
+
+    def unsupported(*args, **kwargs):
+        raise RuntimeError("fusion not supported")
+
+    monkeypatch.setattr(rag_qdrant_hybrid, "server_side_fusion", unsupported)
+    hits = hybrid_search(client, settings, "vision image", keyword_embeddings)
+    assert len(hits) == settings.final_k
+
+
+def test_sparse_branch_surfaces_terms_unknown_to_dense_model(fast_settings, keyword_embeddings):
+    """A rare keyword outside the dense top-N is found through BM25."""
+    settings = fast_settings(collection="sparse_test", top_n_semantic=5, final_k=3)
+    client = QdrantClient(":memory:")
+    recreate_collection_for_rag(client, settings, len(keyword_embeddings.VOCAB))
+    chunks = [Document(page_content=f"vision image azure model {i}", metadata={"source": "a.pdf"}) for i in range(20)]
+    chunks.append(Document(page_content="speech audio kubernetes deployment", metadata={"source": "b.pdf"}))
+    upsert_chunks(client, settings, chunks, keyword_embeddings)
+
+    assert rag_qdrant_hybrid.get_vector_layout(client, settings).sparse == "bm25"
+    hits = hybrid_search(client, settings, "vision kubernetes", keyword_embeddings)
+    assert any("kubernetes" in h.payload["text"] for h in hits)
+
+
+def test_legacy_unnamed_vector_collection_still_searchable(fast_settings, keyword_embeddings):
+    """Collections created without sparse vectors keep working."""
+    settings = fast_settings(collection="legacy_test", use_sparse=False)
+    client = QdrantClient(":memory:")
+    recreate_collection_for_rag(client, settings, len(keyword_embeddings.VOCAB))
+    chunks = [Document(page_content=f"language text azure model {i}", metadata={"source": "c.pdf"}) for i in range(10)]
+    upsert_chunks(client, settings, chunks, keyword_embeddings)
+
+    for mode in ("server", "client"):
+        settings.hybrid_mode = mode
+        assert len(hybrid_search(client, settings, "language text", keyword_embeddings)) == settings.final_k
+
+
+def test_batch_search_matches_single_queries_in_one_round_trip(fast_settings, keyword_embeddings, monkeypatch):
+    """Batched retrieval ranks like hybrid_search, with one Qdrant call and no repeats."""
+    client, settings = _indexed_client(fast_settings(collection="hybrid_test"), keyword_embeddings)
+    settings.final_k = 3
+    queries = ["vision image", "speech audio", "vision image"]
+
+    single = [[p.id for p in hybrid_search(client, settings, q, keyword_embeddings)] for q in queries]
+    batch = rag_qdrant_hybrid.hybrid_search_batch(client, settings, queries, keyword_embeddings)
+    assert [[p.id for p in points] for points in batch] == single
+
+    calls = []
+    query_batch_points = client.query_batch_points
+    monkeypatch.setattr(client, "query_batch_points", lambda *a, **kw: calls.append(1) or query_batch_points(*a, **kw))
+    monkeypatch.setattr(rag_qdrant_hybrid, "get_settings_for_certification", lambda p, c: settings)
+    monkeypatch.setattr(rag_qdrant_hybrid, "get_qdrant_client", lambda s: client)
+    monkeypatch.setattr(rag_qdrant_hybrid, "get_embeddings", lambda s: keyword_embeddings)
+
+    results = rag_qdrant_hybrid.search_rag_batch(queries, 3, provider="azure", certification="AI_900")
+    assert len(calls) == 1
+    assert [len(r) for r in results] == [3, 3, 3]
+    docs = [d for r in results for d in r]
+    assert len(set(docs)) == len(docs)
+    assert all("speech audio" in d for d in results[1])
+
+    # Warm cache: same top-up, no Qdrant call
+    assert rag_qdrant_hybrid.search_rag_batch(queries, 3, provider="azure", certification="AI_900") == results
+    assert len(calls) == 1
+
+
+def test_bm25_length_normalization_follows_chunk_size():
+    """Without an explicit average, BM25 expects chunks of ``chunk_size`` characters."""
+    assert rag_qdrant_hybrid.get_sparse_encoder(Settings()).avg_doc_len == Settings().chunk_size / 8
+    assert rag_qdrant_hybrid.get_sparse_encoder(Settings(chunk_size=1600)).avg_doc_len == 200
+    assert rag_qdrant_hybrid.get_sparse_encoder(Settings(bm25_avg_doc_len=50.0)).avg_doc_len == 50.0
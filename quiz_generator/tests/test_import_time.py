@@ -0,0 +1,43 @@
+"""
+Import-time budget of the flow module, measured with ``python -X importtime``.
+"""
+
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+src_path = Path(__file__).parent.parent / "src"
+
+# Imported lazily by the flow steps and the evaluation entry point
+DEFERRED = ("mlflow", "pandas", "crewai_tools", "langchain_openai",
+            "quiz_generator.crews", "quiz_generator.utils.rag_qdrant_hybrid")
+
+# Own import cost of quiz_generator.main, excluding its crewai.flow base class
+BUDGET_MS = float(os.getenv("IMPORT_TIME_BUDGET_MS", "500"))
+
+
+def _importtime(module: str):
+    """Return the cumulative import time (µs) of every module loaded by ``import module``."""
+    env = dict(os.environ, PYTHONPATH=str(src_path), MLFLOW_ENABLED="")
+    proc = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {module}"],
+                          capture_output=True, text=True, env=env, timeout=300)
+    assert proc.returncode == 0, proc.stderr[-2000:]
+    cumulative = {}
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line or "cumulative" in line:
+            continue
+        _, cum, name = line.split("|")
+        cumulative[name.strip()] = int(cum)
+    return cumulative
+
+
+def test_main_import_defers_heavy_modules_and_fits_budget():
+    """Importing the flow pulls no crews/MLflow/pandas and stays within budget."""
+    cumulative = _importtime("quiz_generator.main")
+
+    loaded = [m for m in cumulative if m.startswith(DEFERRED)]
+    assert not loaded, f"imported eagerly: {loaded}"
+
+    own_ms = (cumulative["quiz_generator.main"] - cumulative.get("crewai", 0)) / 1000
+    assert own_ms <= BUDGET_MS, f"quiz_generator.main import took {own_ms:.0f} ms (budget {BUDGET_MS:.0f} ms)"
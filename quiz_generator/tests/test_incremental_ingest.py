@@ -0,0 +1,57 @@
+"""
+Tests for incremental, per-file database initialization.
+"""
+
+import sys
+from pathlib import Path
+
+from qdrant_client import QdrantClient
+
+# Add src to the path for imports
+src_path = Path(__file__).parent.parent / "src"
+sys.path.insert(0, str(src_path))
+
+from quiz_generator.utils import database_utils
+
+
+def _sources(client, collection):
+    points, _ = client.scroll(collection, limit=1000, with_payload=True)
+    return sorted(p.payload["source"] for p in points)
+
+
+def test_only_new_changed_and_removed_files_are_touched(tmp_path, monkeypatch, fast_settings, recording_embeddings,
+                                                        write_pdf):
+    """Unchanged PDFs are skipped, changed ones replaced, removed ones deleted."""
+    dataset = tmp_path / "dataset"
+    cert_dir = dataset / "azure" / "AI_900"
+    cert_dir.mkdir(parents=True)
+    write_pdf(cert_dir / "a.pdf", "Azure AI services overview")
+    write_pdf(cert_dir / "b.pdf", "Computer vision workloads")
+
+    client = QdrantClient(":memory:")
+    def settings_for(provider, certification):
+        return fast_settings(collection="azure_ai_900_chunks")
+
+    monkeypatch.setattr(database_utils, "get_settings_for_certification", settings_for)
+    monkeypatch.setattr(database_utils, "get_qdrant_client", lambda settings: client)
+    monkeypatch.setattr(database_utils, "get_embeddings", lambda settings: recording_embeddings)
+
+    assert database_utils.initialize_database("azure", "AI_900", str(dataset))
+    assert _sources(client, "azure_ai_900_chunks") == ["a.pdf", "b.pdf"]
+
+    recording_embeddings.texts.clear()
+    assert database_utils.initialize_database("azure", "AI_900", str(dataset))
+    assert recording_embeddings.texts == []
+
+    result_cache = database_utils.get_result_cache(settings_for("azure", "AI_900"))
+    result_cache.put("azure_ai_900_chunks", "what is azure?", 3, "h", ["Source: a.pdf\nContent: old"])
+
+    write_pdf(cert_dir / "b.pdf", "Natural language processing workloads on Azure")
+    (cert_dir / "a.pdf").unlink()
+    write_pdf(cert_dir / "c.pdf", "Generative AI")
+    assert database_utils.initialize_database("azure", "AI_900", str(dataset))
+
+    assert _sources(client, "azure_ai_900_chunks") == ["b.pdf", "c.pdf"]
+    assert not any("Azure AI services" in t for t in recording_embeddings.texts)
+    assert any("Natural language processing" in t for t in recording_embeddings.texts)
+    assert result_cache.get("azure_ai_900_chunks", "what is azure?", 3, "h") is None
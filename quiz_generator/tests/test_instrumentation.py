@@ -0,0 +1,86 @@
+"""
+Tests for the RAG instrumentation spans and counters.
+"""
+
+import sys
+import urllib.request
+from pathlib import Path
+
+import pytest
+from langchain.schema import Document
+from qdrant_client import QdrantClient
+
+# Add src to the path for imports
+src_path = Path(__file__).parent.parent / "src"
+sys.path.insert(0, str(src_path))
+
+from quiz_generator.utils import embedding_scheduler, instrumentation
+from quiz_generator.utils.rag_qdrant_hybrid import hybrid_search, recreate_collection_for_rag, upsert_chunks
+
+
+@pytest.fixture
+def metrics():
+    """Enable instrumentation with an empty registry for one test."""
+    instrumentation.REGISTRY.clear()
+    instrumentation.configure(enabled=True)
+    yield instrumentation.REGISTRY
+    instrumentation.configure(enabled=False)
+    instrumentation.REGISTRY.clear()
+
+
+def _stages(registry):
+    return {dict(labels)["stage"]: hist[-1] for (_, labels), hist in registry.histograms.items()}
+
+
+def test_disabled_instrumentation_records_nothing():
+    """Spans and counters are no-ops until instrumentation is enabled."""
+    instrumentation.REGISTRY.clear()
+    with instrumentation.span("search.dense"):
+        instrumentation.count("rag_retries_total")
+    assert not instrumentation.REGISTRY.counters and not instrumentation.REGISTRY.histograms
+
+
+def test_pipeline_records_stages_and_counters(metrics, monkeypatch, fast_settings, fake_embeddings):
+    """Ingestion and search emit stage spans, point counts and retry counters."""
+    settings = fast_settings(collection="instrumented", hybrid_mode="client")
+    client = QdrantClient(":memory:")
+    recreate_collection_for_rag(client, settings, fake_embeddings.dim)
+    chunks = [Document(page_content=f"abc text {i}", metadata={"source": "a.pdf"}) for i in range(12)]
+    upsert_chunks(client, settings, chunks, fake_embeddings)
+    hybrid_search(client, settings, "abc", fake_embeddings)
+
+    monkeypatch.setattr(embedding_scheduler.time, "sleep", lambda s: None)
+    attempts = []
+
+    def flaky():
+        attempts.append(1)
+        if len(attempts) < 2:
+            raise RuntimeError("Error code: 429")
+        return "ok"
+
+    embedding_scheduler.retry_with_backoff(flaky, max_retries=3)
+
+    stages = _stages(metrics)
+    for stage in ("ingest.upsert", "embed.query", "hybrid_search", "fusion.client", "search.dense", "search.sparse", "mmr"):
+        assert stages.get(stage) == 1, stage
+    assert metrics.counters[("rag_points_upserted_total", (("collection", "instrumented"),))] == 12
+    assert metrics.counters[("rag_rate_limit_errors_total", ())] == 1
+    assert metrics.counters[("rag_retries_total", ())] == 1
+
+
+def test_prometheus_endpoint_serves_registry(metrics):
+    """``/metrics`` exposes counters and histograms in the text format."""
+    instrumentation.count("rag_result_cache_hits_total", kind="exact")
+    with instrumentation.span("search.dense"):
+        pass
+    server = instrumentation.start_metrics_server(0, host="127.0.0.1")
+    port = server.server_address[1]
+    try:
+        body = urllib.request.urlopen(f"http://127.0.0.1:{port}/metrics", timeout=5).read().decode()
+    finally:
+        server.shutdown()
+        instrumentation._SERVERS.pop(0, None)
+
+    assert 'rag_result_cache_hits_total{kind="exact"} 1' in body
+    assert 'rag_stage_seconds_count{stage="search.dense",status="ok"} 1' in body
+    assert 'rag_stage_seconds_bucket{stage="search.dense",status="ok",le="+Inf"} 1' in body
@@ -0,0 +1,59 @@
+"""
+Tests for the vectorized MMR selection.
+"""
+
+import sys
+from pathlib import Path
+
+import numpy as np
+
+# Add src to the path for imports
+src_path = Path(__file__).parent.parent / "src"
+sys.path.insert(0, str(src_path))
+
+from quiz_generator.utils.rag_qdrant_hybrid import mmr_select, mmr_select_batch
+
+
+def _reference_mmr(query_vec, candidates_vecs, k, lambda_mult):
+    """Straightforward MMR used as an oracle."""
+    V = np.array(candidates_vecs, dtype=float)
+    q = np.array(query_vec, dtype=float)
+    def cos(a, b):
+        return float(a @ b / ((np.linalg.norm(a) + 1e-12) * (np.linalg.norm(b) + 1e-12)))
+    sims = [cos(v, q) for v in V]
+    selected = []
+    remaining = list(range(len(V)))
+    while len(selected) < min(k, len(V)):
+        def score(i):
+            if not selected:
+                return sims[i]
+            return lambda_mult * sims[i] - (1 - lambda_mult) * max(cos(V[i], V[j]) for j in selected)
+        best = max(remaining, key=score)
+        selected.append(best)
+        remaining.remove(best)
+    return selected
+
+
+def test_mmr_select_matches_reference():
+    """Vectorized MMR picks the same candidates as the naive implementation."""
+    rng = np.random.default_rng(42)
+    for n, lam in [(1, 0.5), (5, 0.6), (40, 0.3), (200, 0.9)]:
+        q = rng.normal(size=16).tolist()
+        cands = rng.normal(size=(n, 16)).tolist()
+        assert mmr_select(q, cands, 6, lam) == _reference_mmr(q, cands, 6, lam)
+
+
+def test_mmr_select_edge_cases():
+    """Empty candidate lists and non-positive k return no selection."""
+    assert mmr_select([1.0, 0.0], [], 3, 0.5) == []
+    assert mmr_select([1.0, 0.0], [[1.0, 0.0]], 0, 0.5) == []
+    assert mmr_select([1.0, 0.0], [[0.0, 1.0], [1.0, 0.0]], 5, 0.5) == [1, 0]
+
+
+def test_mmr_select_batch_matches_single():
+    """Batch MMR returns per-query results identical to ``mmr_select``."""
+    rng = np.random.default_rng(7)
+    queries = rng.normal(size=(4, 8)).tolist()
+    candidates = [rng.normal(size=(n, 8)).tolist() for n in (10, 3, 0, 25)]
+    batch = mmr_select_batch(queries, candidates, 5, 0.6)
+    assert batch == [mmr_select(q, c, 5, 0.6) for q, c in zip(queries, candidates)]
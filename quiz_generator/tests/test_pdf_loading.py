@@ -0,0 +1,64 @@
+"""
+Tests for parallel PDF loading and the parsed-text cache.
+"""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add src to the path for imports
+src_path = Path(__file__).parent.parent / "src"
+sys.path.insert(0, str(src_path))
+
+from quiz_generator.utils import rag_qdrant_hybrid
+from quiz_generator.utils.rag_qdrant_hybrid import Settings, load_pdfs
+
+
+def test_load_pdfs_extracts_pages_and_reuses_cache(tmp_path, monkeypatch, write_pdf):
+    """Pages carry their number and a second run never re-parses."""
+    paths = []
+    for name in ("a", "b", "c"):
+        path = tmp_path / f"{name}.pdf"
+        write_pdf(path, [f"{name} first page", f"{name} second page"])
+        paths.append(str(path))
+    settings = Settings(state_dir=str(tmp_path / "state"), pdf_workers=2, pdf_mode="page")
+
+    first = load_pdfs(paths, settings)
+    assert [len(first[p]) for p in paths] == [2, 2, 2]
+    assert [d.metadata["page"] for d in first[paths[1]]] == [0, 1]
+    assert first[paths[1]][1].page_content.strip() == "b second page"
+    assert first[paths[2]][0].metadata["source"] == "c.pdf"
+
+    def fail(*args, **kwargs):
+        raise AssertionError("PDF parsed again")
+
+    monkeypatch.setattr(rag_qdrant_hybrid, "load_pdf", fail)
+    settings.pdf_workers = 1
+    second = load_pdfs(paths, settings)
+    assert {p: [d.page_content for d in docs] for p, docs in second.items()} == \
+        {p: [d.page_content for d in docs] for p, docs in first.items()}
+
+
+def test_backends_extract_the_same_pages(tmp_path, write_pdf):
+    """Every registered backend yields one document per page with its text."""
+    path = tmp_path / "doc.pdf"
+    write_pdf(path, ["Azure AI fundamentals", "Responsible AI principles"])
+    for backend in rag_qdrant_hybrid.PDF_LOADERS:
+        docs = rag_qdrant_hybrid.load_pdf(str(path), mode="page", backend=backend)
+        assert [d.page_content.strip() for d in docs] == ["Azure AI fundamentals", "Responsible AI principles"]
+        assert docs[0].metadata["source"] == "doc.pdf"
+
+    with pytest.raises(ValueError):
+        rag_qdrant_hybrid.load_pdf(str(path), backend="ocr")
+
+
+def test_backend_can_be_chosen_per_certification(monkeypatch):
+    """RAG_PDF_BACKEND_<COLLECTION> overrides RAG_PDF_BACKEND; unknown backends are rejected."""
+    monkeypatch.setenv("RAG_PDF_BACKEND", "pypdf")
+    monkeypatch.setenv("RAG_PDF_BACKEND_AZURE_AI_900_CHUNKS", "pymupdf")
+    assert rag_qdrant_hybrid.get_settings_for_certification("azure", "AI_900").pdf_backend == "pymupdf"
+    assert rag_qdrant_hybrid.get_settings_for_certification("azure", "AI_102").pdf_backend == "pypdf"
+    monkeypatch.setenv("RAG_PDF_BACKEND", "tika")
+    with pytest.raises(ValueError):
+        rag_qdrant_hybrid.get_settings_for_certification("azure", "AI_102")
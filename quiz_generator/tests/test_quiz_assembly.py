@@ -0,0 +1,73 @@
+"""
+Tests for the deterministic quiz assembly.
+"""
+
+import json
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add src to the path for imports
+src_path = Path(__file__).parent.parent / "src"
+sys.path.insert(0, str(src_path))
+
+from quiz_generator.utils.quiz_assembly import TemplateMismatchError, assemble_quiz, fill_template
+
+TEMPLATE = """# **Azure - AI_900**
+
+## True/False Questions
+
+1. **[TF_Question_1]**
+   - True
+   - False
+
+## Multiple Choice Questions
+
+2. **[MC_Question_2]**
+  A) [MC_Option_A_2]
+  B) [MC_Option_B_2]
+  C) [MC_Option_C_2]
+  D) [MC_Option_D_2]
+
+## Short Open Questions
+
+3. **[Open_Question_3]**
+"""
+
+QUESTIONS = [
+    {"type": "open_ended", "question": "Describe LUIS.", "options": [], "answer": ""},
+    {"type": "multiple_choice", "question": "Which service detects intents?",
+     "options": ["A) LUIS", "Vision", "Speech", "Translator"], "answer": "LUIS"},
+    {"type": "true_false", "question": "Azure AI is free.", "options": ["True", "False"], "answer": "False"},
+]
+
+
+def test_placeholders_are_filled_by_type_in_template_order():
+    """Each slot gets the question of its type, keeping the template numbering."""
+    quiz = fill_template(TEMPLATE, QUESTIONS)
+    assert "[" not in quiz.replace("[]", "")
+    assert "1. **Azure AI is free.**" in quiz
+    assert "2. **Which service detects intents?**" in quiz
+    assert "A) LUIS\n  B) Vision" in quiz
+    assert "3. **Describe LUIS.**" in quiz
+
+
+def test_mismatching_or_free_form_templates_are_rejected():
+    """Templates the engine cannot fill are left to the Quiz Maker crew."""
+    with pytest.raises(TemplateMismatchError):
+        fill_template(TEMPLATE, QUESTIONS[:2])
+    with pytest.raises(TemplateMismatchError):
+        fill_template(TEMPLATE, [QUESTIONS[0], QUESTIONS[0], QUESTIONS[2]])
+    with pytest.raises(TemplateMismatchError):
+        fill_template("# Free-form quiz about {topic}", QUESTIONS)
+
+
+def test_assemble_quiz_writes_markdown_and_pdf(tmp_path):
+    """``quiz.md`` and ``quiz.pdf`` are written to the run directory."""
+    (tmp_path / "quiz_template.md").write_text(f"```markdown\n{TEMPLATE}\n```", encoding="utf-8")
+    (tmp_path / "questions.json").write_text(json.dumps({"questions": QUESTIONS}), encoding="utf-8")
+
+    quiz_path = assemble_quiz(str(tmp_path))
+    assert Path(quiz_path).read_text(encoding="utf-8").startswith("# **Azure - AI_900**")
+    assert (tmp_path / "quiz.pdf").stat().st_size > 0
@@ -0,0 +1,51 @@
+"""
+Tests for the quiz template cache and the built-in template generator.
+"""
+
+import sys
+from pathlib import Path
+
+# Add src to the path for imports
+src_path = Path(__file__).parent.parent / "src"
+sys.path.insert(0, str(src_path))
+
+from quiz_generator.utils.quiz_assembly import fill_template, parse_placeholders
+from quiz_generator.utils.quiz_templates import TemplateCache, build_template, question_blueprint, template_key
+
+
+def test_builtin_template_matches_blueprint():
+    """Mixed quizzes split in thirds and every slot can be filled."""
+    assert question_blueprint(5, "Mixed") == {"TF": 2, "MC": 2, "Open": 1}
+    assert question_blueprint(4, "True/False") == {"TF": 4, "MC": 0, "Open": 0}
+
+    template = build_template("Azure", "AI_900", 5, "Mixed")
+    assert list(parse_placeholders(template).values()) == ["TF", "TF", "MC", "MC", "Open"]
+    questions = [{"type": "true_false", "question": "T?"}] * 2 + \
+                [{"type": "multiple_choice", "question": "M?", "options": list("wxyz")}] * 2 + \
+                [{"type": "open_ended", "question": "O?"}]
+    assert "D) z" in fill_template(template, questions)
+
+
+def test_cache_round_trip_and_validation(tmp_path):
+    """Usable templates are served back; malformed ones are never stored."""
+    cache = TemplateCache(str(tmp_path))
+    key = template_key("Azure", "AI_900", 5, "Mixed", version="v1")
+    assert key != template_key("Azure", "AI_900", 5, "Mixed", version="v2")
+    assert cache.get(key, 5, "Mixed") is None
+
+    template = build_template("Azure", "AI_900", 5, "Mixed")
+    assert not cache.put(key, "# Free-form template", 5, "Mixed")
+    assert not cache.put(key, template, 4, "Mixed")
+    assert not cache.put(key, build_template("Azure", "AI_900", 5, "True/False"), 5, "Mixed")
+    assert cache.put(key, f"```markdown\n{template}\n```", 5, "Mixed")
+    assert cache.get(key, 5, "Mixed") == template
+    assert cache.stats() == {"hits": 1, "misses": 1, "entries": 1}
+
+
+def test_cache_evicts_entries_with_wrong_slot_kinds(tmp_path):
+    """A poisoned entry is dropped on read instead of being served."""
+    cache = TemplateCache(str(tmp_path))
+    key = template_key("Azure", "AI_900", 4, "Multiple Choice", version="v1")
+    (tmp_path / f"{key}.md").write_text(build_template("Azure", "AI_900", 4, "True/False"), encoding="utf-8")
+    assert cache.get(key, 4, "Multiple Choice") is None
+    assert cache.stats() == {"hits": 0, "misses": 1, "entries": 0}
@@ -0,0 +1,63 @@
+"""
+Tests for the retrieval result cache.
+"""
+
+import sys
+import time
+from pathlib import Path
+
+# Add src to the path for imports
+src_path = Path(__file__).parent.parent / "src"
+sys.path.insert(0, str(src_path))
+
+from quiz_generator.utils.retrieval_cache import RetrievalCache
+
+
+def test_exact_hits_ignore_case_whitespace_and_punctuation(tmp_path):
+    """Trivially different spellings of a question share one entry."""
+    cache = RetrievalCache(str(tmp_path / "results.sqlite3"))
+    cache.put("azure_ai_900_chunks", "What is Azure  AI Vision?", 3, "h", ["r1", "r2"])
+
+    assert cache.get("azure_ai_900_chunks", "what is azure ai vision", 3, "h") == ["r1", "r2"]
+    assert cache.get("azure_ai_900_chunks", "what is azure ai vision", 5, "h") is None
+    assert cache.get("azure_ai_900_chunks", "what is azure ai vision", 3, "other") is None
+    assert cache.get("aws_clf_c02_chunks", "what is azure ai vision", 3, "h") is None
+
+
+def test_semantic_hits_respect_threshold(tmp_path):
+    """Near-duplicate queries reuse results, unrelated ones do not."""
+    cache = RetrievalCache(str(tmp_path / "results.sqlite3"))
+    cache.put("c", "computer vision on azure", 3, "h", ["vision"], query_vector=[1.0, 0.0, 0.0])
+
+    assert cache.get_similar("c", [0.99, 0.05, 0.0], 3, "h", threshold=0.95) == ["vision"]
+    assert cache.get_similar("c", [0.0, 1.0, 0.0], 3, "h", threshold=0.95) is None
+    assert cache.stats()["semantic_hits"] == 1
+
+
+def test_ttl_lru_and_invalidation(tmp_path):
+    """Entries expire, the store stays bounded and collections can be dropped."""
+    cache = RetrievalCache(str(tmp_path / "results.sqlite3"), ttl=0.05, max_entries=2)
+    cache.put("c", "old", 3, "h", ["old"])
+    time.sleep(0.1)
+    assert cache.get("c", "old", 3, "h") is None
+
+    cache.ttl = 3600
+    for q in ["q1", "q2", "q3"]:
+        cache.put("c", q, 3, "h", [q])
+    assert len(cache) == 2
+    assert cache.get("c", "q1", 3, "h") is None
+
+    cache.put("d", "q4", 3, "h", ["q4"])
+    cache.invalidate("c")
+    assert cache.get("c", "q3", 3, "h") is None
+    assert cache.get("d", "q4", 3, "h") == ["q4"]
+
+
+def test_fingerprint_only_tracks_retrieval_settings():
+    """Host-dependent and ingestion-only settings keep the cache key stable."""
+    from quiz_generator.utils.rag_qdrant_hybrid import Settings, settings_fingerprint
+
+    base = settings_fingerprint(Settings())
+    assert settings_fingerprint(Settings(pdf_workers=1, state_dir="/tmp/x", embed_batch_size=8, final_k=2)) == base
+    assert settings_fingerprint(Settings(alpha=0.5)) != base
+    assert settings_fingerprint(Settings(tuning_profile="high-recall")) != base
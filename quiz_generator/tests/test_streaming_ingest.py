@@ -0,0 +1,75 @@
+"""
+Tests for streaming, resumable chunk ingestion into local Qdrant.
+"""
+
+import sys
+from pathlib import Path
+
+import pytest
+from langchain.schema import Document
+from qdrant_client import QdrantClient
+
+# Add src to the path for imports
+src_path = Path(__file__).parent.parent / "src"
+sys.path.insert(0, str(src_path))
+
+from quiz_generator.utils.rag_qdrant_hybrid import recreate_collection_for_rag, upsert_chunks
+
+
+class FlakyClient:
+    """Wraps a Qdrant client and fails the n-th upsert request."""
+
+    def __init__(self, client, fail_on):
+        self.client = client
+        self.fail_on = fail_on
+        self.upserts = 0
+
+    def upsert(self, **kwargs):
+        self.upserts += 1
+        if self.upserts == self.fail_on:
+            raise ConnectionError("qdrant unavailable")
+        return self.client.upsert(**kwargs)
+
+    def __getattr__(self, name):
+        return getattr(self.client, name)
+
+
+def _settings(fast_settings):
+    return fast_settings(collection="streaming_test", embed_batch_size=4, upsert_batch_size=2,
+                         upsert_parallelism=1, embed_concurrency=1)
+
+
+def test_interrupted_ingestion_resumes_from_checkpoint(fast_settings, recording_embeddings):
+    """A failed run keeps its progress and the retry only embeds what is missing."""
+    settings = _settings(fast_settings)
+    client = QdrantClient(":memory:")
+    recreate_collection_for_rag(client, settings, 3)
+    chunks = [Document(page_content=f"chunk number {i}", metadata={"source": "a.pdf"}) for i in range(12)]
+
+    with pytest.raises(ConnectionError):
+        upsert_chunks(FlakyClient(client, fail_on=4), settings, chunks, recording_embeddings)
+    stored = client.count(settings.collection).count
+    assert 0 < stored < len(chunks)
+
+    recording_embeddings.texts.clear()
+    upsert_chunks(client, settings, chunks, recording_embeddings)
+    assert client.count(settings.collection).count == len(chunks)
+    assert len(recording_embeddings.texts) == len(chunks) - stored
+    assert not list(Path(settings.state_dir).glob("*.checkpoint"))
+
+
+def test_reingesting_identical_chunks_is_a_no_op(fast_settings, recording_embeddings):
+    """Deterministic point IDs make a repeated upsert skip every chunk."""
+    settings = _settings(fast_settings)
+    client = QdrantClient(":memory:")
+    recreate_collection_for_rag(client, settings, 3)
+    chunks = [Document(page_content=f"chunk number {i}", metadata={"source": "a.pdf"}) for i in range(5)]
+
+    upsert_chunks(client, settings, chunks, recording_embeddings)
+    recording_embeddings.texts.clear()
+    upsert_chunks(client, settings, chunks, recording_embeddings)
+
+    assert recording_embeddings.texts == []
+    points, _ = client.scroll(settings.collection, limit=10, with_payload=True)
+    assert len(points) == 5
+    assert len({p.payload["doc_id"] for p in points}) == 1
@@ -0,0 +1,114 @@
+"""
+Tests for the Qdrant tuning profiles.
+"""
+
+import sys
+from dataclasses import replace
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+from qdrant_client import QdrantClient
+from qdrant_client.models import BinaryQuantization, ProductQuantization
+
+# Add src to the path for imports
+src_path = Path(__file__).parent.parent / "src"
+sys.path.insert(0, str(src_path))
+
+from quiz_generator.utils import database_utils, rag_qdrant_hybrid
+from quiz_generator.utils.rag_qdrant_hybrid import Settings, recreate_collection_for_rag
+from quiz_generator.utils.tuning_profiles import (
+    TUNING_PROFILES,
+    get_tuning_profile,
+    profile_drift,
+    quantization_config,
+    search_params,
+)
+
+
+@pytest.mark.parametrize("name", sorted(TUNING_PROFILES))
+def test_every_profile_creates_a_searchable_collection(name):
+    """Collections can be created and queried with each profile."""
+    settings = Settings(collection=f"profile_{name}", tuning_profile=name)
+    client = QdrantClient(":memory:")
+    recreate_collection_for_rag(client, settings, 4)
+    assert client.collection_exists(settings.collection)
+    rag_qdrant_hybrid.apply_tuning_profile(client, settings)
+    assert rag_qdrant_hybrid.qdrant_semantic_search(client, settings, "q", None, limit=3, query_vector=[1, 0, 0, 0]) == []
+
+
+def test_profiles_map_to_qdrant_parameters():
+    """Quantization kind and query-time parameters follow the profile."""
+    low_memory = get_tuning_profile("low-memory")
+    assert isinstance(quantization_config(low_memory), BinaryQuantization)
+    assert search_params(low_memory).quantization.oversampling == 3.0
+    assert isinstance(quantization_config(replace(low_memory, quantization="product")), ProductQuantization)
+    assert search_params(get_tuning_profile("high-recall")).quantization is None
+    assert search_params(get_tuning_profile("low-latency")).hnsw_ef == 64
+    with pytest.raises(ValueError):
+        get_tuning_profile("fastest")
+
+
+def test_profile_can_be_chosen_per_certification(monkeypatch):
+    """RAG_TUNING_PROFILE_<COLLECTION> overrides RAG_TUNING_PROFILE."""
+    monkeypatch.setenv("RAG_TUNING_PROFILE", "low-latency")
+    monkeypatch.setenv("RAG_TUNING_PROFILE_AZURE_AI_900_CHUNKS", "high-recall")
+    assert rag_qdrant_hybrid.get_settings_for_certification("azure", "AI_900").tuning_profile == "high-recall"
+    assert rag_qdrant_hybrid.get_settings_for_certification("azure", "AI_102").tuning_profile == "low-latency"
+
+
+def _collection_info(profile):
+    """Fake ``get_collection`` response of a collection built with ``profile``."""
+    return SimpleNamespace(config=SimpleNamespace(
+        hnsw_config=SimpleNamespace(m=profile.hnsw_m, ef_construct=profile.hnsw_ef_construct, on_disk=profile.hnsw_on_disk),
+        optimizer_config=SimpleNamespace(default_segment_number=profile.default_segment_number),
+        quantization_config=quantization_config(profile),
+        params=SimpleNamespace(vectors={"dense": SimpleNamespace(on_disk=profile.vectors_on_disk)},
+                               on_disk_payload=profile.payload_on_disk),
+    ))
+
+
+def test_profile_drift_lists_changed_settings():
+    """A collection matches its own profile and reports what another one changes."""
+    balanced, high_recall = get_tuning_profile("balanced"), get_tuning_profile("high-recall")
+    assert profile_drift(balanced, _collection_info(balanced), "dense") == []
+    drift = profile_drift(high_recall, _collection_info(balanced), "dense")
+    assert "hnsw_m: 32 -> 48" in drift
+    assert "quantization: scalar -> None" in drift
+
+
+def test_switching_profile_updates_existing_collection(tmp_path, monkeypatch, fast_settings, recording_embeddings,
+                                                       write_pdf):
+    """initialize_database moves an existing collection to the newly selected profile."""
+    cert_dir = tmp_path / "dataset" / "azure" / "AI_900"
+    cert_dir.mkdir(parents=True)
+    write_pdf(cert_dir / "a.pdf", "Azure AI services overview")
+
+    client = QdrantClient(":memory:")
+    profile = {"name": "balanced"}
+
+    def settings_for(provider, certification):
+        return fast_settings(collection="azure_ai_900_chunks", tuning_profile=profile["name"])
+
+    monkeypatch.setattr(database_utils, "get_settings_for_certification", settings_for)
+    monkeypatch.setattr(database_utils, "get_qdrant_client", lambda settings: client)
+    monkeypatch.setattr(database_utils, "get_embeddings", lambda settings: recording_embeddings)
+    assert database_utils.initialize_database("azure", "AI_900", str(tmp_path / "dataset"))
+
+    # Local mode does not report index settings: serve the config the collection was built with
+    built_with = _collection_info(get_tuning_profile("balanced"))
+    get_collection = client.get_collection
+    monkeypatch.setattr(client, "get_collection", lambda name: SimpleNamespace(
+        config=SimpleNamespace(**{**vars(built_with.config), "params": get_collection(name).config.params})
+    ))
+    updates = []
+    monkeypatch.setattr(client, "update_collection", lambda **kwargs: updates.append(kwargs))
+
+    assert database_utils.initialize_database("azure", "AI_900", str(tmp_path / "dataset"))
+    assert updates == []
+
+    profile["name"] = "high-recall"
+    assert database_utils.initialize_database("azure", "AI_900", str(tmp_path / "dataset"))
+    assert len(updates) == 1
+    assert updates[0]["collection_name"] == "azure_ai_900_chunks"
+    assert updates[0]["hnsw_config"].m == 48
@@ -0,0 +1,32 @@
+"""
+Tests for the per-run output workspaces.
+"""
+
+import sys
+from pathlib import Path
+
+# Add src to the path for imports
+src_path = Path(__file__).parent.parent / "src"
+sys.path.insert(0, str(src_path))
+
+from quiz_generator.crews.quiz_maker_crew.quiz_maker_crew import QuizMakerCrew
+from quiz_generator.utils.workspace import new_run_id, run_output_dir
+
+
+def test_run_ids_get_their_own_directory(tmp_path):
+    """Two runs never share an output directory."""
+    first, second = new_run_id(), new_run_id()
+    assert first != second
+    path = run_output_dir(first, root=str(tmp_path))
+    assert Path(path).is_dir() and Path(path).name == first
+
+
+def test_crew_reads_and_writes_in_run_directory(tmp_path):
+    """Tools and task outputs of a crew point at its ``output_dir``."""
+    crew = QuizMakerCrew(output_dir=str(tmp_path)).crew()
+    paths = [tool.file_path for tool in crew.agents[0].tools if hasattr(tool, "file_path")]
+    assert paths and all(p.startswith(str(tmp_path)) for p in paths)
+
+    task = crew.tasks[0]
+    task.interpolate_inputs_and_add_conversation_history({"output_dir": str(tmp_path)})
+    assert task.output_file == f"{tmp_path}/quiz.md"